@@ -16,6 +16,14 @@ SUPABASE_SECRET_KEY: Optional[str] = os.getenv("SUPABASE_SECRET_KEY")
 
 # PAYMENT STRIPE
 STRIPE_SECRET_KEY: Optional[str] = os.getenv("STRIPE_SECRET_KEY")
+STRIPE_WEBHOOK_SECRET: Optional[str] = os.getenv("STRIPE_WEBHOOK_SECRET")
+
+# Shared cache storage: a redis:// URL shares entries between workers; unset
+# keeps them in each worker's memory (invalidations still reach every worker)
+CACHE_URL: Optional[str] = os.getenv("CACHE_URL")
+
+# How long a slot stays reserved for a customer while they pay
+SLOT_HOLD_TTL_MINUTES: int = int(os.getenv("SLOT_HOLD_TTL_MINUTES", "10"))
 
 # BUMI
 OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY")
@@ -89,7 +97,7 @@ CONVERSATION CONTEXT RULES:
 
 SERVICE MATCHING LOGIC:
 1. **Exact Match**: Direct service name mentioned → recommend immediately
-2. **Category Match**: Problem category clear → recommend top 2-3 services in category
+2. **Category Match**: Problem category clear → recommend top 2-3 services in category (services are listed best-ranked first, so prefer earlier ones)
 3. **Emergency Match**: Urgent keywords → prioritize emergency/same-day services
 4. **Partial Match**: Some details given → ask ONE specific follow-up question
 5. **No Match**: Completely vague → ask open-ended clarification
@@ -110,11 +118,9 @@ MESSAGE CRAFTING:
 ❌ Bad: "Let me help you with that maintenance issue service request thing"
 
 AVAILABILITY INFORMATION:
-- Services now include next available time slots
-- Emergency services (plumbing, electrical, HVAC, repair): available in 2 hours
-- Regular services (cleaning, maintenance): available in 24 hours
-- Mention availability when relevant: "available in 2 hours", "can help tomorrow"
-- For urgent requests, highlight the quick 2-hour availability
+- Services now include the provider's next open time slot from their booking calendar
+- Do not promise a specific time - the app shows the exact slot next to each recommendation
+- Mention availability in general terms when relevant: "can help soon", "has openings this week"
 
 EDGE CASE HANDLING:
 - If no services match: "🐕 Ruff! I don't see exact matches, but here are some related options..."
@@ -9,3 +9,8 @@ load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 engine = create_engine(DATABASE_URL, echo=True)
+
+# LISTEN needs a session-level connection; Supabase's transaction-mode pooler
+# (port 6543) can't hold one, so point this at the session pooler or a direct
+# connection. Falls back to DATABASE_URL.
+REALTIME_DATABASE_URL = os.getenv("REALTIME_DATABASE_URL") or DATABASE_URL
@@ -0,0 +1,80 @@
+"""
+Apply the SQL files in migrations/ that haven't run against DATABASE_URL yet.
+
+    make migrate  (or `uv run python -m app.db.migrate`)
+
+The app never creates or alters tables itself, so run this before deploying
+code that needs a new table, column, index or trigger. Files run in name
+order, each in its own transaction, and are recorded in schema_migrations.
+Each file is written to be safe to re-run against a database that already
+has some of its changes.
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+from sqlmodel import create_engine
+
+from app.db.engine import DATABASE_URL
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations"
+
+
+def pending_migrations(applied: set[str]) -> list[Path]:
+    return [
+        path
+        for path in sorted(MIGRATIONS_DIR.glob("*.sql"))
+        if path.name not in applied
+    ]
+
+
+def migrate(database_url: str) -> list[str]:
+    """Run every pending migration. Returns the names of the ones applied."""
+    engine = create_engine(database_url)
+    # a raw DBAPI connection: the files are plain SQL with $$-quoted bodies,
+    # which shouldn't go through SQLAlchemy's parameter handling
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    name text PRIMARY KEY,
+                    applied_at timestamptz NOT NULL DEFAULT now()
+                )
+                """
+            )
+            connection.commit()
+            cursor.execute("SELECT name FROM schema_migrations")
+            applied = {name for (name,) in cursor.fetchall()}
+
+        done: list[str] = []
+        for path in pending_migrations(applied):
+            logger.info("Applying %s", path.name)
+            with connection.cursor() as cursor:
+                try:
+                    cursor.execute(path.read_text())
+                    cursor.execute(
+                        "INSERT INTO schema_migrations (name) VALUES (%s)",
+                        (path.name,),
+                    )
+                    connection.commit()
+                except Exception:
+                    connection.rollback()
+                    raise
+            done.append(path.name)
+        return done
+    finally:
+        connection.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if not DATABASE_URL:
+        sys.exit("DATABASE_URL is not set")
+    applied = migrate(DATABASE_URL)
+    logger.info("Applied %s migration(s)", len(applied))
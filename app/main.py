@@ -1,19 +1,22 @@
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse
 
 from app.routers import (
     address,
     booking,
     booking_ai,
+    booking_series,
     chat,
     coupon,
     customer,
     inventory_item,
     provider,
     provider_inventory,
+    realtime,
     review,
     service,
     service_inventory,
@@ -22,6 +25,16 @@ from app.routers import (
     transaction,
     user_profile,
 )
+from app.services.autocomplete import autocomplete_rebuilder
+from app.services.booking_events import status_listener
+from app.services.coupons import coupon_listener, coupon_refresher
+from app.services.listings import listing_warmer
+from app.services.provider_stats import stats_reconciler
+from app.services.ranking import service_ranker
+from app.services.shared_cache import cache_metrics_reporter, invalidation_listener
+from app.services.subcategories import taxonomy_sync
+from app.utils.compression import CompressionMiddleware
+from app.utils.http_cache import ConditionalGetMiddleware
 
 logging.basicConfig(
     level=logging.INFO,  # changed from DEBUG to reduce logging spam
@@ -29,7 +42,43 @@ logging.basicConfig(
 )
 
 logging.info("FastAPI app is starting...")
-app = FastAPI()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # relays booking status NOTIFYs from every worker to this one's sockets
+    status_listener.start()
+    # applies cache invalidations from other workers
+    invalidation_listener.start()
+    # logs hit/miss/eviction counts per cache namespace
+    cache_metrics_reporter.start()
+    # backfills provider_stats on startup, then catches any drift hourly
+    stats_reconciler.start()
+    # rescores the catalog on startup and every 15 minutes after that
+    service_ranker.start()
+    # builds the category listings up front, then refreshes them every few minutes
+    listing_warmer.start()
+    # adds any new entries from utils/sub_categories.py to the subcategories table
+    taxonomy_sync.start()
+    # builds the autocomplete index, then recounts popularity every few minutes
+    autocomplete_rebuilder.start()
+    # loads every coupon, then reloads whenever the coupons table changes
+    coupon_refresher.start()
+    coupon_listener.start()
+    yield
+    await coupon_listener.stop()
+    await coupon_refresher.stop()
+    await autocomplete_rebuilder.stop()
+    await taxonomy_sync.stop()
+    await listing_warmer.stop()
+    await service_ranker.stop()
+    await stats_reconciler.stop()
+    await cache_metrics_reporter.stop()
+    await invalidation_listener.stop()
+    await status_listener.stop()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 router = APIRouter()
 
 # TODO CORS Config - update for production
@@ -42,15 +91,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ETag / Cache-Control for routes that opt in with conditional_get
+app.add_middleware(ConditionalGetMiddleware)
+# Outermost, so ETags are computed on the uncompressed body
+app.add_middleware(CompressionMiddleware)
+
 # Router Registrations
 app.include_router(address.router)
 app.include_router(booking.router)
+app.include_router(booking_series.router)
 app.include_router(chat.router)
 app.include_router(booking_ai.router)
 app.include_router(customer.router)
 app.include_router(inventory_item.router)
 app.include_router(provider.router)
 app.include_router(provider_inventory.router)
+app.include_router(realtime.router)
 app.include_router(review.router)
 app.include_router(service.router)
 app.include_router(service_inventory.router)
@@ -1,27 +1,40 @@
 from .address import Address
 from .booking import Booking
+from .booking_series import BookingSeries, BookingSeriesException
 from .coupon import Coupon
 from .customer import Customer
+from .idempotency_key import IdempotencyKey
 from .inventory_item import InventoryItems
 from .provider import Provider
 from .provider_inventory import ProviderInventory
+from .provider_stats import ProviderStats
 from .reviews import Review
 from .service import Service
+from .service_area import ProviderServiceArea
 from .service_inventory import ServiceInventory
+from .slot_hold import SlotHold
 from .status_update import StatusUpdate
+from .subcategory import Subcategory
 from .transaction import Transaction
 
 __all__ = [
     "Provider",
     "Service",
+    "ProviderServiceArea",
     "Booking",
     "Customer",
     "Address",
     "InventoryItems",
     "ProviderInventory",
+    "ProviderStats",
     "Review",
     "ServiceInventory",
     "StatusUpdate",
+    "Subcategory",
     "Transaction",
     "Coupon",
+    "SlotHold",
+    "IdempotencyKey",
+    "BookingSeries",
+    "BookingSeriesException",
 ]
@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlmodel import SQLModel
+
+
+class AvailabilitySlot(SQLModel):
+    start_time: datetime
+    end_time: datetime
+
+
+class ProviderAvailability(SQLModel):
+    provider_id: UUID
+    service_id: Optional[UUID] = None
+    duration: int  # in minutes
+    slots: list[AvailabilitySlot]
+
+
+class CategorySlot(AvailabilitySlot):
+    provider_id: UUID
+    provider_name: str
+    service_id: UUID
+    service_title: str
+    pricing: float
+    duration: int  # in minutes
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 from uuid import UUID, uuid4
 
-from sqlmodel import Column, DateTime, Field, Relationship, SQLModel, text
+from sqlmodel import Column, DateTime, Field, Index, Relationship, SQLModel, text
 
 from app.models.address import AddressRead
 from app.models.customer import CustomerRead
@@ -25,6 +25,19 @@ class BookingBase(SQLModel):
 
 class Booking(BookingBase, table=True):
     __tablename__ = "bookings"
+    __table_args__ = (
+        # availability and calendar lookups scan one provider's bookings by start_time
+        Index("ix_bookings_provider_id_start_time", "provider_id", "start_time"),
+        # cross-provider searches scan a time range across many providers
+        Index("ix_bookings_start_time", "start_time"),
+        # customer dashboard buckets by status and orders by start_time
+        Index(
+            "ix_bookings_customer_id_status_start_time",
+            "customer_id",
+            "status",
+            "start_time",
+        ),
+    )
 
     id: Optional[UUID] = Field(default_factory=uuid4, primary_key=True)
 
@@ -80,8 +93,42 @@ class BookingStatusUpdate(SQLModel):
     status: StatusEnum
 
 
+class BookingStatusChange(BookingStatusUpdate):
+    booking_id: UUID
+
+
+class BookingStatusBatch(SQLModel):
+    updates: list[BookingStatusChange] = Field(min_length=1, max_length=200)
+
+
+class BookingStatusResult(SQLModel):
+    booking_id: UUID
+    status: StatusEnum
+    updated: bool
+    # why the change was rejected, when updated is False
+    error: Optional[str] = None
+
+
 class BookingReponseProvider(BookingBase):
     id: UUID
     service: ServiceResponseProvider
     customer: CustomerRead
     address: AddressRead
+
+
+class CalendarEntry(SQLModel):
+    """Compact booking row for the provider calendar view."""
+
+    booking_id: UUID
+    start_time: datetime
+    end_time: datetime
+    duration: int
+    status: StatusEnum
+    service_title: str
+    customer_first_name: str
+    customer_last_name: str
+    street_address_1: str
+    city: str
+    # set for occurrences of a recurring booking; booking_id is then the
+    # occurrence's id
+    series_id: Optional[UUID] = None
@@ -0,0 +1,124 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID, uuid4
+
+from sqlmodel import (
+    Column,
+    DateTime,
+    Field,
+    Index,
+    SQLModel,
+    UniqueConstraint,
+    text,
+)
+
+from app.models.enums import RecurrenceEnum
+
+
+class BookingSeriesBase(SQLModel):
+    special_instructions: Optional[str] = None
+    frequency: RecurrenceEnum
+
+
+class BookingSeries(BookingSeriesBase, table=True):
+    """
+    A recurring booking, stored once as a rule.
+
+    Occurrences are expanded on read for whatever window is being looked at;
+    only skipped or moved ones get a BookingSeriesException row.
+    """
+
+    __tablename__ = "booking_series"
+    __table_args__ = (
+        Index(
+            "ix_booking_series_provider_id_first_start", "provider_id", "first_start"
+        ),
+        Index(
+            "ix_booking_series_customer_id_first_start", "customer_id", "first_start"
+        ),
+    )
+
+    id: Optional[UUID] = Field(default_factory=uuid4, primary_key=True)
+
+    customer_id: UUID = Field(foreign_key="customers.id")
+    provider_id: UUID = Field(foreign_key="providers.id")
+    service_id: UUID = Field(foreign_key="services.id")
+    address_id: UUID = Field(foreign_key="addresses.id")
+
+    # first occurrence; later ones repeat its Pacific wall-clock time
+    first_start: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+    # no occurrences start after this; None repeats indefinitely
+    until: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
+    )
+
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(
+            DateTime(timezone=True), server_default=text("(now() AT TIME ZONE 'utc')")
+        ),
+    )
+
+
+class BookingSeriesException(SQLModel, table=True):
+    """One occurrence of a series that was skipped or moved."""
+
+    __tablename__ = "booking_series_exceptions"
+    __table_args__ = (
+        UniqueConstraint(
+            "series_id",
+            "occurrence_start",
+            name="uq_booking_series_exceptions_series_id_occurrence_start",
+        ),
+        Index("ix_booking_series_exceptions_new_start", "new_start"),
+    )
+
+    id: Optional[UUID] = Field(default_factory=uuid4, primary_key=True)
+    series_id: UUID = Field(foreign_key="booking_series.id", ondelete="CASCADE")
+
+    # where the rule put the occurrence
+    occurrence_start: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+    # where it happens instead; None means skipped
+    new_start: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
+    )
+
+
+class BookingSeriesCreate(BookingSeriesBase):
+    provider_id: UUID
+    service_id: UUID
+    address_id: UUID
+    start_time: datetime
+    until: Optional[datetime] = None
+    # pays for the first occurrence, like BookingCreate
+    stripe_payment_id: Optional[str] = None
+
+
+class BookingSeriesRead(BookingSeriesBase):
+    id: UUID
+    customer_id: UUID
+    provider_id: UUID
+    service_id: UUID
+    address_id: UUID
+    first_start: datetime
+    until: Optional[datetime]
+
+
+class OccurrenceSkip(SQLModel):
+    occurrence_start: datetime
+
+
+class OccurrenceMove(OccurrenceSkip):
+    new_start: datetime
+
+
+class SeriesOccurrence(SQLModel):
+    id: UUID
+    series_id: UUID
+    occurrence_start: datetime
+    start_time: datetime
+    end_time: datetime
@@ -36,3 +36,10 @@ class CouponList(SQLModel):
     coupon_code: str = Field(unique=True)
     coupon_name: str
     discount_value: int
+
+
+class CouponValidation(SQLModel):
+    coupon_code: str
+    valid: bool
+    coupon_name: Optional[str] = None
+    discount_value: Optional[int] = None
@@ -86,8 +86,14 @@ class CurrentBookings(SQLModel):
     service_title: str
     booking_id: UUID
     provider_id: UUID
+    # set for occurrences of a recurring booking; booking_id is then the
+    # occurrence's id
+    series_id: Optional[UUID] = None
 
 
 class CustomersBookings(SQLModel):
     upcoming_bookings: List[CurrentBookings]
     completed_needs_review: List[CurrentBookings]
+    # totals before per-bucket limits are applied
+    upcoming_total: int = 0
+    needs_review_total: int = 0
@@ -8,3 +8,9 @@ class StatusEnum(str, Enum):
     completed = "completed"
     cancelled = "cancelled"
     review_needed = "review_needed"
+
+
+class RecurrenceEnum(str, Enum):
+    weekly = "weekly"
+    biweekly = "biweekly"
+    monthly = "monthly"
@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Column, DateTime, Field, SQLModel, text
+
+
+class IdempotencyKey(SQLModel, table=True):
+    """A write request's Idempotency-Key and the response it produced."""
+
+    __tablename__ = "idempotency_keys"
+
+    # endpoint + caller, so keys from different users can't collide
+    scope: str = Field(primary_key=True, max_length=255)
+    key: str = Field(primary_key=True, max_length=255)
+    request_hash: str = Field(max_length=64)
+
+    # both empty while the original request is still running
+    status_code: Optional[int] = None
+    response_body: Optional[Any] = Field(default=None, sa_column=Column(JSONB))
+
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(
+            DateTime(timezone=True), server_default=text("(now() AT TIME ZONE 'utc')")
+        ),
+    )
+    expires_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True)
+    )
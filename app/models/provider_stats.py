@@ -0,0 +1,49 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlmodel import Column, DateTime, Field, SQLModel, text
+
+STAR_RATINGS = range(1, 6)
+
+
+class ProviderStats(SQLModel, table=True):
+    """
+    Review aggregates for one provider, kept up to date as reviews change.
+
+    Written in the same transaction as the review itself (see
+    services/provider_stats.py) and periodically reconciled against the
+    reviews table.
+    """
+
+    __tablename__ = "provider_stats"
+
+    provider_id: UUID = Field(
+        foreign_key="providers.id", primary_key=True, ondelete="CASCADE"
+    )
+
+    review_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    rating_sum: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    # number of reviews with each star rating
+    rating_1: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    rating_2: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    rating_3: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    rating_4: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    rating_5: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+
+    updated_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(
+            DateTime(timezone=True), server_default=text("(now() AT TIME ZONE 'utc')")
+        ),
+    )
+
+    @property
+    def average_rating(self) -> Optional[float]:
+        if not self.review_count:
+            return None
+        return self.rating_sum / self.review_count
+
+    @property
+    def histogram(self) -> dict[int, int]:
+        return {stars: getattr(self, f"rating_{stars}") for stars in STAR_RATINGS}
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 from uuid import UUID, uuid4
 
-from sqlmodel import Column, DateTime, Field, Relationship, SQLModel, text
+from sqlmodel import Column, DateTime, Field, Index, Relationship, SQLModel, text
 
 if TYPE_CHECKING:
     from app.models.customer import Customer
@@ -16,6 +16,15 @@ class ReviewBase(SQLModel):
 
 class Review(ReviewBase, table=True):
     __tablename__ = "reviews"
+    __table_args__ = (
+        # a provider's reviews newest first, keyset-paginated on (created_at, id)
+        Index(
+            "ix_reviews_provider_id_created_at",
+            "provider_id",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+    )
 
     id: Optional[UUID] = Field(default_factory=uuid4, primary_key=True)
 
@@ -52,3 +61,11 @@ class ReviewUpdate(SQLModel):
 class ReviewRead(ReviewBase):
     created_at: Optional[datetime]
     customer_name: str
+
+
+class ProviderReviewPage(SQLModel):
+    reviews: list[ReviewRead]
+    # pass back as `cursor` for the next page; None on the last page
+    next_cursor: Optional[str] = None
+    # first page only: number of reviews per star rating, 1-5
+    histogram: Optional[dict[int, int]] = None
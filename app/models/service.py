@@ -3,8 +3,17 @@ from enum import Enum
 from typing import TYPE_CHECKING, List, Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import String
-from sqlmodel import ARRAY, Column, DateTime, Field, Relationship, SQLModel, text
+from sqlalchemy import Computed, String
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlmodel import (
+    Column,
+    DateTime,
+    Field,
+    Index,
+    Relationship,
+    SQLModel,
+    text,
+)
 
 if TYPE_CHECKING:
     from app.models.booking import Booking
@@ -26,6 +35,7 @@ class ServiceBase(SQLModel):
     pricing: float
     duration: int  # in minutes
     category: Optional[str]
+    # names from the subcategories taxonomy for this category
     services_subcategories: List[str] = Field(
         default=None, sa_column=Column(ARRAY(String))
     )
@@ -33,10 +43,27 @@ class ServiceBase(SQLModel):
 
 class Service(ServiceBase, table=True):
     __tablename__ = "services"
+    __table_args__ = (
+        Index("ix_services_category_pricing", "category", "pricing"),
+        Index(
+            "ix_services_services_subcategories",
+            "services_subcategories",
+            postgresql_using="gin",
+        ),
+        # category listings are served best-ranked first
+        Index(
+            "ix_services_category_ranking_score",
+            "category",
+            text("ranking_score DESC"),
+        ),
+    )
 
     id: Optional[UUID] = Field(default_factory=uuid4, primary_key=True)
     provider_id: UUID = Field(foreign_key="providers.id", nullable=False)
 
+    # written by the ranking job (services/ranking.py); new services start at 0
+    ranking_score: float = Field(default=0, sa_column_kwargs={"server_default": "0"})
+
     created_at: Optional[datetime] = Field(
         default=None,
         sa_column=Column(
@@ -54,6 +81,27 @@ class Service(ServiceBase, table=True):
     bookings: List["Booking"] = Relationship(back_populates="service")
 
 
+# Full-text search document for /services/search, generated by the database
+# (see migrations/0011_services_search.sql). Added to the table only, not the
+# model: it's never returned to clients.
+Service.__table__.append_column(
+    Column(
+        "search_vector",
+        TSVECTOR,
+        Computed(
+            "services_search_document("
+            "service_title, service_description, services_subcategories)",
+            persisted=True,
+        ),
+    )
+)
+Index(
+    "ix_services_search_vector",
+    Service.__table__.c.search_vector,
+    postgresql_using="gin",
+)
+
+
 class ServiceCreate(ServiceBase):
     provider_id: UUID
 
@@ -63,6 +111,7 @@ class ServiceUpdate(SQLModel):
     service_description: Optional[str] = None
     pricing: Optional[float] = None
     duration: Optional[int] = None
+    services_subcategories: Optional[List[str]] = None
 
 
 class ServiceResponseProvider(SQLModel):
@@ -76,3 +125,22 @@ class ServiceResponseProvider(SQLModel):
 
 class ServiceRead(ServiceBase):
     id: UUID
+
+
+class ServiceSearchResult(ServiceRead):
+    provider_id: UUID
+    # text-match relevance; None when searching by filters only
+    rank: Optional[float] = None
+
+
+class ServiceSearchPage(SQLModel):
+    results: list[ServiceSearchResult]
+    # pass back as `cursor` for the next page; None on the last page
+    next_cursor: Optional[str] = None
+
+
+class AutocompleteSuggestion(SQLModel):
+    label: str
+    # "service", "provider" or "subcategory"; id is that record's id
+    kind: str
+    id: UUID
@@ -0,0 +1,88 @@
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID, uuid4
+
+from pydantic import model_validator
+from sqlalchemy import String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlmodel import Column, DateTime, Field, Index, SQLModel, func, text
+
+
+class ServiceAreaBase(SQLModel):
+    # center plus radius...
+    center_latitude: Optional[float] = Field(default=None, ge=-90, le=90)
+    center_longitude: Optional[float] = Field(default=None, ge=-180, le=180)
+    radius_km: Optional[float] = Field(default=None, gt=0, le=200)
+    # ...and/or a list of zip codes served
+    zips: Optional[List[str]] = Field(default=None, sa_column=Column(ARRAY(String)))
+
+
+class ProviderServiceArea(ServiceAreaBase, table=True):
+    """
+    Where a provider works: within radius_km of a center, in any of `zips`,
+    or both.
+
+    The min/max columns are the radius area's bounding box, kept for the
+    spatial index; exact distances are computed on the candidates it returns.
+    """
+
+    __tablename__ = "provider_service_areas"
+    __table_args__ = (
+        Index("ix_provider_service_areas_zips", "zips", postgresql_using="gin"),
+    )
+
+    id: Optional[UUID] = Field(default_factory=uuid4, primary_key=True)
+    provider_id: UUID = Field(
+        foreign_key="providers.id", unique=True, ondelete="CASCADE"
+    )
+
+    min_latitude: Optional[float] = None
+    max_latitude: Optional[float] = None
+    min_longitude: Optional[float] = None
+    max_longitude: Optional[float] = None
+
+    updated_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(
+            DateTime(timezone=True), server_default=text("(now() AT TIME ZONE 'utc')")
+        ),
+    )
+
+
+# The radius area as a Postgres box, GiST-indexed so "which areas contain this
+# point" is an index lookup without needing PostGIS. Queries must use this same
+# expression for the index to apply.
+AREA_BOX = func.box(
+    func.point(ProviderServiceArea.min_longitude, ProviderServiceArea.min_latitude),
+    func.point(ProviderServiceArea.max_longitude, ProviderServiceArea.max_latitude),
+)
+Index("ix_provider_service_areas_box", AREA_BOX, postgresql_using="gist")
+
+
+class ServiceAreaUpdate(ServiceAreaBase):
+    @model_validator(mode="after")
+    def check_area(self):
+        radius = (self.center_latitude, self.center_longitude, self.radius_km)
+        has_radius = all(value is not None for value in radius)
+        if not has_radius and any(value is not None for value in radius):
+            raise ValueError(
+                "center_latitude, center_longitude and radius_km go together"
+            )
+        if not has_radius and not self.zips:
+            raise ValueError("Give a center and radius_km, a list of zips, or both")
+        return self
+
+
+class ServiceAreaRead(ServiceAreaBase):
+    provider_id: UUID
+
+
+class NearbyProvider(SQLModel):
+    id: UUID
+    first_name: str
+    last_name: str
+    company_name: Optional[str] = None
+    # from the provider's center to the address; None for zip-only areas
+    distance_km: Optional[float] = None
+    review_count: int = 0
+    average_rating: Optional[float] = None
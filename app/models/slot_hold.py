@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID, uuid4
+
+from sqlmodel import Column, DateTime, Field, Index, SQLModel, text
+
+
+class SlotHold(SQLModel, table=True):
+    """A provider time slot reserved while the customer completes checkout."""
+
+    __tablename__ = "slot_holds"
+    __table_args__ = (
+        Index("ix_slot_holds_provider_id_start_time", "provider_id", "start_time"),
+    )
+
+    id: Optional[UUID] = Field(default_factory=uuid4, primary_key=True)
+    provider_id: UUID = Field(foreign_key="providers.id")
+    service_id: UUID = Field(foreign_key="services.id")
+    payment_intent_id: Optional[str] = Field(default=None, index=True)
+
+    start_time: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+    end_time: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+    expires_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True)
+    )
+
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(
+            DateTime(timezone=True), server_default=text("(now() AT TIME ZONE 'utc')")
+        ),
+    )
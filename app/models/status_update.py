@@ -1,29 +1,47 @@
-import enum
 from datetime import datetime
 from typing import Optional
 from uuid import UUID, uuid4
 
-from sqlmodel import Column, DateTime, Field, SQLModel, text
+from sqlmodel import (
+    BigInteger,
+    Column,
+    DateTime,
+    Field,
+    Identity,
+    Index,
+    SQLModel,
+    text,
+)
 
-
-class StatusEnum(str, enum.Enum):
-    confirmed = "confirmed"
-    en_route = "en_route"
-    in_progress = "in_progress"
-    completed = "completed"
-    cancelled = "cancelled"
+from app.models.enums import StatusEnum
 
 
 class StatusUpdateBase(SQLModel):
-    booking_id: UUID
+    booking_id: UUID = Field(foreign_key="bookings.id", ondelete="CASCADE", index=True)
     status: Optional[StatusEnum]
 
 
 class StatusUpdate(StatusUpdateBase, table=True):
+    """One booking status transition, appended in the same transaction as it."""
+
     __tablename__ = "status_updates"
+    __table_args__ = (
+        # feed queries read one customer's / provider's events after a cursor
+        Index("ix_status_updates_customer_id_seq", "customer_id", "seq"),
+        Index("ix_status_updates_provider_id_seq", "provider_id", "seq"),
+    )
 
     id: Optional[UUID] = Field(default_factory=uuid4, primary_key=True)
 
+    # monotonically increasing feed cursor, assigned by the database
+    seq: Optional[int] = Field(
+        default=None,
+        sa_column=Column(BigInteger, Identity(), nullable=False, unique=True),
+    )
+
+    customer_id: UUID = Field(foreign_key="customers.id")
+    provider_id: UUID = Field(foreign_key="providers.id")
+
     created_at: Optional[datetime] = Field(
         default=None,
         sa_column=Column(
@@ -38,3 +56,16 @@ class StatusUpdateCreate(StatusUpdateBase):
 
 class StatusUpdateUpdate(SQLModel):
     status: Optional[StatusEnum] = None
+
+
+class StatusUpdateRead(SQLModel):
+    seq: int
+    booking_id: UUID
+    status: Optional[StatusEnum]
+    created_at: Optional[datetime]
+
+
+class StatusFeed(SQLModel):
+    events: list[StatusUpdateRead]
+    # pass back as `since` to get only newer events
+    cursor: int
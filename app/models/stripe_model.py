@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
@@ -7,7 +8,11 @@ from pydantic import BaseModel
 class PaymentIntentCreateRequest(BaseModel):
     service_id: UUID
     coupon_code: Optional[str] = None
+    # reserve this slot for the customer while they pay
+    start_time: Optional[datetime] = None
 
 
 class PaymentIntentCreateResponse(BaseModel):
     client_secret: str
+    hold_id: Optional[UUID] = None
+    hold_expires_at: Optional[datetime] = None
@@ -0,0 +1,30 @@
+from uuid import UUID
+
+from sqlmodel import Field, SQLModel, UniqueConstraint
+
+
+class SubcategoryBase(SQLModel):
+    # ServiceEnum NAME, as stored on services.category
+    category: str
+    name: str
+
+
+class Subcategory(SubcategoryBase, table=True):
+    """
+    One entry of the canonical subcategory taxonomy.
+
+    Seeded from utils/sub_categories.py (see services/subcategories.py). Ids
+    are derived from (category, name), so they're the same in every
+    environment and safe for clients to keep.
+    """
+
+    __tablename__ = "subcategories"
+    __table_args__ = (
+        UniqueConstraint("category", "name", name="uq_subcategories_category_name"),
+    )
+
+    id: UUID = Field(primary_key=True)
+
+
+class SubcategoryRead(SubcategoryBase):
+    id: UUID
@@ -1,6 +1,6 @@
+from typing import Optional
 from uuid import UUID
 
-import stripe
 from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import Session, select
 
@@ -11,19 +11,31 @@ from app.models.booking import (
     BookingBase,
     BookingCreate,
     BookingDetails,
+    BookingStatusBatch,
+    BookingStatusResult,
     BookingStatusUpdate,
     BookingUpdate,
 )
 from app.models.customer import Customer
 from app.models.provider import Provider
+from app.models.service import Service
+from app.services.booking_events import (
+    feed_notifier,
+    record_status_change,
+    set_booking_status,
+    set_booking_statuses,
+)
+from app.services.dashboard import invalidate_customer_dashboard
+from app.services.payments import require_succeeded_payment
+from app.services.slot_holds import claim_slot, reschedule_booking
 from app.utils.auth import get_current_user_id
 from app.utils.crud_helpers import (
-    create_one,
     delete_one,
     get_all_by_field,
     get_one,
     update_one,
 )
+from app.utils.idempotency import get_idempotency_key, run_idempotent
 from app.utils.user_helpers import get_user_scoped_record
 
 router = APIRouter(
@@ -133,35 +145,29 @@ async def read_bookings_details(
 
 # CREATE booking
 # [AUTH: CUSTOMER VIEW] CREATE BOOKING
+# Retries with the same Idempotency-Key header replay the first response
 @router.post("/", response_model=Booking)
 async def create_booking(
     booking: BookingCreate,
     supabase_user_id: UUID = Depends(get_current_user_id),
     session: Session = Depends(get_session),
+    idempotency_key: Optional[str] = Depends(get_idempotency_key),
 ):
-    ### ------- Validate Stripe Payment Intent ID -------
-    stripe_payment_id = booking.stripe_payment_id
+    return await run_idempotent(
+        session,
+        f"POST /bookings:{supabase_user_id}",
+        idempotency_key,
+        booking,
+        lambda: _create_booking(booking, supabase_user_id, session),
+    )
 
-    # verify request came through
-    if not stripe_payment_id:
-        raise HTTPException(status_code=400, detail="Missing payment intent ID")
 
-    # validate existence on network
-    try:
-        payment_intent = stripe.PaymentIntent.retrieve(stripe_payment_id)
-        print(f"=========PAYMENT_INTENT==============: {payment_intent.id}")
-    except stripe.error.InvalidRequestError:
-        raise HTTPException(status_code=400, detail="Invalid payment intent id")
-    except stripe.error.StripeError:
-        raise HTTPException(status_code=502, detail="Stripe service error")
-
-    # confirm payment status success
-    # https://docs.stripe.com/api/payment_intents/object#payment_intent_object-status
-    if payment_intent.status != "succeeded":
-        raise HTTPException(
-            status_code=400,
-            detail=f"Payment not confirmed. Status: {payment_intent.status}",
-        )
+async def _create_booking(
+    booking: BookingCreate, supabase_user_id: UUID, session: Session
+) -> Booking:
+    ### ------- Validate Stripe Payment Intent ID -------
+    stripe_payment_id = booking.stripe_payment_id
+    await require_succeeded_payment(stripe_payment_id)
 
     ### ------- Validate Authenticated Customer -------
     db_customer = get_user_scoped_record(session, Customer, supabase_user_id)
@@ -177,11 +183,51 @@ async def create_booking(
     #         status_code=403, detail="Address does not belong to this customer"
     #     )
 
+    ### ------- Reserve Provider Time Slot -------
+    service = get_one(session, Service, booking.service_id)
+    if service.provider_id != booking.provider_id:
+        raise HTTPException(
+            status_code=400, detail="Service does not belong to this provider"
+        )
+
+    # locks the provider's schedule until the booking is committed below
+    claim_slot(
+        session,
+        booking.provider_id,
+        booking.start_time,
+        service.duration,
+        stripe_payment_id,
+    )
+
     ### ------- Create Booking Data -------
     booking_data = booking.model_dump()
     booking_data["customer_id"] = db_customer.id
 
-    return create_one(session, Booking, booking_data)
+    # the booking and its first feed event commit together
+    db_booking = Booking(**booking_data)
+    session.add(db_booking)
+    record_status_change(session, db_booking)
+    session.commit()
+    session.refresh(db_booking)
+
+    feed_notifier.notify()
+    invalidate_customer_dashboard(db_booking.customer_id)
+    return db_booking
+
+
+# [AUTH: PROVIDER VIEW] UPDATE MANY BOOKING STATUSES
+# Declared before /{booking_id} so "status" isn't parsed as a booking id
+@router.patch("/status", response_model=list[BookingStatusResult])
+async def update_booking_statuses(
+    batch: BookingStatusBatch,
+    supabase_user_id: UUID = Depends(get_current_user_id),
+    session: Session = Depends(get_session),
+):
+    db_provider = get_user_scoped_record(session, Provider, supabase_user_id)
+    if not db_provider:
+        raise HTTPException(status_code=404, detail="Provider not found")
+
+    return set_booking_statuses(session, db_provider.id, batch.updates)
 
 
 # UPDATE booking
@@ -191,9 +237,14 @@ async def update_booking(
     update_data: BookingUpdate,
     session: Session = Depends(get_session),
 ):
-    return update_one(
-        session, Booking, booking_id, update_data.dict(exclude_unset=True)
-    )
+    updates = update_data.dict(exclude_unset=True)
+    start_time = updates.pop("start_time", None)
+    if start_time is not None:
+        # 409 if the provider already has a booking or checkout hold then
+        reschedule_booking(session, get_one(session, Booking, booking_id), start_time)
+    db_booking = update_one(session, Booking, booking_id, updates)
+    invalidate_customer_dashboard(db_booking.customer_id)
+    return db_booking
 
 
 @router.patch("/{booking_id}/status", response_model=BookingBase)
@@ -216,12 +267,13 @@ async def update_booking_status(
             status_code=403, detail="Booking does not belong to this Provider"
         )
 
-    return update_one(
-        session, Booking, booking_id, update_data.model_dump(exclude_unset=True)
-    )
+    return set_booking_status(session, booking, update_data.status)
 
 
 # DELETE booking
 @router.delete("/{booking_id}", response_model=dict)
 async def delete_booking(booking_id: UUID, session: Session = Depends(get_session)):
-    return delete_one(session, Booking, booking_id)
+    customer_id = get_one(session, Booking, booking_id).customer_id
+    result = delete_one(session, Booking, booking_id)
+    invalidate_customer_dashboard(customer_id)
+    return result
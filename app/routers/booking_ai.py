@@ -1,25 +1,27 @@
 import logging
-import re
-from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from datetime import datetime
+from typing import List
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import Session
 
 from app.db.session import get_session
-from app.models.booking import Booking, BookingStatusUpdate
+from app.models.booking import Booking
 from app.models.customer import Customer
+from app.models.enums import StatusEnum
 from app.models.provider import Provider
 from app.models.service import Service
+from app.services.booking_events import set_booking_status
+from app.services.dashboard import invalidate_customer_dashboard
 from app.services.llm_service import LLMService
+from app.services.slot_holds import reschedule_booking
 from app.utils.auth import get_current_user_id
-from app.utils.crud_helpers import get_all_by_field, get_one, update_one
+from app.utils.crud_helpers import get_all_by_field, get_one
+from app.utils.natural_datetime import parse_natural_datetime
+from app.utils.timezones import BUSINESS_TZ
 from app.utils.user_helpers import get_user_scoped_record
 
-# Pacific timezone (PST/PDT)
-PACIFIC_TZ = timezone(timedelta(hours=-8))  # PST is UTC-8
-
 router = APIRouter(
     prefix="/bumi/ai",
     tags=["bumi-booking-ai"],
@@ -29,179 +31,6 @@ router = APIRouter(
 logger = logging.getLogger(__name__)
 
 
-def parse_natural_datetime(text: str) -> Optional[str]:
-    """Parse natural language date/time into ISO format"""
-    text = text.lower().strip()
-
-    # Current time for reference - use Pacific time
-    now = datetime.now(PACIFIC_TZ)
-
-    # Parse "august 30 at 3" or "aug 30 at 3pm" or "30th at 3"
-    month_patterns = [
-        r"(january|jan|february|feb|march|mar|april|apr|may|june|jun|july|jul|august|aug|september|sep|october|oct|november|nov|december|dec)\s+(\d{1,2})(?:st|nd|rd|th)?\s+(?:at\s+)?(\d{1,2})(?::(\d{2}))?\s*(am|pm)?",
-        r"(\d{1,2})(?:st|nd|rd|th)?\s+(january|jan|february|feb|march|mar|april|apr|may|june|jun|july|jul|august|aug|september|sep|october|oct|november|nov|december|dec)\s+(?:at\s+)?(\d{1,2})(?::(\d{2}))?\s*(am|pm)?",
-    ]
-
-    for pattern in month_patterns:
-        match = re.search(pattern, text)
-        if match:
-            groups = match.groups()
-
-            # Determine which groups contain what
-            if len(groups) == 5:  # month day hour minute ampm
-                month_str, day_str, hour_str, minute_str, ampm = groups
-                month = month_str
-                day = int(day_str)
-                hour = int(hour_str)
-                minute = int(minute_str) if minute_str else 0
-            elif len(groups) == 4:  # month day hour ampm
-                month_str, day_str, hour_str, ampm = groups
-                month = month_str
-                day = int(day_str)
-                hour = int(hour_str)
-                minute = 0
-            else:
-                continue
-
-            # Convert month name to number
-            month_map = {
-                "january": 1,
-                "jan": 1,
-                "february": 2,
-                "feb": 2,
-                "march": 3,
-                "mar": 3,
-                "april": 4,
-                "apr": 4,
-                "may": 5,
-                "june": 6,
-                "jun": 6,
-                "july": 7,
-                "jul": 7,
-                "august": 8,
-                "aug": 8,
-                "september": 9,
-                "sep": 9,
-                "october": 10,
-                "oct": 10,
-                "november": 11,
-                "nov": 11,
-                "december": 12,
-                "dec": 12,
-            }
-
-            month_num = month_map.get(month.lower())
-            if not month_num:
-                continue
-
-            # Handle AM/PM
-            if ampm:
-                if ampm == "pm" and hour != 12:
-                    hour += 12
-                elif ampm == "am" and hour == 12:
-                    hour = 0
-
-            # Set year (assume current year or next year if date has passed)
-            year = now.year
-            if month_num < now.month or (month_num == now.month and day < now.day):
-                year += 1
-
-            try:
-                # Create timezone-aware datetime in Pacific time
-                dt = datetime(year, month_num, day, hour, minute, tzinfo=PACIFIC_TZ)
-                return dt.isoformat()
-            except ValueError:
-                continue
-
-    # Parse "tomorrow at 3pm" or "next friday at 2"
-    if "tomorrow" in text:
-        tomorrow = now + timedelta(days=1)
-        time_match = re.search(r"at\s+(\d{1,2})(?::(\d{2}))?\s*(am|pm)?", text)
-        if time_match:
-            hour = int(time_match.group(1))
-            minute = int(time_match.group(2)) if time_match.group(2) else 0
-            ampm = time_match.group(3)
-
-            if ampm:
-                if ampm == "pm" and hour != 12:
-                    hour += 12
-                elif ampm == "am" and hour == 12:
-                    hour = 0
-
-            dt = datetime(
-                tomorrow.year,
-                tomorrow.month,
-                tomorrow.day,
-                hour,
-                minute,
-                tzinfo=timezone.utc,
-            )
-            return dt.isoformat()
-
-        # Parse "next week" or "next friday"
-    if "next week" in text:
-        next_week = now + timedelta(weeks=1)
-        # Default to same day of week, same time
-        dt = datetime(
-            next_week.year, next_week.month, next_week.day, 9, 0, tzinfo=timezone.utc
-        )  # Default to 9 AM
-        return dt.isoformat()
-
-    # Parse "next monday", "next tuesday", etc.
-    weekday_map = {
-        "monday": 0,
-        "mon": 0,
-        "tuesday": 1,
-        "tue": 1,
-        "wednesday": 2,
-        "wed": 2,
-        "thursday": 3,
-        "thu": 3,
-        "friday": 4,
-        "fri": 4,
-        "saturday": 5,
-        "sat": 5,
-        "sunday": 6,
-        "sun": 6,
-    }
-
-    for weekday_name, weekday_num in weekday_map.items():
-        if f"next {weekday_name}" in text:
-            current_weekday = now.weekday()
-            days_ahead = weekday_num - current_weekday
-            if days_ahead <= 0:  # Target day has passed this week
-                days_ahead += 7
-            target_date = now + timedelta(days=days_ahead)
-
-            # Extract time if specified
-            time_match = re.search(r"at\s+(\d{1,2})(?::(\d{2}))?\s*(am|pm)?", text)
-            if time_match:
-                hour = int(time_match.group(1))
-                minute = int(time_match.group(2)) if time_match.group(2) else 0
-                ampm = time_match.group(3)
-
-                if ampm:
-                    if ampm == "pm" and hour != 12:
-                        hour += 12
-                    elif ampm == "am" and hour == 12:
-                        hour = 0
-            else:
-                # Default to 9 AM if no time specified
-                hour, minute = 9, 0
-
-            dt = datetime(
-                target_date.year,
-                target_date.month,
-                target_date.day,
-                hour,
-                minute,
-                tzinfo=timezone.utc,
-            )
-            return dt.isoformat()
-
-    return None
-
-
 def format_bookings_for_ai(bookings: List[Booking], session: Session) -> str:
     """Format user's bookings in a way that's useful for the AI to understand"""
     if not bookings:
@@ -385,7 +214,7 @@ async def chat_with_booking_ai(
         conversation_history = request.get("conversation_history", [])
 
         # Create system message with the booking AI prompt and user's bookings
-        current_date = datetime.now(timezone.utc).strftime("%A, %B %d, %Y")
+        current_date = datetime.now(BUSINESS_TZ).strftime("%A, %B %d, %Y")
         system_content = f"{BOOKING_AI_SYSTEM_PROMPT}\n\nCURRENT DATE: {current_date}\n\n{bookings_context}"
 
         logger.info("[LOG] Current Date: %s", current_date)
@@ -479,10 +308,7 @@ async def execute_booking_action(
 
         if action_type == "cancel":
             # Update booking status to cancelled
-            status_update = BookingStatusUpdate(status="cancelled")
-            updated_booking = update_one(
-                session, Booking, booking_id, status_update.model_dump()
-            )
+            updated_booking = set_booking_status(session, booking, StatusEnum.cancelled)
             return {
                 "success": True,
                 "message": "Woof! Your booking is now cancelled! 🐕",
@@ -492,10 +318,7 @@ async def execute_booking_action(
 
         elif action_type == "uncancel":
             # Update booking status back to confirmed
-            status_update = BookingStatusUpdate(status="confirmed")
-            updated_booking = update_one(
-                session, Booking, booking_id, status_update.model_dump()
-            )
+            updated_booking = set_booking_status(session, booking, StatusEnum.confirmed)
             return {
                 "success": True,
                 "message": "Yay! Your booking is reactivated! 🎾",
@@ -521,22 +344,36 @@ async def execute_booking_action(
                 else:
                     # Already in proper ISO format
                     new_datetime = datetime.fromisoformat(new_time)
-
-                logger.info(
-                    "[LOG] Parsed datetime: %s (timezone: %s)",
-                    new_datetime,
-                    new_datetime.tzinfo,
-                )
             except ValueError:
+                # the model sometimes echoes the user's words ("friday at 3")
+                new_datetime = parse_natural_datetime(new_time)
+
+            if new_datetime is None:
                 return {
                     "success": False,
                     "message": "Invalid datetime format",
                     "error": "Invalid datetime format",
                 }
 
-            # Update booking start time - only include the field we want to update
-            update_data = {"start_time": new_datetime}
-            updated_booking = update_one(session, Booking, booking_id, update_data)
+            logger.info(
+                "[LOG] Parsed datetime: %s (timezone: %s)",
+                new_datetime,
+                new_datetime.tzinfo,
+            )
+
+            # Same schedule lock and overlap check as checkout
+            try:
+                updated_booking = reschedule_booking(session, booking, new_datetime)
+            except HTTPException as e:
+                if e.status_code != 409:
+                    raise
+                session.rollback()
+                return {
+                    "success": False,
+                    "message": "Ruff, that time is already taken! Try another one 🐾",
+                    "error": e.detail,
+                }
+            invalidate_customer_dashboard(updated_booking.customer_id)
 
             # Simple message without specific time to avoid timezone confusion
             return {
@@ -0,0 +1,161 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session
+
+from app.db.session import get_session
+from app.models.booking_series import (
+    BookingSeries,
+    BookingSeriesCreate,
+    BookingSeriesRead,
+    OccurrenceMove,
+    OccurrenceSkip,
+    SeriesOccurrence,
+)
+from app.models.customer import Customer
+from app.models.provider import Provider
+from app.models.service import Service
+from app.services.booking_series import (
+    create_series,
+    end_series,
+    set_occurrence_exception,
+)
+from app.services.calendar import resolve_calendar_window
+from app.services.payments import require_succeeded_payment
+from app.services.recurrence import expand_series, series_query
+from app.utils.auth import get_current_user_id
+from app.utils.crud_helpers import get_all_by_field, get_one
+from app.utils.user_helpers import get_user_scoped_record
+
+router = APIRouter(
+    prefix="/booking_series",
+    tags=["booking_series"],
+    responses={404: {"description": "Not found"}},
+)
+
+
+def _get_user_series(
+    session: Session, series_id: UUID, supabase_user_id: UUID
+) -> BookingSeries:
+    """Fetch a series the current user is the customer or provider of."""
+    series = get_one(session, BookingSeries, series_id)
+
+    db_customer = get_user_scoped_record(session, Customer, supabase_user_id)
+    db_provider = get_user_scoped_record(session, Provider, supabase_user_id)
+    if not (
+        (db_customer and db_customer.id == series.customer_id)
+        or (db_provider and db_provider.id == series.provider_id)
+    ):
+        raise HTTPException(
+            status_code=403, detail="Booking series does not belong to this user"
+        )
+
+    return series
+
+
+# [AUTH: CUSTOMER VIEW] CREATE RECURRING BOOKING
+# The payment covers the first occurrence, as with a one-off booking
+@router.post("/", response_model=BookingSeriesRead)
+async def create_booking_series(
+    data: BookingSeriesCreate,
+    supabase_user_id: UUID = Depends(get_current_user_id),
+    session: Session = Depends(get_session),
+):
+    await require_succeeded_payment(data.stripe_payment_id)
+
+    db_customer = get_user_scoped_record(session, Customer, supabase_user_id)
+    if not db_customer:
+        raise HTTPException(status_code=404, detail="Customer not found")
+
+    service = get_one(session, Service, data.service_id)
+    if service.provider_id != data.provider_id:
+        raise HTTPException(
+            status_code=400, detail="Service does not belong to this provider"
+        )
+
+    return create_series(session, data, db_customer.id, service)
+
+
+# [AUTH: CUSTOMER VIEW] GET ALL RECURRING BOOKINGS
+@router.get("/me", response_model=list[BookingSeriesRead])
+async def read_booking_series_by_customer(
+    supabase_user_id: UUID = Depends(get_current_user_id),
+    session: Session = Depends(get_session),
+):
+    db_customer = get_user_scoped_record(session, Customer, supabase_user_id)
+    if not db_customer:
+        raise HTTPException(status_code=404, detail="Customer not found")
+
+    return get_all_by_field(session, BookingSeries, "customer_id", db_customer.id)
+
+
+# AUTH: GET ONE RECURRING BOOKING
+@router.get("/{series_id}", response_model=BookingSeriesRead)
+async def read_booking_series(
+    series_id: UUID,
+    supabase_user_id: UUID = Depends(get_current_user_id),
+    session: Session = Depends(get_session),
+):
+    return _get_user_series(session, series_id, supabase_user_id)
+
+
+# AUTH: Occurrences of a recurring booking between `from` and `to`
+@router.get("/{series_id}/occurrences", response_model=list[SeriesOccurrence])
+async def read_booking_series_occurrences(
+    series_id: UUID,
+    window_start: Optional[datetime] = Query(default=None, alias="from"),
+    window_end: Optional[datetime] = Query(default=None, alias="to"),
+    supabase_user_id: UUID = Depends(get_current_user_id),
+    session: Session = Depends(get_session),
+):
+    series = _get_user_series(session, series_id, supabase_user_id)
+    window_start, window_end = resolve_calendar_window(window_start, window_end)
+
+    occurrences = expand_series(
+        session,
+        series_query().where(BookingSeries.id == series.id),
+        window_start,
+        window_end,
+    )
+    return [SeriesOccurrence(**occurrence._asdict()) for _, occurrence in occurrences]
+
+
+# AUTH: Skip one occurrence of a recurring booking
+@router.post("/{series_id}/skip", response_model=dict)
+async def skip_booking_series_occurrence(
+    series_id: UUID,
+    data: OccurrenceSkip,
+    supabase_user_id: UUID = Depends(get_current_user_id),
+    session: Session = Depends(get_session),
+):
+    series = _get_user_series(session, series_id, supabase_user_id)
+    set_occurrence_exception(session, series, data.occurrence_start, None)
+    return {"detail": "Occurrence skipped"}
+
+
+# AUTH: Move one occurrence of a recurring booking to another free slot
+@router.post("/{series_id}/move", response_model=SeriesOccurrence)
+async def move_booking_series_occurrence(
+    series_id: UUID,
+    data: OccurrenceMove,
+    supabase_user_id: UUID = Depends(get_current_user_id),
+    session: Session = Depends(get_session),
+):
+    series = _get_user_series(session, series_id, supabase_user_id)
+    return set_occurrence_exception(
+        session, series, data.occurrence_start, data.new_start
+    )
+
+
+# AUTH: End a recurring booking; occurrences already past are kept
+@router.delete("/{series_id}", response_model=dict)
+async def end_booking_series(
+    series_id: UUID,
+    supabase_user_id: UUID = Depends(get_current_user_id),
+    session: Session = Depends(get_session),
+):
+    series = _get_user_series(session, series_id, supabase_user_id)
+    end_series(session, series)
+    return {"detail": "BookingSeries ended"}
@@ -2,10 +2,9 @@ from fastapi import APIRouter, Depends
 from sqlmodel import Session
 
 from app.db.session import get_session
-from app.models.coupon import Coupon, CouponList
-from app.utils.crud_helpers import (
-    get_all,
-)
+from app.models.coupon import CouponList, CouponValidation
+from app.services.coupons import coupon_index
+from app.utils.http_cache import conditional_get
 
 router = APIRouter(
     prefix="/coupons",
@@ -14,9 +13,20 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=list[CouponList])
+# Coupons change rarely; let clients and CDNs revalidate with ETags
+@router.get(
+    "/",
+    response_model=list[CouponList],
+    dependencies=[Depends(conditional_get(max_age=300, shared_max_age=300))],
+)
 def read_all_coupons(session: Session = Depends(get_session)):
-    return get_all(
-        session,
-        Coupon,
-    )
+    return coupon_index.snapshot(session).coupons
+
+
+# CHECK a coupon code before checkout, from the in-memory coupon snapshot
+@router.get("/{code}/validate", response_model=CouponValidation)
+def validate_coupon(code: str, session: Session = Depends(get_session)):
+    coupon = coupon_index.lookup(session, code)
+    if not coupon:
+        return CouponValidation(coupon_code=code, valid=False)
+    return CouponValidation(valid=True, **coupon.model_dump())
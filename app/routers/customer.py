@@ -1,20 +1,18 @@
 from typing import cast
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session
 
 from app.db.session import get_session
-from app.models.booking import Booking
 from app.models.customer import (
     Customer,
     CustomerCreate,
     CustomersBookings,
     CustomerUpdate,
 )
-from app.models.enums import StatusEnum
-from app.models.provider import Provider
-from app.models.service import Service
+from app.services.dashboard import get_customer_dashboard
+from app.services.provider_profile import invalidate_reviewed_profiles
 from app.utils.auth import get_current_user_id
 from app.utils.crud_helpers import create_one, delete_one, get_all, update_one
 from app.utils.user_helpers import get_user_scoped_record
@@ -65,62 +63,15 @@ async def read_all_customers(session: Session = Depends(get_session)):
 # GET all upcoming bookings and need review bookings for current customer
 @router.get("/{customer_id}/dashboard", response_model=CustomersBookings)
 async def read_users_bookings(
-    customer_id: UUID, session: Session = Depends(get_session)
+    customer_id: UUID,
+    upcoming_limit: int = Query(default=20, ge=1, le=100),
+    review_limit: int = Query(default=20, ge=1, le=100),
+    session: Session = Depends(get_session),
 ):
     if not customer_id:
         raise HTTPException(status_code=400, detail="user id not found")
 
-    # Get bookings for the specific customer
-    bookings = session.exec(
-        select(
-            Booking.id.label("booking_id"),
-            Booking.start_time,
-            Booking.status,
-            Provider.company_name,
-            Provider.first_name,
-            Provider.last_name,
-            Service.service_title,
-            Provider.id.label("provider_id"),
-        )
-        .join(Provider, Provider.id == Booking.provider_id)
-        .join(Service, Service.id == Booking.service_id)
-        .where(Booking.customer_id == customer_id)
-    ).all()
-
-    completed_needs_review = []
-    upcoming_bookings = []
-    for booking in bookings:
-        booking_dict = dict(booking._asdict())
-        if booking.status == StatusEnum.review_needed:
-            completed_needs_review.append(
-                {
-                    **booking_dict,
-                    "provider_first_name": booking_dict["first_name"],
-                    "provider_last_name": booking_dict["last_name"],
-                    "provider_company_name": booking_dict["company_name"],
-                    "booking_id": booking_dict["booking_id"],
-                    "provider_id": booking_dict["provider_id"],
-                }
-            )
-        elif (
-            booking.status != StatusEnum.cancelled
-            or booking.status != StatusEnum.completed
-        ):
-            upcoming_bookings.append(
-                {
-                    **booking_dict,
-                    "provider_first_name": booking_dict["first_name"],
-                    "provider_last_name": booking_dict["last_name"],
-                    "provider_company_name": booking_dict["company_name"],
-                    "booking_id": booking_dict["booking_id"],
-                    "provider_id": booking_dict["provider_id"],
-                }
-            )
-
-    return CustomersBookings(
-        completed_needs_review=completed_needs_review,
-        upcoming_bookings=upcoming_bookings,
-    )
+    return get_customer_dashboard(session, customer_id, upcoming_limit, review_limit)
 
 
 # AUTH: Update current user's customer record
@@ -137,9 +88,13 @@ async def update_own_customer(
 
     # Type cast since we know it's a Customer instance
     customer = cast(Customer, db_customer)
-    return update_one(
-        session, Customer, customer.id, update_data.model_dump(exclude_unset=True)
-    )
+    updates = update_data.model_dump(exclude_unset=True)
+    updated = update_one(session, Customer, customer.id, updates)
+
+    # provider profiles show reviewers' names on recent reviews
+    if {"first_name", "last_name"} & updates.keys():
+        invalidate_reviewed_profiles(session, customer.id)
+    return updated
 
 
 # AUTH: Delete current user's customer record
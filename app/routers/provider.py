@@ -1,12 +1,21 @@
+from datetime import datetime, timedelta
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import selectinload
-from sqlmodel import Session, func, select
+from sqlmodel import Session, select
 
 from app.db.session import get_session
-from app.models.booking import Booking, BookingReponseProvider
+from app.models.address import Address
+from app.models.availability import (
+    AvailabilitySlot,
+    CategorySlot,
+    ProviderAvailability,
+)
+from app.models.booking import Booking, BookingReponseProvider, CalendarEntry
 from app.models.customer import Customer
+from app.models.enums import StatusEnum
 from app.models.provider import (
     Provider,
     ProviderCreate,
@@ -14,10 +23,37 @@ from app.models.provider import (
     ProviderResponseDetail,
     ProviderUpdate,
 )
-from app.models.reviews import Review, ReviewRead
+from app.models.reviews import ProviderReviewPage
 from app.models.service import Service
+from app.models.service_area import (
+    NearbyProvider,
+    ProviderServiceArea,
+    ServiceAreaRead,
+    ServiceAreaUpdate,
+)
+from app.services.autocomplete import autocomplete
+from app.services.availability import (
+    DEFAULT_SLOT_MINUTES,
+    earliest_slots_in_category,
+    get_busy_schedules,
+    resolve_window,
+)
+from app.services.calendar import get_provider_calendar, resolve_calendar_window
+from app.services.listings import (
+    get_provider_categories,
+    invalidate_category_listings,
+    invalidate_provider_listings,
+    provider_listing_cache,
+)
+from app.services.nearby import find_nearby_providers, set_service_area
+from app.services.provider_profile import (
+    get_provider_profile,
+    invalidate_provider_profile,
+)
+from app.services.reviews import get_provider_reviews_page
 from app.utils.auth import get_current_user_id
 from app.utils.crud_helpers import create_one, delete_one, get_all, get_one, update_one
+from app.utils.http_cache import conditional_get
 from app.utils.user_helpers import get_user_scoped_record
 from app.utils.validate_categories import validate_category
 
@@ -43,11 +79,17 @@ async def create_provider(
     provider_data = payload.model_dump()
     provider_data["supabase_user_id"] = supabase_user_id
 
-    return create_one(session, Provider, provider_data)
+    db_provider = create_one(session, Provider, provider_data)
+    autocomplete.upsert_provider(db_provider)
+    return db_provider
 
 
 # Return all providers
-@router.get("/all", response_model=list[ProviderPublicRead])
+@router.get(
+    "/all",
+    response_model=list[ProviderPublicRead],
+    dependencies=[Depends(conditional_get(max_age=60, shared_max_age=60))],
+)
 async def get_all_providers(session: Session = Depends(get_session)):
     return get_all(session, Provider)
 
@@ -86,123 +128,185 @@ async def get_provider_bookings(
     return all_bookings
 
 
-# Return provider details by ID
-@router.get("/{provider_id}", response_model=ProviderResponseDetail)
-async def get_provider_details(
-    provider_id: UUID, session: Session = Depends(get_session)
+# AUTH: Current provider's bookings between `from` and `to`, optionally by status
+@router.get("/calendar", response_model=list[CalendarEntry])
+async def read_provider_calendar(
+    window_start: Optional[datetime] = Query(default=None, alias="from"),
+    window_end: Optional[datetime] = Query(default=None, alias="to"),
+    status: Optional[list[StatusEnum]] = Query(default=None),
+    supabase_user_id: UUID = Depends(get_current_user_id),
+    session: Session = Depends(get_session),
 ):
-    provider = get_one(session, Provider, provider_id)
-
-    if not provider:
+    db_provider = get_user_scoped_record(session, Provider, supabase_user_id)
+    if not db_provider:
         raise HTTPException(status_code=404, detail="Provider not found")
 
-    recent_reviews = session.exec(
-        select(
-            Review.rating,
-            Review.description,
-            Review.created_at,
-            Customer.first_name,
-            Customer.last_name,
+    window_start, window_end = resolve_calendar_window(window_start, window_end)
+    return get_provider_calendar(
+        session, db_provider.id, window_start, window_end, status
+    )
+
+
+# AUTH: Providers whose service area covers one of the customer's addresses
+@router.get("/nearby", response_model=list[NearbyProvider])
+async def read_nearby_providers(
+    address_id: UUID,
+    category: Optional[str] = None,
+    limit: int = Query(default=20, ge=1, le=100),
+    supabase_user_id: UUID = Depends(get_current_user_id),
+    session: Session = Depends(get_session),
+):
+    db_customer = get_user_scoped_record(session, Customer, supabase_user_id)
+    if not db_customer:
+        raise HTTPException(status_code=404, detail="Customer not found")
+
+    address = get_one(session, Address, address_id)
+    if address.customer_id != db_customer.id:
+        raise HTTPException(
+            status_code=403, detail="Address does not belong to this customer"
         )
-        .join(Customer, Review.customer_id == Customer.id)
-        .where(Review.provider_id == provider_id)
-        .order_by(Review.created_at.desc())
-        .limit(3)
-    ).all()
-
-    review_list = [
-        ReviewRead(
-            customer_name=f"{review.first_name} {review.last_name}",
-            rating=review.rating,
-            description=review.description,
-            created_at=review.created_at,
+    if address.latitude is None or address.longitude is None:
+        raise HTTPException(
+            status_code=400, detail="Address has no coordinates, update it to geocode"
+        )
+
+    category_enum_val = validate_category(category) if category else None
+    return find_nearby_providers(session, address, category_enum_val, limit)
+
+
+# AUTH: Current provider's service area
+@router.get("/me/service_area", response_model=ServiceAreaRead)
+async def read_own_service_area(
+    supabase_user_id: UUID = Depends(get_current_user_id),
+    session: Session = Depends(get_session),
+):
+    db_provider = get_user_scoped_record(session, Provider, supabase_user_id)
+    if not db_provider:
+        raise HTTPException(status_code=404, detail="Provider not found")
+
+    area = session.exec(
+        select(ProviderServiceArea).where(
+            ProviderServiceArea.provider_id == db_provider.id
         )
-        for review in recent_reviews
-    ]
-
-    review_data = session.exec(
-        select(
-            func.count(Review.id).label("count"),
-            func.avg(Review.rating).label("average"),
-        ).where(Review.provider_id == provider_id)
     ).first()
+    if not area:
+        raise HTTPException(status_code=404, detail="Service area not set")
+    return area
+
+
+# AUTH: Set the current provider's service area (center + radius and/or zips)
+@router.put("/me/service_area", response_model=ServiceAreaRead)
+async def update_own_service_area(
+    data: ServiceAreaUpdate,
+    supabase_user_id: UUID = Depends(get_current_user_id),
+    session: Session = Depends(get_session),
+):
+    db_provider = get_user_scoped_record(session, Provider, supabase_user_id)
+    if not db_provider:
+        raise HTTPException(status_code=404, detail="Provider not found")
+
+    return set_service_area(session, db_provider.id, data)
 
-    return ProviderResponseDetail(
-        id=provider.id,
-        first_name=provider.first_name,
-        last_name=provider.last_name,
-        company_name=provider.company_name,
-        phone_number=provider.phone_number,
-        services=provider.services,
-        reviews=review_list,
-        review_count=review_data.count or 0,
-        average_rating=float(review_data.average) if review_data.average else None,
+
+# Return provider details by ID
+# Served from a snapshot that provider, service and review writes invalidate
+# Plain def: the snapshot cache and the rebuild on a miss both block
+@router.get(
+    "/{provider_id}",
+    response_model=ProviderResponseDetail,
+    dependencies=[Depends(conditional_get(max_age=60, shared_max_age=60))],
+)
+def get_provider_details(provider_id: UUID, session: Session = Depends(get_session)):
+    return Response(
+        content=get_provider_profile(session, provider_id),
+        media_type="application/json",
     )
 
 
-# PUBLIC Get all providers
-@router.get("/all/{category_name}", response_model=list[ProviderResponseDetail])
-async def read_providers_category_name(
-    category_name: str, session: Session = Depends(get_session)
+# PUBLIC: A provider's reviews, newest first, optionally of one star rating
+# The first page also carries the 1-5 star histogram
+@router.get("/{provider_id}/reviews", response_model=ProviderReviewPage)
+async def read_provider_reviews(
+    provider_id: UUID,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=20, ge=1, le=100),
+    rating: Optional[int] = Query(default=None, ge=1, le=5),
+    session: Session = Depends(get_session),
 ):
-    # Convert public-facing slug to DB enum NAME (e.g. "housecleaning" -> "HOUSE_CLEANING")
-    category_enum_val = validate_category(category_name)
+    return get_provider_reviews_page(session, provider_id, limit, cursor, rating)
 
-    try:
-        if not category_enum_val:
-            raise HTTPException(status_code=400, detail="category name not found")
-
-        # Join providers->services and filter by the Service.category enum NAME.
-        # distinct() ensures a provider with many matching services appears once.
-        providers_result = session.exec(
-            select(Provider)
-            .join(Service, Service.provider_id == Provider.id)
-            .options(selectinload(Provider.services))
-            .where(Service.category == category_enum_val)
-            .distinct()
-        ).all()
-
-        if not providers_result:
-            return []
-
-        provider_ids = [p.id for p in providers_result]
-        aggregates = session.exec(
-            select(
-                Review.provider_id,
-                func.count(Review.id).label("count"),
-                func.avg(Review.rating).label("average"),
-            )
-            .where(Review.provider_id.in_(provider_ids))
-            .group_by(Review.provider_id)
-        ).all()
-
-        agg_map = {row.provider_id: row for row in aggregates}
-
-        # Build enriched response
-        response: list[ProviderResponseDetail] = []
-        for provider in providers_result:
-            agg = agg_map.get(provider.id)
-            response.append(
-                ProviderResponseDetail(
-                    id=provider.id,
-                    first_name=provider.first_name,
-                    last_name=provider.last_name,
-                    company_name=provider.company_name,
-                    phone_number=provider.phone_number,
-                    services=provider.services,
-                    reviews=[],
-                    review_count=(agg.count if agg else 0),
-                    average_rating=(
-                        float(agg.average) if agg and agg.average is not None else None
-                    ),
-                )
+
+# PUBLIC: Open time slots for a provider between `from` and `to`
+@router.get("/{provider_id}/availability", response_model=ProviderAvailability)
+async def read_provider_availability(
+    provider_id: UUID,
+    window_start: Optional[datetime] = Query(default=None, alias="from"),
+    window_end: Optional[datetime] = Query(default=None, alias="to"),
+    service_id: Optional[UUID] = None,
+    session: Session = Depends(get_session),
+):
+    get_one(session, Provider, provider_id)
+
+    duration = DEFAULT_SLOT_MINUTES
+    if service_id:
+        service = get_one(session, Service, service_id)
+        if service.provider_id != provider_id:
+            raise HTTPException(
+                status_code=400, detail="Service does not belong to this provider"
             )
+        duration = service.duration
+
+    window_start, window_end = resolve_window(window_start, window_end)
 
-        return response
+    schedules = get_busy_schedules(session, [provider_id], window_start, window_end)
+    slots = schedules[provider_id].free_slots(
+        window_start, window_end, timedelta(minutes=duration)
+    )
+
+    return ProviderAvailability(
+        provider_id=provider_id,
+        service_id=service_id,
+        duration=duration,
+        slots=[
+            AvailabilitySlot(start_time=start, end_time=end) for start, end in slots
+        ],
+    )
 
-    except Exception as e:
-        print(f"Exception: {e}")
-        raise HTTPException(status_code=400, detail=f"Error occurred: {str(e)}")
+
+# PUBLIC: Earliest open slots across all providers in a category
+@router.get("/availability/{category_name}", response_model=list[CategorySlot])
+async def read_category_availability(
+    category_name: str,
+    window_start: Optional[datetime] = Query(default=None, alias="from"),
+    window_end: Optional[datetime] = Query(default=None, alias="to"),
+    limit: int = Query(default=10, ge=1, le=50),
+    per_service: int = Query(default=1, ge=1, le=10),
+    session: Session = Depends(get_session),
+):
+    category_enum_val = validate_category(category_name)
+    window_start, window_end = resolve_window(window_start, window_end)
+
+    return earliest_slots_in_category(
+        session, category_enum_val, window_start, window_end, limit, per_service
+    )
+
+
+# PUBLIC Get all providers
+# Served from a per-category cache that is rebuilt in the background
+# Plain def: a cold category is loaded by the request itself, which blocks
+@router.get(
+    "/all/{category_name}",
+    response_model=list[ProviderResponseDetail],
+    dependencies=[Depends(conditional_get(max_age=60, shared_max_age=60))],
+)
+def read_providers_category_name(category_name: str):
+    # Convert public-facing slug to DB enum NAME (e.g. "housecleaning" -> "HOUSE_CLEANING")
+    category_enum_val = validate_category(category_name)
+
+    return Response(
+        content=provider_listing_cache.get(category_enum_val),
+        media_type="application/json",
+    )
 
 
 # AUTH: Update current user's provider record
@@ -216,9 +320,13 @@ async def update_own_provider(
     if not db_provider:
         raise HTTPException(status_code=404, detail="Provider not found")
 
-    return update_one(
+    updated = update_one(
         session, Provider, db_provider.id, update_data.model_dump(exclude_unset=True)
     )
+    invalidate_provider_listings(session, db_provider.id)
+    invalidate_provider_profile(db_provider.id)
+    autocomplete.upsert_provider(updated)
+    return updated
 
 
 # AUTH: Delete current user's provider record
@@ -231,4 +339,9 @@ async def delete_own_provider(
     if not db_provider:
         raise HTTPException(status_code=404, detail="Provider not found")
 
-    return delete_one(session, Provider, db_provider.id)
+    categories = get_provider_categories(session, db_provider.id)
+    deleted = delete_one(session, Provider, db_provider.id)
+    invalidate_category_listings(categories)
+    invalidate_provider_profile(db_provider.id)
+    autocomplete.remove_provider(db_provider.id)
+    return deleted
@@ -0,0 +1,72 @@
+import asyncio
+import logging
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from sqlmodel import Session
+
+from app.db.engine import engine
+from app.models.customer import Customer
+from app.models.provider import Provider
+from app.services.realtime import hub
+from app.utils.auth import get_user_id_from_token
+from app.utils.user_helpers import get_user_scoped_record
+
+router = APIRouter(
+    prefix="/realtime",
+    tags=["realtime"],
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _subscription_keys(supabase_user_id: UUID) -> list[str]:
+    # short-lived session: a socket can stay open for hours and must not pin a
+    # pooled connection
+    with Session(engine) as session:
+        db_customer = get_user_scoped_record(session, Customer, supabase_user_id)
+        db_provider = get_user_scoped_record(session, Provider, supabase_user_id)
+    return [str(record.id) for record in (db_customer, db_provider) if record]
+
+
+async def _send_events(websocket: WebSocket, queue: asyncio.Queue) -> None:
+    while True:
+        await websocket.send_json(await queue.get())
+
+
+async def _drain_client(websocket: WebSocket) -> None:
+    # clients don't send anything meaningful; reading just surfaces disconnects
+    while True:
+        await websocket.receive_text()
+
+
+# AUTH: Push booking status changes for the current user's bookings (as
+# customer and/or provider). Browsers can't set headers on a WebSocket, so the
+# Supabase access token is passed as `?token=`.
+@router.websocket("/bookings")
+async def booking_status_socket(websocket: WebSocket, token: str):
+    try:
+        keys = _subscription_keys(await get_user_id_from_token(token))
+    except HTTPException:
+        keys = []
+
+    if not keys:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscriber = hub.subscribe(keys)
+    tasks = [
+        asyncio.create_task(_send_events(websocket, subscriber.queue)),
+        asyncio.create_task(_drain_client(websocket)),
+    ]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            exc = task.exception()
+            if exc and not isinstance(exc, WebSocketDisconnect):
+                logger.warning("Realtime socket closed with error: %s", exc)
+    finally:
+        for task in tasks:
+            task.cancel()
+        hub.unsubscribe(subscriber)
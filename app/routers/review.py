@@ -1,23 +1,28 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import Session
 
 from app.db.session import get_session
 from app.models.reviews import Review, ReviewCreate, ReviewUpdate
-from app.utils.crud_helpers import (
-    create_one,
-    delete_one,
-    get_all,
-    get_one,
-    update_one,
-)
+from app.services.listings import invalidate_provider_listings
+from app.services.provider_profile import invalidate_provider_profile
+from app.services.provider_stats import apply_review_change
+from app.utils.crud_helpers import get_all, get_one
 
 router = APIRouter(
     prefix="/reviews", tags=["reviews"], responses={404: {"description": "Not found"}}
 )
 
 
+def _get_review_for_update(session: Session, review_id: UUID) -> Review:
+    # lock the row so concurrent edits see each other's old rating
+    review = session.get(Review, review_id, with_for_update=True)
+    if not review:
+        raise HTTPException(status_code=404, detail="Review not found")
+    return review
+
+
 # PUBLIC: Get all reviews
 @router.get("/", response_model=list[Review])
 async def read_reviews(session: Session = Depends(get_session)):
@@ -31,9 +36,18 @@ async def read_review(review_id: UUID, session: Session = Depends(get_session)):
 
 
 # AUTH: Create a review (for now, auth optional)
+# The provider's rating stats are updated in the same transaction
 @router.post("/", response_model=Review)
 async def create_review(review: ReviewCreate, session: Session = Depends(get_session)):
-    return create_one(session, Review, review.dict())
+    db_review = Review(**review.dict())
+    session.add(db_review)
+    apply_review_change(session, db_review.provider_id, None, db_review.rating)
+    session.commit()
+    session.refresh(db_review)
+
+    invalidate_provider_listings(session, db_review.provider_id)
+    invalidate_provider_profile(db_review.provider_id)
+    return db_review
 
 
 # AUTH: Update a review (for now, no owner check)
@@ -41,10 +55,33 @@ async def create_review(review: ReviewCreate, session: Session = Depends(get_ses
 async def update_review(
     review_id: UUID, update_data: ReviewUpdate, session: Session = Depends(get_session)
 ):
-    return update_one(session, Review, review_id, update_data.dict(exclude_unset=True))
+    db_review = _get_review_for_update(session, review_id)
+    old_rating = db_review.rating
+
+    for field, value in update_data.dict(exclude_unset=True).items():
+        setattr(db_review, field, value)
+
+    session.add(db_review)
+    apply_review_change(session, db_review.provider_id, old_rating, db_review.rating)
+    session.commit()
+    session.refresh(db_review)
+
+    # listings show ratings, not review text
+    if db_review.rating != old_rating:
+        invalidate_provider_listings(session, db_review.provider_id)
+    invalidate_provider_profile(db_review.provider_id)
+    return db_review
 
 
 # AUTH: Delete a review
 @router.delete("/{review_id}", response_model=dict)
 async def delete_review(review_id: UUID, session: Session = Depends(get_session)):
-    return delete_one(session, Review, review_id)
+    db_review = _get_review_for_update(session, review_id)
+
+    session.delete(db_review)
+    apply_review_change(session, db_review.provider_id, db_review.rating, None)
+    session.commit()
+
+    invalidate_provider_listings(session, db_review.provider_id)
+    invalidate_provider_profile(db_review.provider_id)
+    return {"detail": "Review deleted successfully"}
@@ -1,13 +1,32 @@
 import logging
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlmodel import Session
 
 from app.db.session import get_session
-from app.models.service import Service, ServiceCreate, ServiceEnum, ServiceUpdate
+from app.models.service import (
+    AutocompleteSuggestion,
+    Service,
+    ServiceCreate,
+    ServiceSearchPage,
+    ServiceUpdate,
+)
+from app.models.subcategory import SubcategoryRead
+from app.services.autocomplete import MAX_SUGGESTIONS, autocomplete
 from app.services.db_access import get_all_services
+from app.services.listings import invalidate_service_listings, service_listing_cache
+from app.services.provider_profile import invalidate_provider_profile
+from app.services.service_search import search_services
+from app.services.subcategories import (
+    get_services_by_subcategory,
+    list_subcategories,
+    validate_subcategories,
+)
 from app.utils.crud_helpers import create_one, delete_one, get_one, update_one
+from app.utils.http_cache import conditional_get
+from app.utils.validate_categories import validate_category
 
 router = APIRouter(
     prefix="/services", tags=["services"], responses={404: {"description": "Not found"}}
@@ -16,12 +35,79 @@ router = APIRouter(
 logger = logging.getLogger(__name__)
 
 
-# GET all services
-@router.get("/", response_model=list[Service])
-async def read_services(session: Session = Depends(get_session)):
+# GET all services, optionally only those tagged with a subcategory (by name)
+@router.get(
+    "/",
+    response_model=list[Service],
+    dependencies=[Depends(conditional_get(max_age=60, shared_max_age=60))],
+)
+async def read_services(
+    subcategory: Optional[str] = Query(default=None, max_length=200),
+    session: Session = Depends(get_session),
+):
+    if subcategory:
+        return get_services_by_subcategory(session, subcategory)
     return get_all_services(session)
 
 
+# PUBLIC: The subcategory taxonomy, optionally for one category
+@router.get(
+    "/subcategories",
+    response_model=list[SubcategoryRead],
+    dependencies=[Depends(conditional_get(max_age=3600, shared_max_age=3600))],
+)
+async def read_subcategories(
+    category: Optional[str] = None, session: Session = Depends(get_session)
+):
+    category_enum_val = validate_category(category) if category else None
+    return list_subcategories(session, category_enum_val)
+
+
+# PUBLIC: Search services by text and filters, best matches first
+# Pass `next_cursor` from a page back as `cursor` to get the next one
+@router.get("/search", response_model=ServiceSearchPage)
+async def read_service_search(
+    q: Optional[str] = Query(default=None, max_length=200),
+    category: Optional[str] = None,
+    min_price: Optional[float] = Query(default=None, ge=0),
+    max_price: Optional[float] = Query(default=None, ge=0),
+    max_duration: Optional[int] = Query(default=None, ge=1),
+    limit: int = Query(default=20, ge=1, le=50),
+    cursor: Optional[str] = None,
+    session: Session = Depends(get_session),
+):
+    if min_price is not None and max_price is not None and min_price > max_price:
+        raise HTTPException(
+            status_code=400, detail="min_price must not be greater than max_price"
+        )
+
+    category_enum_val = validate_category(category) if category else None
+    return search_services(
+        session,
+        q,
+        category_enum_val,
+        min_price,
+        max_price,
+        max_duration,
+        limit,
+        cursor,
+    )
+
+
+# PUBLIC: Search-as-you-type suggestions from service titles, provider company
+# names and subcategories, most booked first. Served from memory.
+@router.get(
+    "/autocomplete",
+    response_model=list[AutocompleteSuggestion],
+    dependencies=[Depends(conditional_get(max_age=60, shared_max_age=60))],
+)
+async def read_autocomplete(
+    prefix: str = Query(min_length=1, max_length=100),
+    limit: int = Query(default=8, ge=1, le=MAX_SUGGESTIONS),
+):
+    return autocomplete.search(prefix, limit)
+
+
 # GET one service by ID
 @router.get("/{service_id}", response_model=Service)
 async def read_service(service_id: UUID, session: Session = Depends(get_session)):
@@ -29,33 +115,20 @@ async def read_service(service_id: UUID, session: Session = Depends(get_session)
 
 
 # GET service by category
-@router.get("/category/{category_name}", response_model=list[Service])
-async def read_service_category(
-    category_name: str, session: Session = Depends(get_session)
-):
-    # creates an array of all the values in the Service Enum (right side of enum)
-    valid_categories = [category.value for category in ServiceEnum]
+# Served from a per-category cache that is rebuilt in the background
+# Plain def: a cold category is loaded by the request itself, which blocks
+@router.get(
+    "/category/{category_name}",
+    response_model=list[Service],
+    dependencies=[Depends(conditional_get(max_age=60, shared_max_age=60))],
+)
+def read_service_category(category_name: str):
+    category_enum_val = validate_category(category_name)
 
-    if category_name not in valid_categories:
-        # return []
-        raise HTTPException(
-            status_code=400,
-            detail=f"invalid category, valid categories are: {valid_categories}",
-        )
-    try:
-        # fetches the value from the enum based on the category name passed and was validated
-        enum_name = None
-        for category in ServiceEnum:
-            if category.value == category_name:
-                enum_name = category.name
-                break
-        statement = select(Service).where(Service.category == enum_name)
-        result = session.exec(statement)
-        return result.all()
-
-    except Exception:
-        logger.exception("Unexpected error while fetching services by category")
-        raise HTTPException(status_code=500, detail="Internal server error")
+    return Response(
+        content=service_listing_cache.get(category_enum_val),
+        media_type="application/json",
+    )
 
 
 # CREATE a service
@@ -63,7 +136,15 @@ async def read_service_category(
 async def create_service(
     service: ServiceCreate, session: Session = Depends(get_session)
 ):
-    return create_one(session, Service, service.model_dump())
+    data = service.model_dump()
+    data["services_subcategories"] = validate_subcategories(
+        session, service.category, service.services_subcategories
+    )
+    db_service = create_one(session, Service, data)
+    invalidate_service_listings(session, db_service.provider_id, db_service.category)
+    invalidate_provider_profile(db_service.provider_id)
+    autocomplete.upsert_service(db_service)
+    return db_service
 
 
 # UPDATE a service
@@ -73,12 +154,27 @@ async def update_service(
     update_data: ServiceUpdate,
     session: Session = Depends(get_session),
 ):
-    return update_one(
-        session, Service, service_id, update_data.model_dump(exclude_unset=True)
-    )
+    data = update_data.model_dump(exclude_unset=True)
+    if "services_subcategories" in data:
+        category = get_one(session, Service, service_id).category
+        data["services_subcategories"] = validate_subcategories(
+            session, category, data["services_subcategories"]
+        )
+
+    db_service = update_one(session, Service, service_id, data)
+    invalidate_service_listings(session, db_service.provider_id, db_service.category)
+    invalidate_provider_profile(db_service.provider_id)
+    autocomplete.upsert_service(db_service)
+    return db_service
 
 
 # DELETE a service
 @router.delete("/{service_id}", response_model=dict)
 async def delete_service(service_id: UUID, session: Session = Depends(get_session)):
-    return delete_one(session, Service, service_id)
+    db_service = get_one(session, Service, service_id)
+    provider_id, category = db_service.provider_id, db_service.category
+    deleted = delete_one(session, Service, service_id)
+    invalidate_service_listings(session, provider_id, category)
+    invalidate_provider_profile(provider_id)
+    autocomplete.remove_service(service_id)
+    return deleted
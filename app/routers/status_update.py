@@ -1,15 +1,23 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import Session
 
 from app.db.session import get_session
+from app.models.booking import Booking
+from app.models.customer import Customer
+from app.models.provider import Provider
 from app.models.status_update import (
+    StatusFeed,
     StatusUpdate,
     StatusUpdateCreate,
+    StatusUpdateRead,
     StatusUpdateUpdate,
 )
+from app.services.booking_events import MAX_FEED_WAIT, feed_notifier, wait_for_feed
+from app.utils.auth import get_current_user_id
 from app.utils.crud_helpers import create_one, delete_one, get_all, get_one, update_one
+from app.utils.user_helpers import get_user_scoped_record
 
 router = APIRouter(
     prefix="/status_updates",
@@ -23,6 +31,37 @@ async def read_all_status_updates(session: Session = Depends(get_session)):
     return get_all(session, StatusUpdate)
 
 
+# AUTH: Status changes on the current user's bookings (as customer and/or
+# provider) after the `since` cursor. With `wait`, blocks up to that many
+# seconds until something new arrives.
+@router.get("/feed", response_model=StatusFeed)
+async def read_status_feed(
+    since: int = Query(default=0, ge=0),
+    wait: int = Query(default=0, ge=0, le=MAX_FEED_WAIT),
+    limit: int = Query(default=100, ge=1, le=500),
+    supabase_user_id: UUID = Depends(get_current_user_id),
+    session: Session = Depends(get_session),
+):
+    db_customer = get_user_scoped_record(session, Customer, supabase_user_id)
+    db_provider = get_user_scoped_record(session, Provider, supabase_user_id)
+    if not db_customer and not db_provider:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    events = await wait_for_feed(
+        session,
+        db_customer.id if db_customer else None,
+        db_provider.id if db_provider else None,
+        since,
+        limit,
+        wait,
+    )
+
+    return StatusFeed(
+        events=[StatusUpdateRead.model_validate(event) for event in events],
+        cursor=events[-1].seq if events else since,
+    )
+
+
 @router.get("/{record_id}", response_model=StatusUpdate)
 async def read_status_update(record_id: UUID, session: Session = Depends(get_session)):
     return get_one(session, StatusUpdate, record_id)
@@ -32,7 +71,15 @@ async def read_status_update(record_id: UUID, session: Session = Depends(get_ses
 async def create_status_update(
     data: StatusUpdateCreate, session: Session = Depends(get_session)
 ):
-    return create_one(session, StatusUpdate, data.dict())
+    booking = get_one(session, Booking, data.booking_id)
+
+    status_update = data.model_dump()
+    status_update["customer_id"] = booking.customer_id
+    status_update["provider_id"] = booking.provider_id
+
+    db_status_update = create_one(session, StatusUpdate, status_update)
+    feed_notifier.notify()
+    return db_status_update
 
 
 @router.patch("/{record_id}", response_model=StatusUpdate)
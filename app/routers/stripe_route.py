@@ -1,16 +1,23 @@
+from typing import Optional
+from uuid import UUID
+
 import stripe
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from sqlmodel import Session
 
 from app import config
 from app.db.session import get_session
-from app.models.coupon import Coupon
 from app.models.service import Service
 from app.models.stripe_model import (
     PaymentIntentCreateRequest,
     PaymentIntentCreateResponse,
 )
+from app.services.coupons import coupon_index
+from app.services.payments import create_payment_intent, handle_webhook_event
+from app.services.slot_holds import attach_payment_intent, create_hold, release_hold
+from app.utils.auth import get_current_user_id
 from app.utils.crud_helpers import get_one
+from app.utils.idempotency import get_idempotency_key, run_idempotent
 
 router = APIRouter(
     prefix="/stripe",
@@ -18,34 +25,75 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-stripe.api_key = config.STRIPE_SECRET_KEY
-
 
 # Payment Intent https://docs.stripe.com/api/payment_intents/create
 
 
+# [AUTH: CUSTOMER VIEW] CREATE PAYMENT INTENT
+# Retries with the same Idempotency-Key header replay the first response
+# instead of creating another PaymentIntent. Keys are per user, so a replay
+# never hands one customer another's client_secret.
 @router.post("/create-payment-intent", response_model=PaymentIntentCreateResponse)
 async def create_payment_request(
-    data: PaymentIntentCreateRequest, session: Session = Depends(get_session)
+    data: PaymentIntentCreateRequest,
+    supabase_user_id: UUID = Depends(get_current_user_id),
+    session: Session = Depends(get_session),
+    idempotency_key: Optional[str] = Depends(get_idempotency_key),
 ):
+    return await run_idempotent(
+        session,
+        f"POST /stripe/create-payment-intent:{supabase_user_id}",
+        idempotency_key,
+        data,
+        lambda: _create_payment_request(data, session),
+    )
+
+
+async def _create_payment_request(
+    data: PaymentIntentCreateRequest, session: Session
+) -> PaymentIntentCreateResponse:
     try:
         service: Service = get_one(session, Service, data.service_id)
         price = service.pricing
 
         if data.coupon_code:
-            coupon = session.exec(
-                select(Coupon).where(Coupon.coupon_code == data.coupon_code)
-            ).first()
+            coupon = coupon_index.lookup(session, data.coupon_code)
 
             if not coupon:
                 raise HTTPException(status_code=400, detail="Invalid coupon")
 
             price = service.pricing * (1 - coupon.discount_value / 100)
 
-        payment_intent = stripe.PaymentIntent.create(
-            amount=int(price * 100), currency="usd"
+        amount = int(price * 100)
+
+        # reserve the slot before charging so two customers can't pay for it
+        hold = None
+        if data.start_time:
+            hold = create_hold(session, service, data.start_time)
+
+        # return the DB connection to the pool while we wait on Stripe
+        session.close()
+
+        try:
+            payment_intent = await create_payment_intent(
+                amount, {"slot_hold_id": str(hold.id)} if hold else {}
+            )
+        except stripe.error.StripeError:
+            if hold:
+                release_hold(session, hold.id)
+            raise
+
+        if hold:
+            hold = attach_payment_intent(session, hold, payment_intent.id)
+
+        return PaymentIntentCreateResponse(
+            client_secret=payment_intent.client_secret,
+            hold_id=hold.id if hold else None,
+            hold_expires_at=hold.expires_at if hold else None,
         )
-        return {"client_secret": payment_intent.client_secret}
+
+    except HTTPException:
+        raise
 
     # payment error
     except stripe.CardError as e:
@@ -62,3 +110,24 @@ async def create_payment_request(
     # internal server error
     except Exception:
         raise HTTPException(status_code=500, detail="Internal server error.")
+
+
+# Webhooks https://docs.stripe.com/webhooks
+# Keeps the PaymentIntent status cache fresh so bookings can skip Stripe
+@router.post("/webhook", include_in_schema=False)
+async def receive_stripe_webhook(
+    request: Request, stripe_signature: str = Header(alias="Stripe-Signature")
+):
+    if not config.STRIPE_WEBHOOK_SECRET:
+        raise HTTPException(status_code=503, detail="Stripe webhooks not configured")
+
+    payload = await request.body()
+    try:
+        event = stripe.Webhook.construct_event(
+            payload, stripe_signature, config.STRIPE_WEBHOOK_SECRET
+        )
+    except (ValueError, stripe.error.SignatureVerificationError):
+        raise HTTPException(status_code=400, detail="Invalid webhook signature")
+
+    await handle_webhook_event(event)
+    return {"received": True}
@@ -0,0 +1,412 @@
+import heapq
+import logging
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+from uuid import UUID
+
+from sqlmodel import Session, func, select
+
+from app.db.engine import engine
+from app.models.booking import Booking
+from app.models.provider import Provider
+from app.models.service import AutocompleteSuggestion, Service
+from app.services.periodic import PeriodicJob
+from app.services.shared_cache import broadcast_invalidation, register_namespace
+from app.services.subcategories import TAXONOMY, subcategory_id
+
+logger = logging.getLogger(__name__)
+
+# Popularity (bookings) is only recounted by the periodic rebuild; writes in
+# between update labels immediately but keep the entry's last known count.
+AUTOCOMPLETE_REBUILD_INTERVAL = 10 * 60
+
+# Invalidation bus namespace other workers' writes arrive on, keyed
+# "service:<id>" / "provider:<id>"
+AUTOCOMPLETE_NAMESPACE = "autocomplete"
+
+MAX_SUGGESTIONS = 20
+# Prefixes matching more keys than this have their top suggestions kept
+# ready; anything narrower is ranked on the fly, which stays well under 1ms.
+RANKED_PREFIX_MATCHES = 64
+# Ready rankings hold this many, so removing a top suggestion rarely means
+# re-ranking the whole prefix.
+RANKED_CAPACITY = 2 * MAX_SUGGESTIONS
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+class _Entry(NamedTuple):
+    label: str
+    kind: str
+    id: UUID
+    popularity: int
+
+
+def normalize(text: str) -> str:
+    return _NON_WORD.sub(" ", text.casefold()).strip()
+
+
+def _index_keys(label: str) -> list[str]:
+    # one key per word, so "deep" and "clean" both find "Deep Cleaning"
+    words = normalize(label).split()
+    return [" ".join(words[start:]) for start in range(len(words))]
+
+
+def _rank(entry: _Entry) -> tuple[int, int]:
+    # most booked first; shorter (more exact) labels break ties
+    return entry.popularity, -len(entry.label)
+
+
+class AutocompleteIndex:
+    """
+    Sorted array of normalized keys searched by binary search.
+
+    Every word of a label starts a key, so a prefix matches any word in it.
+    Prefixes matching many keys keep their ranked top suggestions, updated on
+    add/remove; other lookups rank the (small) bisected range directly. Not
+    thread-safe on its own; see Autocomplete.
+    """
+
+    def __init__(self, entries: Iterable[_Entry] = ()) -> None:
+        self._entries = {(entry.kind, entry.id): entry for entry in entries}
+        # sorted once up front; add() keeps it sorted after that
+        pairs = sorted(
+            (
+                (key, ref)
+                for ref, entry in self._entries.items()
+                for key in _index_keys(entry.label)
+            ),
+            key=itemgetter(0),
+        )
+        self._keys: list[str] = [key for key, _ in pairs]
+        self._refs: list[tuple[str, UUID]] = [ref for _, ref in pairs]
+        self._top: dict[str, list[_Entry]] = {}
+        # prefixes whose ranking doesn't hold every entry they match
+        self._truncated: set[str] = set()
+        self._rank_broad_prefixes()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _range(self, prefix: str, lo: int = 0, hi: Optional[int] = None):
+        hi = len(self._keys) if hi is None else hi
+        start = bisect_left(self._keys, prefix, lo, hi)
+        return start, bisect_left(self._keys, prefix + "\uffff", start, hi)
+
+    def _ranked(self, start: int, end: int, limit: int) -> list[_Entry]:
+        matches = {self._entries[ref] for ref in self._refs[start:end]}
+        return heapq.nlargest(limit, matches, key=_rank)
+
+    def _rank_broad_prefixes(
+        self, prefix: str = "", start: int = 0, end: Optional[int] = None
+    ) -> Optional[list[_Entry]]:
+        """
+        Walk the implicit trie over the sorted keys, ranking every prefix that
+        matches more than RANKED_PREFIX_MATCHES keys. Works bottom-up: a
+        prefix's top suggestions are among its children's, so keys are only
+        ranked again at the narrowest broad prefix containing them.
+        """
+        end = len(self._keys) if end is None else end
+        if end - start <= RANKED_PREFIX_MATCHES:
+            return None
+
+        depth = len(prefix) + 1
+        position = start
+        while position < end and len(self._keys[position]) < depth:
+            position += 1
+        candidates = {self._entries[ref] for ref in self._refs[start:position]}
+        while position < end:
+            child = self._keys[position][:depth]
+            child_end = self._range(child, position, end)[1]
+            child_top = self._rank_broad_prefixes(child, position, child_end)
+            if child_top is None:
+                child_top = (
+                    self._entries[ref] for ref in self._refs[position:child_end]
+                )
+            candidates.update(child_top)
+            position = child_end
+
+        top = heapq.nlargest(RANKED_CAPACITY, candidates, key=_rank)
+        if prefix:
+            self._top[prefix] = top
+            if len(candidates) > RANKED_CAPACITY:
+                self._truncated.add(prefix)
+        return top
+
+    def _broad_prefixes(self, label: str) -> Iterator[str]:
+        for key in _index_keys(label):
+            for depth in range(1, len(key) + 1):
+                if key[:depth] not in self._top:
+                    # a narrower prefix can't match more keys
+                    break
+                yield key[:depth]
+
+    def add(self, entry: _Entry) -> None:
+        ref = (entry.kind, entry.id)
+        self.remove(ref)
+        self._entries[ref] = entry
+        for key in _index_keys(entry.label):
+            position = bisect_right(self._keys, key)
+            self._keys.insert(position, key)
+            self._refs.insert(position, ref)
+
+        for prefix in self._broad_prefixes(entry.label):
+            top = self._top[prefix]
+            if entry in top:
+                continue
+            # a truncated ranking stays the same length: whatever falls off
+            # the end might not be next in line
+            size = len(top) if prefix in self._truncated else RANKED_CAPACITY
+            top.append(entry)
+            top.sort(key=_rank, reverse=True)
+            if len(top) > size:
+                del top[size:]
+                self._truncated.add(prefix)
+
+    def remove(self, ref: tuple[str, UUID]) -> Optional[_Entry]:
+        entry = self._entries.pop(ref, None)
+        if entry is None:
+            return None
+        for key in _index_keys(entry.label):
+            position = bisect_left(self._keys, key)
+            while self._refs[position] != ref:
+                position += 1
+            del self._keys[position]
+            del self._refs[position]
+
+        for prefix in self._broad_prefixes(entry.label):
+            top = self._top[prefix]
+            if entry not in top:
+                continue
+            top.remove(entry)
+            # the rest are still the best of what's left, until there are too
+            # few of them to answer a full lookup
+            if len(top) < MAX_SUGGESTIONS and prefix in self._truncated:
+                start, end = self._range(prefix)
+                self._top[prefix] = self._ranked(start, end, RANKED_CAPACITY)
+                if len(set(self._refs[start:end])) <= RANKED_CAPACITY:
+                    self._truncated.discard(prefix)
+        return entry
+
+    def popularity(self, ref: tuple[str, UUID]) -> int:
+        entry = self._entries.get(ref)
+        return entry.popularity if entry else 0
+
+    def search(self, prefix: str, limit: int) -> list[_Entry]:
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        top = self._top.get(prefix)
+        if top is not None:
+            return top[:limit]
+        return self._ranked(*self._range(prefix), limit)
+
+
+def build_autocomplete_index(session: Session) -> AutocompleteIndex:
+    """
+    Index service titles, provider company names and the subcategory taxonomy.
+
+    Popularity is the number of bookings: of the service, of the provider, and
+    of services tagged with the subcategory.
+    """
+    entries: list[_Entry] = []
+
+    service_bookings = (
+        select(Booking.service_id, func.count(Booking.id).label("bookings"))
+        .group_by(Booking.service_id)
+        .subquery()
+    )
+    services = session.exec(
+        select(
+            Service.id,
+            Service.service_title,
+            Service.services_subcategories,
+            func.coalesce(service_bookings.c.bookings, 0).label("bookings"),
+        ).outerjoin(service_bookings, service_bookings.c.service_id == Service.id)
+    ).all()
+
+    subcategory_bookings: dict[str, int] = {}
+    for service in services:
+        entries.append(
+            _Entry(service.service_title, "service", service.id, service.bookings)
+        )
+        for name in service.services_subcategories or []:
+            subcategory_bookings[name] = (
+                subcategory_bookings.get(name, 0) + service.bookings
+            )
+
+    provider_bookings = (
+        select(Booking.provider_id, func.count(Booking.id).label("bookings"))
+        .group_by(Booking.provider_id)
+        .subquery()
+    )
+    providers = session.exec(
+        select(
+            Provider.id,
+            Provider.company_name,
+            func.coalesce(provider_bookings.c.bookings, 0).label("bookings"),
+        )
+        .outerjoin(provider_bookings, provider_bookings.c.provider_id == Provider.id)
+        .where(Provider.company_name.is_not(None))
+    ).all()
+    for provider in providers:
+        entries.append(
+            _Entry(provider.company_name, "provider", provider.id, provider.bookings)
+        )
+
+    # the same name can appear under several categories; suggest it once
+    seen: set[str] = set()
+    for category, names in TAXONOMY.items():
+        for name in names:
+            if name in seen:
+                continue
+            seen.add(name)
+            entries.append(
+                _Entry(
+                    name,
+                    "subcategory",
+                    subcategory_id(category, name),
+                    subcategory_bookings.get(name, 0),
+                )
+            )
+
+    return AutocompleteIndex(entries)
+
+
+class Autocomplete:
+    """
+    The live index, updated in place on writes and swapped on rebuilds.
+
+    Writes made while a rebuild is reading the database are replayed onto the
+    new index before it's swapped in, so none are lost. Each write is also
+    broadcast, and every other worker reloads the changed entries from the
+    database (see sync), so no worker's index waits for the next rebuild.
+    """
+
+    def __init__(self) -> None:
+        self._index = AutocompleteIndex()
+        self._lock = threading.Lock()
+        self._replay: Optional[list[Callable[[AutocompleteIndex], object]]] = None
+
+    def search(self, prefix: str, limit: int) -> list[AutocompleteSuggestion]:
+        with self._lock:
+            entries = self._index.search(prefix, limit)
+        return [
+            AutocompleteSuggestion(label=entry.label, kind=entry.kind, id=entry.id)
+            for entry in entries
+        ]
+
+    def rebuild(self, session: Session) -> int:
+        with self._lock:
+            self._replay = []
+        try:
+            index = build_autocomplete_index(session)
+        except BaseException:
+            with self._lock:
+                self._replay = None
+            raise
+
+        with self._lock:
+            for change in self._replay:
+                change(index)
+            self._index, self._replay = index, None
+        return len(index)
+
+    def _apply(self, change: Callable[[AutocompleteIndex], object]) -> None:
+        with self._lock:
+            change(self._index)
+            if self._replay is not None:
+                self._replay.append(change)
+
+    def _set_label(self, kind: str, entry_id: UUID, label: Optional[str]) -> None:
+        """Index `label` for the entry, or drop the entry if it has none."""
+
+        def change(index: AutocompleteIndex) -> None:
+            ref = (kind, entry_id)
+            if label:
+                index.add(_Entry(label, *ref, index.popularity(ref)))
+            else:
+                index.remove(ref)
+
+        self._apply(change)
+
+    def _write(self, kind: str, entry_id: UUID, label: Optional[str]) -> None:
+        self._set_label(kind, entry_id, label)
+        broadcast_invalidation(AUTOCOMPLETE_NAMESPACE, [f"{kind}:{entry_id}"])
+
+    def upsert_service(self, service: Service) -> None:
+        self._write("service", service.id, service.service_title)
+
+    def remove_service(self, service_id: UUID) -> None:
+        self._write("service", service_id, None)
+
+    def upsert_provider(self, provider: Provider) -> None:
+        self._write("provider", provider.id, provider.company_name)
+
+    def remove_provider(self, provider_id: UUID) -> None:
+        self._write("provider", provider_id, None)
+
+    def sync(self, session: Session, keys: Iterable[str]) -> None:
+        """
+        Catch up with another worker's writes to the given "kind:id" entries:
+        index their current labels, or drop the ones that no longer exist.
+        """
+        ids: dict[str, set[UUID]] = {"service": set(), "provider": set()}
+        for key in keys:
+            kind, _, entry_id = key.partition(":")
+            if kind in ids:
+                ids[kind].add(UUID(entry_id))
+
+        labels: dict[tuple[str, UUID], str] = {}
+        if ids["service"]:
+            for entry_id, title in session.exec(
+                select(Service.id, Service.service_title).where(
+                    Service.id.in_(ids["service"])
+                )
+            ):
+                labels["service", entry_id] = title
+        if ids["provider"]:
+            for entry_id, company_name in session.exec(
+                select(Provider.id, Provider.company_name).where(
+                    Provider.id.in_(ids["provider"])
+                )
+            ):
+                labels["provider", entry_id] = company_name
+
+        for kind, kind_ids in ids.items():
+            for entry_id in kind_ids:
+                self._set_label(kind, entry_id, labels.get((kind, entry_id)))
+
+
+autocomplete = Autocomplete()
+
+
+def _rebuild_job() -> None:
+    with Session(engine) as session:
+        size = autocomplete.rebuild(session)
+    logger.debug("Rebuilt the autocomplete index (%s entries)", size)
+
+
+autocomplete_rebuilder = PeriodicJob(
+    "autocomplete index rebuild", AUTOCOMPLETE_REBUILD_INTERVAL, _rebuild_job
+)
+
+
+# one at a time, off the event loop the notifications arrive on
+_syncer = ThreadPoolExecutor(1, thread_name_prefix="autocomplete-sync")
+
+
+def _sync_job(keys: list[str]) -> None:
+    try:
+        with Session(engine) as session:
+            autocomplete.sync(session, keys)
+    except Exception:
+        # the next rebuild catches this worker up
+        logger.exception("Failed to apply another worker's autocomplete changes")
+
+
+register_namespace(AUTOCOMPLETE_NAMESPACE, lambda keys: _syncer.submit(_sync_job, keys))
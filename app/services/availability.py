@@ -0,0 +1,305 @@
+import bisect
+import heapq
+import math
+from datetime import date, datetime, time, timedelta, timezone
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import union_all
+from sqlmodel import Session, func, select
+
+from app.models.availability import CategorySlot
+from app.models.booking import Booking
+from app.models.booking_series import BookingSeries
+from app.models.enums import StatusEnum
+from app.models.provider import Provider
+from app.models.service import Service
+from app.models.slot_hold import SlotHold
+from app.services.recurrence import expand_series, series_query
+from app.utils.timezones import BUSINESS_TZ, as_utc
+
+# Providers work in local (Pacific) business hours; slots are offered on a
+# half-hour grid inside those hours.
+OPENING_TIME = time(8, 0)
+CLOSING_TIME = time(18, 0)
+SLOT_STEP = timedelta(minutes=30)
+
+# Minimum notice before a slot can be offered, and how far back a booking can
+# start and still overlap the window (bounds the index scan on start_time).
+BOOKING_NOTICE = timedelta(hours=2)
+MAX_BOOKING_LENGTH = timedelta(hours=24)
+MAX_WINDOW = timedelta(days=31)
+DEFAULT_WINDOW = timedelta(days=7)
+DEFAULT_SLOT_MINUTES = 60
+
+Interval = tuple[datetime, datetime]
+
+
+def _ceil_to_step(value: datetime, step: timedelta = SLOT_STEP) -> datetime:
+    seconds = step.total_seconds()
+    epoch = math.ceil(value.timestamp() / seconds) * seconds
+    return datetime.fromtimestamp(epoch, tz=timezone.utc)
+
+
+def _business_day(day: date) -> Interval:
+    opening = datetime.combine(day, OPENING_TIME, tzinfo=BUSINESS_TZ)
+    closing = datetime.combine(day, CLOSING_TIME, tzinfo=BUSINESS_TZ)
+    return as_utc(opening), as_utc(closing)
+
+
+class BusySchedule:
+    """
+    A provider's busy time as sorted, non-overlapping intervals.
+
+    Intervals are merged once on construction, so overlap checks are a binary
+    search and free-slot generation is a single forward walk.
+    """
+
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        self.starts: list[datetime] = []
+        self.ends: list[datetime] = []
+        for start, end in sorted((as_utc(s), as_utc(e)) for s, e in intervals):
+            if self.ends and start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        """Return True if [start, end) intersects any busy interval."""
+        start, end = as_utc(start), as_utc(end)
+        i = bisect.bisect_right(self.ends, start)
+        return i < len(self.starts) and self.starts[i] < end
+
+    def free_slots(
+        self,
+        window_start: datetime,
+        window_end: datetime,
+        duration: timedelta,
+        step: timedelta = SLOT_STEP,
+    ) -> Iterator[Interval]:
+        """
+        Lazily yield open slots of `duration` inside business hours, in order.
+
+        Args:
+            window_start: Earliest slot start (inclusive)
+            window_end: Latest slot end (inclusive)
+            duration: Length of the job being booked
+            step: Grid that slot start times are aligned to
+
+        Yields:
+            (start, end) tuples in UTC
+        """
+        window_start, window_end = as_utc(window_start), as_utc(window_end)
+        day = window_start.astimezone(BUSINESS_TZ).date()
+        last_day = window_end.astimezone(BUSINESS_TZ).date()
+        i = bisect.bisect_right(self.ends, window_start)
+
+        while day <= last_day:
+            opening, closing = _business_day(day)
+            closing = min(closing, window_end)
+            candidate = _ceil_to_step(max(opening, window_start), step)
+
+            while candidate + duration <= closing:
+                # skip busy intervals that end before this candidate
+                while i < len(self.ends) and self.ends[i] <= candidate:
+                    i += 1
+                if i < len(self.starts) and self.starts[i] < candidate + duration:
+                    candidate = _ceil_to_step(self.ends[i], step)
+                    continue
+                yield candidate, candidate + duration
+                candidate += step
+
+            day += timedelta(days=1)
+
+
+def get_busy_schedules(
+    session: Session,
+    provider_ids: Iterable[UUID],
+    window_start: datetime,
+    window_end: datetime,
+    exclude_hold_id: Optional[UUID] = None,
+    exclude_occurrence: Optional[tuple[UUID, datetime]] = None,
+    exclude_booking_id: Optional[UUID] = None,
+) -> dict[UUID, BusySchedule]:
+    """
+    Load busy intervals for many providers.
+
+    A booking occupies [start_time, start_time + service.duration); cancelled
+    bookings free their slot, and so does `exclude_booking_id` (a booking
+    being rescheduled). Unexpired checkout holds are busy too, except
+    `exclude_hold_id` (the caller's own hold), and so are recurring booking
+    occurrences, except `exclude_occurrence` (series_id, occurrence_start).
+    Providers without bookings get an empty schedule.
+    """
+    provider_ids = list(provider_ids)
+    window_start, window_end = as_utc(window_start), as_utc(window_end)
+    if not provider_ids:
+        return {}
+
+    booking_end = Booking.start_time + func.make_interval(
+        0, 0, 0, 0, 0, Service.duration
+    )
+    bookings = (
+        select(
+            Booking.provider_id,
+            Booking.start_time.label("start_time"),
+            booking_end.label("end_time"),
+        )
+        .join(Service, Service.id == Booking.service_id)
+        .where(
+            Booking.provider_id.in_(provider_ids),
+            Booking.status != StatusEnum.cancelled,
+            Booking.id != exclude_booking_id,
+            Booking.start_time >= window_start - MAX_BOOKING_LENGTH,
+            Booking.start_time < window_end,
+            booking_end > window_start,
+        )
+    )
+    holds = select(SlotHold.provider_id, SlotHold.start_time, SlotHold.end_time).where(
+        SlotHold.provider_id.in_(provider_ids),
+        SlotHold.expires_at > func.now(),
+        SlotHold.id != exclude_hold_id,
+        SlotHold.start_time < window_end,
+        SlotHold.end_time > window_start,
+    )
+    rows = session.exec(union_all(bookings, holds)).all()
+
+    intervals: dict[UUID, list[Interval]] = {pid: [] for pid in provider_ids}
+    for row in rows:
+        intervals[row.provider_id].append((row.start_time, row.end_time))
+
+    occurrences = expand_series(
+        session,
+        series_query(BookingSeries.provider_id).where(
+            BookingSeries.provider_id.in_(provider_ids)
+        ),
+        window_start,
+        window_end,
+        exclude=exclude_occurrence,
+    )
+    for series, occurrence in occurrences:
+        intervals[series.provider_id].append(
+            (occurrence.start_time, occurrence.end_time)
+        )
+
+    return {pid: BusySchedule(busy) for pid, busy in intervals.items()}
+
+
+def earliest_bookable_time(now: Optional[datetime] = None) -> datetime:
+    return as_utc(now or datetime.now(timezone.utc)) + BOOKING_NOTICE
+
+
+def resolve_window(
+    window_start: Optional[datetime], window_end: Optional[datetime]
+) -> Interval:
+    """
+    Clamp a requested search window to bookable time and validate it.
+
+    Slots are never offered in the past or inside the notice period. A missing
+    end defaults to DEFAULT_WINDOW after the start.
+    """
+    earliest = earliest_bookable_time()
+    window_start = max(as_utc(window_start), earliest) if window_start else earliest
+    window_end = as_utc(window_end) if window_end else window_start + DEFAULT_WINDOW
+
+    if window_end <= window_start:
+        raise HTTPException(status_code=400, detail="'to' must be after 'from'")
+    if window_end - window_start > MAX_WINDOW:
+        raise HTTPException(
+            status_code=400, detail=f"window cannot exceed {MAX_WINDOW.days} days"
+        )
+
+    return window_start, window_end
+
+
+def next_free_slot(
+    schedule: BusySchedule,
+    duration_minutes: int,
+    window_start: datetime,
+    window_end: datetime,
+) -> Optional[datetime]:
+    """Return the start of the first open slot in the window, or None."""
+    slots = schedule.free_slots(
+        window_start, window_end, timedelta(minutes=duration_minutes)
+    )
+    first = next(slots, None)
+    return first[0] if first else None
+
+
+def earliest_slots_in_category(
+    session: Session,
+    category: str,
+    window_start: datetime,
+    window_end: datetime,
+    limit: int,
+    per_service: int = 1,
+) -> list[CategorySlot]:
+    """
+    Find the `limit` earliest open slots across every service in a category.
+
+    Services and bookings are each loaded with a single query. Every service
+    contributes a lazy, time-ordered stream of its free slots, and the streams
+    are merged with a heap, so only as many slots as needed are generated.
+
+    Args:
+        session: Database session
+        category: Service.category enum NAME (e.g. "HOUSE_CLEANING")
+        window_start: Earliest slot start
+        window_end: Latest slot end
+        limit: Number of slots to return
+        per_service: Max slots from any one service, so one provider's open
+            afternoon doesn't crowd out everyone else
+    """
+    services = session.exec(
+        select(
+            Service.id,
+            Service.service_title,
+            Service.pricing,
+            Service.duration,
+            Service.provider_id,
+            Provider.company_name,
+            Provider.first_name,
+            Provider.last_name,
+        )
+        .join(Provider, Provider.id == Service.provider_id)
+        .where(Service.category == category)
+    ).all()
+
+    schedules = get_busy_schedules(
+        session,
+        {service.provider_id for service in services},
+        window_start,
+        window_end,
+    )
+
+    def service_slots(service) -> Iterator[tuple[datetime, datetime, object]]:
+        slots = schedules[service.provider_id].free_slots(
+            window_start, window_end, timedelta(minutes=service.duration)
+        )
+        for start, end in islice(slots, per_service):
+            yield start, end, service
+
+    merged = heapq.merge(
+        *(service_slots(service) for service in services), key=lambda slot: slot[0]
+    )
+
+    return [
+        CategorySlot(
+            provider_id=service.provider_id,
+            provider_name=service.company_name
+            or f"{service.first_name} {service.last_name}".strip(),
+            service_id=service.id,
+            service_title=service.service_title,
+            pricing=service.pricing,
+            duration=service.duration,
+            start_time=start,
+            end_time=end,
+        )
+        for start, end, service in islice(merged, limit)
+    ]
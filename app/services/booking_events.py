@@ -0,0 +1,256 @@
+import asyncio
+import json
+import logging
+from typing import Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import ARRAY, Text, cast, column, literal, update, values
+from sqlmodel import Session, func, or_, select
+
+from app.db.engine import REALTIME_DATABASE_URL
+from app.models.booking import Booking, BookingStatusChange, BookingStatusResult
+from app.models.enums import StatusEnum
+from app.models.status_update import StatusUpdate
+from app.services.dashboard import invalidate_customer_dashboard
+from app.services.realtime import NotificationListener, hub
+
+logger = logging.getLogger(__name__)
+
+# Postgres NOTIFY channel carrying booking status changes between workers
+BOOKING_STATUS_CHANNEL = "booking_status"
+
+# Appends to the feed hold this transaction-scoped advisory lock until they
+# commit. seq values are taken at insert, not commit, so without it an event
+# could become visible after a later one a reader has already moved past.
+FEED_LOCK_KEY = "status_updates_feed"
+
+# Long-polls re-check the database at least this often, so events committed
+# by other worker processes are seen even without a local wake-up.
+FEED_POLL_INTERVAL = 2.0
+MAX_FEED_WAIT = 30
+
+
+class FeedNotifier:
+    """Wakes long-polling feed readers when a status change is committed."""
+
+    def __init__(self):
+        self._event = asyncio.Event()
+
+    def notify(self) -> None:
+        self._event.set()
+        self._event = asyncio.Event()
+
+    async def wait(self, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+feed_notifier = FeedNotifier()
+
+
+def record_status_changes(session: Session, bookings: Sequence) -> None:
+    """
+    Append each booking's current status to the feed and push it to clients.
+
+    `bookings` are Booking objects or rows with id, status, customer_id and
+    provider_id. Only adds the rows and queues the NOTIFYs; both take effect
+    with the caller's commit, together with the booking changes themselves.
+    Appends are serialized until that commit, so events become visible in
+    seq order.
+    """
+    if not bookings:
+        return
+
+    session.exec(
+        select(func.pg_advisory_xact_lock(func.hashtextextended(FEED_LOCK_KEY, 0)))
+    ).one()
+    session.add_all(
+        StatusUpdate(
+            booking_id=booking.id,
+            status=booking.status,
+            customer_id=booking.customer_id,
+            provider_id=booking.provider_id,
+        )
+        for booking in bookings
+    )
+
+    payloads = [
+        json.dumps(
+            {
+                "type": "booking_status",
+                "booking_id": str(booking.id),
+                "status": booking.status,
+                "customer_id": str(booking.customer_id),
+                "provider_id": str(booking.provider_id),
+            }
+        )
+        for booking in bookings
+    ]
+    # one statement however many bookings changed
+    payload = func.unnest(literal(payloads, ARRAY(Text))).column_valued("payload")
+    session.exec(select(func.pg_notify(BOOKING_STATUS_CHANNEL, payload)))
+
+
+def record_status_change(session: Session, booking: Booking) -> None:
+    record_status_changes(session, [booking])
+
+
+def dispatch_status_event(payload: str) -> None:
+    """Deliver a committed status change from NOTIFY to this worker's clients."""
+    try:
+        event = json.loads(payload)
+    except ValueError:
+        logger.warning("Ignoring malformed booking status payload: %r", payload)
+        return
+
+    hub.publish((event["customer_id"], event["provider_id"]), event)
+    feed_notifier.notify()
+
+
+status_listener = NotificationListener(
+    REALTIME_DATABASE_URL, BOOKING_STATUS_CHANNEL, dispatch_status_event
+)
+
+
+def set_booking_status(
+    session: Session, booking: Booking, status: StatusEnum
+) -> Booking:
+    """Change a booking's status and record the transition in one commit."""
+    booking.status = status
+    session.add(booking)
+    record_status_change(session, booking)
+    session.commit()
+    session.refresh(booking)
+
+    feed_notifier.notify()
+    invalidate_customer_dashboard(booking.customer_id)
+    return booking
+
+
+def set_booking_statuses(
+    session: Session, provider_id: UUID, changes: Sequence[BookingStatusChange]
+) -> list[BookingStatusResult]:
+    """
+    Apply many status changes to a provider's bookings in one transaction.
+
+    Ownership is checked for every booking in one query and all accepted
+    changes are written with a single UPDATE ... FROM (VALUES ...). Bookings
+    that don't exist, belong to another provider, or appear twice in the
+    request are skipped and reported; the rest still go through.
+
+    Returns one result per requested change, in request order.
+    """
+    requested_ids = [change.booking_id for change in changes]
+    owners = dict(
+        session.exec(
+            select(Booking.id, Booking.provider_id).where(Booking.id.in_(requested_ids))
+        ).all()
+    )
+
+    errors: dict[int, str] = {}
+    accepted: dict[UUID, StatusEnum] = {}
+    for index, change in enumerate(changes):
+        if change.booking_id in accepted:
+            errors[index] = "Duplicate booking_id in request"
+        elif change.booking_id not in owners:
+            errors[index] = "Booking not found"
+        elif owners[change.booking_id] != provider_id:
+            errors[index] = "Booking does not belong to this Provider"
+        else:
+            accepted[change.booking_id] = change.status
+
+    updated: dict[UUID, StatusEnum] = {}
+    if accepted:
+        new_statuses = values(
+            column("id", Booking.id.type),
+            column("status", Booking.status.type),
+            name="new_statuses",
+        ).data(list(accepted.items()))
+        # provider_id is re-checked in case a booking moved since the read
+        rows = session.exec(
+            update(Booking)
+            .where(
+                Booking.id == new_statuses.c.id,
+                Booking.provider_id == provider_id,
+            )
+            .values(status=cast(new_statuses.c.status, Booking.status.type))
+            .returning(
+                Booking.id, Booking.status, Booking.customer_id, Booking.provider_id
+            )
+        ).all()
+
+        record_status_changes(session, rows)
+        session.commit()
+
+        updated = {row.id: row.status for row in rows}
+        feed_notifier.notify()
+        for customer_id in {row.customer_id for row in rows}:
+            invalidate_customer_dashboard(customer_id)
+
+    results = []
+    for index, change in enumerate(changes):
+        error = errors.get(index)
+        if error is None and change.booking_id not in updated:
+            error = "Booking not found"
+        results.append(
+            BookingStatusResult(
+                booking_id=change.booking_id,
+                status=change.status,
+                updated=error is None,
+                error=error,
+            )
+        )
+    return results
+
+
+def read_feed(
+    session: Session,
+    customer_id: Optional[UUID],
+    provider_id: Optional[UUID],
+    since: int,
+    limit: int,
+) -> list[StatusUpdate]:
+    """Return events after `since` for a customer's and/or provider's bookings."""
+    owners = []
+    if customer_id:
+        owners.append(StatusUpdate.customer_id == customer_id)
+    if provider_id:
+        owners.append(StatusUpdate.provider_id == provider_id)
+    if not owners:
+        return []
+
+    return session.exec(
+        select(StatusUpdate)
+        .where(or_(*owners), StatusUpdate.seq > since)
+        .order_by(StatusUpdate.seq)
+        .limit(limit)
+    ).all()
+
+
+async def wait_for_feed(
+    session: Session,
+    customer_id: Optional[UUID],
+    provider_id: Optional[UUID],
+    since: int,
+    limit: int,
+    wait: float,
+) -> list[StatusUpdate]:
+    """
+    Long-poll version of read_feed.
+
+    Returns as soon as there are new events, or an empty list after `wait`
+    seconds. The session's connection goes back to the pool while waiting.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+
+    while True:
+        events = read_feed(session, customer_id, provider_id, since, limit)
+        remaining = deadline - loop.time()
+        if events or remaining <= 0:
+            return events
+
+        session.close()
+        await feed_notifier.wait(min(remaining, FEED_POLL_INTERVAL))
@@ -0,0 +1,159 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, delete
+
+from app.models.booking_series import (
+    BookingSeries,
+    BookingSeriesCreate,
+    BookingSeriesException,
+    SeriesOccurrence,
+)
+from app.models.service import Service
+from app.services.availability import earliest_bookable_time, get_busy_schedules
+from app.services.dashboard import invalidate_customer_dashboard
+from app.services.recurrence import is_occurrence, occurrence_id, occurrence_starts
+from app.services.slot_holds import claim_slot, ensure_slot_free, lock_provider_schedule
+from app.utils.timezones import BUSINESS_TZ, as_utc
+
+# How far ahead a new series is checked against the provider's schedule;
+# clashes further out are resolved by skipping or moving that occurrence.
+SERIES_CONFLICT_HORIZON = timedelta(weeks=12)
+
+
+def create_series(
+    session: Session,
+    data: BookingSeriesCreate,
+    customer_id: UUID,
+    service: Service,
+) -> BookingSeries:
+    """
+    Create a recurring booking after checking its upcoming occurrences are free.
+
+    The first occurrence consumes the checkout hold like a one-off booking
+    does; the rest are checked up to SERIES_CONFLICT_HORIZON ahead, all under
+    the provider's schedule lock.
+    """
+    start = as_utc(data.start_time)
+    until = as_utc(data.until) if data.until else None
+    if until and until < start:
+        raise HTTPException(
+            status_code=400, detail="'until' must not be before 'start_time'"
+        )
+
+    claim_slot(
+        session, service.provider_id, start, service.duration, data.stripe_payment_id
+    )
+
+    length = timedelta(minutes=service.duration)
+    horizon_end = start + SERIES_CONFLICT_HORIZON
+    schedule = get_busy_schedules(session, [service.provider_id], start, horizon_end)[
+        service.provider_id
+    ]
+    for occurrence in occurrence_starts(
+        start, data.frequency, until, start, horizon_end
+    ):
+        if schedule.overlaps(occurrence, occurrence + length):
+            local = occurrence.astimezone(BUSINESS_TZ)
+            raise HTTPException(
+                status_code=409,
+                detail=f"Time slot on {local:%Y-%m-%d %H:%M} is already booked",
+            )
+
+    series = BookingSeries(
+        customer_id=customer_id,
+        provider_id=service.provider_id,
+        service_id=service.id,
+        address_id=data.address_id,
+        frequency=data.frequency,
+        special_instructions=data.special_instructions,
+        first_start=start,
+        until=until,
+    )
+    session.add(series)
+    session.commit()
+    session.refresh(series)
+
+    invalidate_customer_dashboard(customer_id)
+    return series
+
+
+def set_occurrence_exception(
+    session: Session,
+    series: BookingSeries,
+    occurrence_start: datetime,
+    new_start: Optional[datetime],
+) -> Optional[SeriesOccurrence]:
+    """
+    Skip one occurrence (new_start=None) or move it to new_start.
+
+    Returns the moved occurrence, or None for a skip. Re-skipping or moving an
+    already moved occurrence replaces its exception.
+    """
+    original = as_utc(occurrence_start)
+    if not is_occurrence(series, original):
+        raise HTTPException(
+            status_code=400, detail="Not an occurrence of this booking series"
+        )
+
+    moved = None
+    if new_start is not None:
+        new_start = as_utc(new_start)
+        if new_start < earliest_bookable_time():
+            raise HTTPException(status_code=400, detail="Time slot is too soon to book")
+
+        length = timedelta(minutes=session.get(Service, series.service_id).duration)
+        lock_provider_schedule(session, series.provider_id)
+        ensure_slot_free(
+            session,
+            series.provider_id,
+            new_start,
+            new_start + length,
+            own_occurrence=(series.id, original),
+        )
+        moved = SeriesOccurrence(
+            id=occurrence_id(series.id, original),
+            series_id=series.id,
+            occurrence_start=original,
+            start_time=new_start,
+            end_time=new_start + length,
+        )
+
+    session.exec(
+        insert(BookingSeriesException)
+        .values(
+            id=uuid4(),
+            series_id=series.id,
+            occurrence_start=original,
+            new_start=new_start,
+        )
+        .on_conflict_do_update(
+            constraint="uq_booking_series_exceptions_series_id_occurrence_start",
+            set_={"new_start": new_start},
+        )
+    )
+    session.commit()
+
+    invalidate_customer_dashboard(series.customer_id)
+    return moved
+
+
+def end_series(session: Session, series: BookingSeries) -> BookingSeries:
+    """Stop a series from now on; past occurrences stay on record."""
+    now = datetime.now(timezone.utc)
+    series.until = now
+    session.add(series)
+    session.exec(
+        delete(BookingSeriesException).where(
+            BookingSeriesException.series_id == series.id,
+            BookingSeriesException.occurrence_start > now,
+        )
+    )
+    session.commit()
+    session.refresh(series)
+
+    invalidate_customer_dashboard(series.customer_id)
+    return series
@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta
+from typing import Optional, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlmodel import Session, func, select
+
+from app.models.address import Address
+from app.models.booking import Booking, CalendarEntry
+from app.models.booking_series import BookingSeries
+from app.models.customer import Customer
+from app.models.enums import StatusEnum
+from app.models.service import Service
+from app.services.availability import MAX_BOOKING_LENGTH
+from app.services.recurrence import expand_series, series_query
+from app.utils.timezones import BUSINESS_TZ, as_naive_utc, as_utc
+
+CALENDAR_DEFAULT_WINDOW = timedelta(days=7)
+CALENDAR_MAX_WINDOW = timedelta(days=62)
+
+
+def resolve_calendar_window(
+    window_start: Optional[datetime], window_end: Optional[datetime]
+) -> tuple[datetime, datetime]:
+    """
+    Default a calendar window to the week starting today (business time).
+
+    Unlike availability windows, calendar windows may reach into the past.
+    """
+    if window_start:
+        window_start = as_utc(window_start)
+    else:
+        today = datetime.now(BUSINESS_TZ).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        window_start = as_utc(today)
+    window_end = (
+        as_utc(window_end) if window_end else window_start + CALENDAR_DEFAULT_WINDOW
+    )
+
+    if window_end <= window_start:
+        raise HTTPException(status_code=400, detail="'to' must be after 'from'")
+    if window_end - window_start > CALENDAR_MAX_WINDOW:
+        raise HTTPException(
+            status_code=400,
+            detail=f"window cannot exceed {CALENDAR_MAX_WINDOW.days} days",
+        )
+
+    return window_start, window_end
+
+
+def get_provider_calendar(
+    session: Session,
+    provider_id: UUID,
+    window_start: datetime,
+    window_end: datetime,
+    statuses: Optional[Sequence[StatusEnum]] = None,
+) -> list[CalendarEntry]:
+    """
+    Return a provider's bookings that overlap [window_start, window_end),
+    including occurrences of recurring bookings.
+
+    Only the columns the calendar renders are selected, and the start_time
+    range keeps the scan on the (provider_id, start_time) index.
+    """
+    booking_end = Booking.start_time + func.make_interval(
+        0, 0, 0, 0, 0, Service.duration
+    )
+    query = (
+        select(
+            Booking.id,
+            Booking.start_time,
+            booking_end.label("end_time"),
+            Booking.status,
+            Service.duration,
+            Service.service_title,
+            Customer.first_name,
+            Customer.last_name,
+            Address.street_address_1,
+            Address.city,
+        )
+        .join(Service, Service.id == Booking.service_id)
+        .join(Customer, Customer.id == Booking.customer_id)
+        .join(Address, Address.id == Booking.address_id)
+        .where(
+            Booking.provider_id == provider_id,
+            Booking.start_time >= window_start - MAX_BOOKING_LENGTH,
+            Booking.start_time < window_end,
+            booking_end > window_start,
+        )
+        .order_by(Booking.start_time)
+    )
+    if statuses:
+        query = query.where(Booking.status.in_(statuses))
+
+    entries = [
+        CalendarEntry(
+            booking_id=row.id,
+            start_time=row.start_time,
+            end_time=row.end_time,
+            duration=row.duration,
+            status=row.status,
+            service_title=row.service_title,
+            customer_first_name=row.first_name,
+            customer_last_name=row.last_name,
+            street_address_1=row.street_address_1,
+            city=row.city,
+        )
+        for row in session.exec(query).all()
+    ]
+
+    # recurring bookings are expanded for the window; their occurrences
+    # count as confirmed
+    if statuses and StatusEnum.confirmed not in statuses:
+        return entries
+
+    occurrences = expand_series(
+        session,
+        series_query(
+            Service.service_title,
+            Customer.first_name,
+            Customer.last_name,
+            Address.street_address_1,
+            Address.city,
+        )
+        .join(Customer, Customer.id == BookingSeries.customer_id)
+        .join(Address, Address.id == BookingSeries.address_id)
+        .where(BookingSeries.provider_id == provider_id),
+        window_start,
+        window_end,
+    )
+    entries.extend(
+        CalendarEntry(
+            booking_id=occurrence.id,
+            start_time=as_naive_utc(occurrence.start_time),
+            end_time=as_naive_utc(occurrence.end_time),
+            duration=series.duration,
+            status=StatusEnum.confirmed,
+            service_title=series.service_title,
+            customer_first_name=series.first_name,
+            customer_last_name=series.last_name,
+            street_address_1=series.street_address_1,
+            city=series.city,
+            series_id=occurrence.series_id,
+        )
+        for series, occurrence in occurrences
+    )
+    entries.sort(key=lambda entry: entry.start_time)
+    return entries
@@ -0,0 +1,88 @@
+import logging
+from typing import Optional
+
+from sqlmodel import Session, select
+
+from app.db.engine import REALTIME_DATABASE_URL, engine
+from app.models.coupon import Coupon, CouponList
+from app.services.periodic import PeriodicJob
+from app.services.realtime import NotificationListener
+from app.utils.bloom_filter import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+# Postgres NOTIFY channel the coupons table trigger fires on
+# (migrations/0012_coupon_change_trigger.sql)
+COUPON_CHANGES_CHANNEL = "coupon_changes"
+
+# Refreshed on every NOTIFY, and at least this often in case one was missed
+COUPON_REFRESH_INTERVAL = 5 * 60
+
+# share of unknown codes that get past the Bloom filter to the dict lookup
+BLOOM_ERROR_RATE = 0.01
+
+
+class CouponSnapshot:
+    """
+    Every coupon as of one refresh, never modified after it's built.
+
+    Lookups check the Bloom filter first, so a made-up code is turned away
+    after a few bit tests.
+    """
+
+    def __init__(self, coupons: list[Coupon]):
+        self._by_code = {
+            coupon.coupon_code: CouponList.model_validate(coupon) for coupon in coupons
+        }
+        self._bloom = BloomFilter.from_items(self._by_code, BLOOM_ERROR_RATE)
+        self.coupons = sorted(self._by_code.values(), key=lambda c: c.coupon_code)
+
+    def __len__(self) -> int:
+        return len(self._by_code)
+
+    def lookup(self, code: str) -> Optional[CouponList]:
+        if code not in self._bloom:
+            return None
+        return self._by_code.get(code)
+
+
+def load_coupon_snapshot(session: Session) -> CouponSnapshot:
+    return CouponSnapshot(session.exec(select(Coupon)).all())
+
+
+class CouponIndex:
+    """The current snapshot, swapped whole on refresh so readers need no lock."""
+
+    def __init__(self):
+        self._snapshot: Optional[CouponSnapshot] = None
+
+    def refresh(self, session: Session) -> CouponSnapshot:
+        self._snapshot = load_coupon_snapshot(session)
+        return self._snapshot
+
+    def snapshot(self, session: Session) -> CouponSnapshot:
+        # requests that beat the startup refresh load it themselves
+        return self._snapshot or self.refresh(session)
+
+    def lookup(self, session: Session, code: str) -> Optional[CouponList]:
+        return self.snapshot(session).lookup(code)
+
+
+coupon_index = CouponIndex()
+
+
+def _refresh_job() -> None:
+    with Session(engine) as session:
+        snapshot = coupon_index.refresh(session)
+    logger.debug("Refreshed the coupon snapshot (%s coupons)", len(snapshot))
+
+
+coupon_refresher = PeriodicJob(
+    "coupon snapshot refresh", COUPON_REFRESH_INTERVAL, _refresh_job
+)
+
+coupon_listener = NotificationListener(
+    REALTIME_DATABASE_URL,
+    COUPON_CHANGES_CHANNEL,
+    lambda payload: coupon_refresher.run_soon(),
+)
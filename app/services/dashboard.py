@@ -0,0 +1,169 @@
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from sqlmodel import Session, and_, case, func, or_, select
+
+from app.models.booking import Booking
+from app.models.booking_series import BookingSeries
+from app.models.customer import CurrentBookings, CustomersBookings
+from app.models.enums import StatusEnum
+from app.models.provider import Provider
+from app.models.service import Service
+from app.services.recurrence import expand_series, series_query
+from app.services.shared_cache import SharedCache
+from app.utils.timezones import as_naive_utc
+
+UPCOMING = "upcoming"
+NEEDS_REVIEW = "needs_review"
+
+# Statuses that show up on the dashboard; cancelled and completed never do
+UPCOMING_STATUSES = [StatusEnum.confirmed, StatusEnum.en_route, StatusEnum.in_progress]
+DASHBOARD_STATUSES = [*UPCOMING_STATUSES, StatusEnum.review_needed]
+
+# How far ahead recurring bookings are expanded for the dashboard
+SERIES_HORIZON = timedelta(weeks=8)
+
+# customer_id -> {(upcoming_limit, review_limit): CustomersBookings}
+dashboard_cache = SharedCache("customer_dashboard", ttl=60, maxsize=10_000)
+
+
+def invalidate_customer_dashboard(customer_id: UUID) -> None:
+    """Drop a customer's cached dashboard; call after any write to their bookings."""
+    dashboard_cache.delete(customer_id)
+
+
+def _query_dashboard(
+    session: Session, customer_id: UUID, upcoming_limit: int, review_limit: int
+) -> CustomersBookings:
+    bucket = case(
+        (Booking.status == StatusEnum.review_needed, NEEDS_REVIEW), else_=UPCOMING
+    )
+    # upcoming: soonest first; needs review: most recent first
+    start_epoch = func.extract("epoch", Booking.start_time)
+    sort_key = case(
+        (Booking.status == StatusEnum.review_needed, -start_epoch), else_=start_epoch
+    )
+
+    ranked = (
+        select(
+            Booking.id.label("booking_id"),
+            Booking.start_time,
+            Booking.status,
+            Booking.provider_id,
+            Booking.service_id,
+            bucket.label("bucket"),
+            func.row_number()
+            .over(partition_by=bucket, order_by=sort_key)
+            .label("position"),
+            func.count().over(partition_by=bucket).label("bucket_total"),
+        )
+        .where(
+            Booking.customer_id == customer_id,
+            Booking.status.in_(DASHBOARD_STATUSES),
+        )
+        .subquery()
+    )
+
+    rows = session.exec(
+        select(
+            ranked.c.booking_id,
+            ranked.c.start_time,
+            ranked.c.status,
+            ranked.c.provider_id,
+            ranked.c.bucket,
+            ranked.c.bucket_total,
+            Provider.first_name,
+            Provider.last_name,
+            Provider.company_name,
+            Service.service_title,
+        )
+        .join(Provider, Provider.id == ranked.c.provider_id)
+        .join(Service, Service.id == ranked.c.service_id)
+        .where(
+            or_(
+                and_(ranked.c.bucket == UPCOMING, ranked.c.position <= upcoming_limit),
+                and_(
+                    ranked.c.bucket == NEEDS_REVIEW, ranked.c.position <= review_limit
+                ),
+            )
+        )
+        .order_by(ranked.c.bucket, ranked.c.position)
+    ).all()
+
+    buckets: dict[str, list[CurrentBookings]] = {UPCOMING: [], NEEDS_REVIEW: []}
+    totals: dict[str, int] = {UPCOMING: 0, NEEDS_REVIEW: 0}
+    for row in rows:
+        totals[row.bucket] = row.bucket_total
+        buckets[row.bucket].append(
+            CurrentBookings(
+                provider_first_name=row.first_name,
+                provider_last_name=row.last_name,
+                provider_company_name=row.company_name,
+                status=row.status,
+                start_time=row.start_time,
+                service_title=row.service_title,
+                booking_id=row.booking_id,
+                provider_id=row.provider_id,
+            )
+        )
+
+    # recurring bookings contribute their occurrences over the next few weeks
+    now = datetime.now(timezone.utc)
+    occurrences = expand_series(
+        session,
+        series_query(
+            BookingSeries.provider_id,
+            Provider.first_name,
+            Provider.last_name,
+            Provider.company_name,
+            Service.service_title,
+        )
+        .join(Provider, Provider.id == BookingSeries.provider_id)
+        .where(BookingSeries.customer_id == customer_id),
+        now,
+        now + SERIES_HORIZON,
+    )
+    if occurrences:
+        upcoming = buckets[UPCOMING] + [
+            CurrentBookings(
+                provider_first_name=series.first_name,
+                provider_last_name=series.last_name,
+                provider_company_name=series.company_name,
+                status=StatusEnum.confirmed,
+                start_time=as_naive_utc(occurrence.start_time),
+                service_title=series.service_title,
+                booking_id=occurrence.id,
+                provider_id=series.provider_id,
+                series_id=occurrence.series_id,
+            )
+            for series, occurrence in occurrences
+        ]
+        upcoming.sort(key=lambda booking: booking.start_time)
+        buckets[UPCOMING] = upcoming[:upcoming_limit]
+        totals[UPCOMING] += len(occurrences)
+
+    return CustomersBookings(
+        upcoming_bookings=buckets[UPCOMING],
+        completed_needs_review=buckets[NEEDS_REVIEW],
+        upcoming_total=totals[UPCOMING],
+        needs_review_total=totals[NEEDS_REVIEW],
+    )
+
+
+def get_customer_dashboard(
+    session: Session, customer_id: UUID, upcoming_limit: int, review_limit: int
+) -> CustomersBookings:
+    """
+    Return a customer's upcoming and needs-review bookings.
+
+    Bucketing, ordering and per-bucket limits all happen in one SQL query; the
+    result is cached per customer until their bookings change.
+    """
+    limits = (upcoming_limit, review_limit)
+    cached = dashboard_cache.get(customer_id) or {}
+    if limits in cached:
+        return cached[limits]
+
+    dashboard = _query_dashboard(session, customer_id, upcoming_limit, review_limit)
+    dashboard_cache.set(customer_id, {**cached, limits: dashboard})
+    return dashboard
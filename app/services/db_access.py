@@ -1,10 +1,10 @@
 from typing import List, cast
 from uuid import UUID
 
-from sqlmodel import Session
+from sqlmodel import Session, select
 
 from app.models import Review, Service
-from app.utils.crud_helpers import get_all, get_all_by_field
+from app.utils.crud_helpers import get_all_by_field
 
 
 def get_all_reviews_by_provider(session: Session, provider_id: UUID) -> List[Review]:
@@ -13,5 +13,8 @@ def get_all_reviews_by_provider(session: Session, provider_id: UUID) -> List[Rev
     )
 
 
+# Best-ranked first; Bumi's candidate list relies on this order too
 def get_all_services(session: Session = List[Service]):
-    return get_all(session, Service)
+    return session.exec(
+        select(Service).order_by(Service.ranking_score.desc(), Service.id)
+    ).all()
@@ -0,0 +1,154 @@
+import logging
+from typing import Iterable, Optional
+from uuid import UUID
+
+from pydantic import TypeAdapter
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, func, select
+
+from app.db.engine import engine
+from app.models.provider import Provider, ProviderResponseDetail
+from app.models.service import Service
+from app.services.periodic import PeriodicJob
+from app.services.provider_stats import get_provider_stats
+from app.services.shared_cache import broadcast_invalidation, register_local_cache
+from app.utils.cache import StaleWhileRevalidateCache
+from app.utils.validate_categories import SLUG_TO_ENUM_NAME
+
+logger = logging.getLogger(__name__)
+
+# Listings are rebuilt in the background at least this often, and right after
+# any write that changes them; readers never wait for a rebuild.
+LISTING_TTL = 5 * 60
+
+_provider_listing_json = TypeAdapter(list[ProviderResponseDetail])
+_service_listing_json = TypeAdapter(list[Service])
+
+
+def build_category_providers(
+    session: Session, category: str
+) -> list[ProviderResponseDetail]:
+    """
+    Providers offering a service in `category` (an enum NAME), with ratings,
+    ordered by their best-ranked service in it.
+    """
+    # Join providers->services and filter by the Service.category enum NAME.
+    # Grouping ensures a provider with many matching services appears once.
+    providers = session.exec(
+        select(Provider)
+        .join(Service, Service.provider_id == Provider.id)
+        .options(selectinload(Provider.services))
+        .where(Service.category == category)
+        .group_by(Provider.id)
+        .order_by(func.max(Service.ranking_score).desc(), Provider.id)
+    ).all()
+
+    stats_map = get_provider_stats(session, [provider.id for provider in providers])
+
+    response: list[ProviderResponseDetail] = []
+    for provider in providers:
+        stats = stats_map.get(provider.id)
+        response.append(
+            ProviderResponseDetail(
+                id=provider.id,
+                first_name=provider.first_name,
+                last_name=provider.last_name,
+                company_name=provider.company_name,
+                phone_number=provider.phone_number,
+                services=provider.services,
+                reviews=[],
+                review_count=stats.review_count if stats else 0,
+                average_rating=stats.average_rating if stats else None,
+            )
+        )
+    return response
+
+
+def build_category_services(session: Session, category: str) -> list[Service]:
+    return session.exec(
+        select(Service)
+        .where(Service.category == category)
+        .order_by(Service.ranking_score.desc(), Service.id)
+    ).all()
+
+
+def _load_provider_listing(category: str) -> bytes:
+    with Session(engine) as session:
+        providers = build_category_providers(session, category)
+        return _provider_listing_json.dump_json(providers)
+
+
+def _load_service_listing(category: str) -> bytes:
+    with Session(engine) as session:
+        services = build_category_services(session, category)
+        return _service_listing_json.dump_json(services)
+
+
+# category enum NAME -> response body (JSON bytes). Every worker builds its
+# own; invalidations are broadcast so they all rebuild.
+provider_listing_cache = StaleWhileRevalidateCache(_load_provider_listing, LISTING_TTL)
+service_listing_cache = StaleWhileRevalidateCache(_load_service_listing, LISTING_TTL)
+register_local_cache("provider_listings", provider_listing_cache)
+register_local_cache("service_listings", service_listing_cache)
+
+
+def get_provider_categories(session: Session, provider_id: UUID) -> set[Optional[str]]:
+    return set(
+        session.exec(
+            select(Service.category)
+            .where(Service.provider_id == provider_id)
+            .distinct()
+        ).all()
+    )
+
+
+def invalidate_category_listings(
+    categories: Iterable[Optional[str]], services: bool = True
+) -> None:
+    """
+    Mark the cached listings for these categories stale, in every worker.
+
+    Pass services=False for writes that only change what the provider listing
+    shows (provider details, ratings).
+    """
+    categories = [category for category in categories if category is not None]
+    for category in categories:
+        provider_listing_cache.invalidate(category)
+        if services:
+            service_listing_cache.invalidate(category)
+
+    if categories:
+        broadcast_invalidation("provider_listings", categories)
+        if services:
+            broadcast_invalidation("service_listings", categories)
+
+
+def invalidate_provider_listings(session: Session, provider_id: UUID) -> None:
+    """Mark stale every provider listing this provider appears in."""
+    invalidate_category_listings(
+        get_provider_categories(session, provider_id), services=False
+    )
+
+
+def invalidate_service_listings(
+    session: Session, provider_id: UUID, category: Optional[str]
+) -> None:
+    """
+    Mark stale what a service write changes: its category's service listing,
+    and every provider listing its provider appears in, since those embed all
+    of the provider's services. Call after the write is committed.
+    """
+    invalidate_category_listings([category])
+    invalidate_provider_listings(session, provider_id)
+
+
+def warm_category_listings() -> None:
+    """Rebuild every category's listings; keeps entries from ever going cold."""
+    for category in SLUG_TO_ENUM_NAME.values():
+        provider_listing_cache.refresh(category)
+        service_listing_cache.refresh(category)
+
+
+listing_warmer = PeriodicJob(
+    "category listing refresh", LISTING_TTL, warm_category_listings
+)
@@ -0,0 +1,173 @@
+import math
+from typing import Optional
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, func, or_, select
+
+from app.models.address import Address
+from app.models.provider import Provider
+from app.models.provider_stats import ProviderStats
+from app.models.service import Service
+from app.models.service_area import (
+    AREA_BOX,
+    NearbyProvider,
+    ProviderServiceArea,
+    ServiceAreaUpdate,
+)
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LATITUDE = 111.32
+BOX_COLUMNS = ("min_latitude", "max_latitude", "min_longitude", "max_longitude")
+
+
+def haversine_km(
+    latitude: float, longitude: float, latitudes: np.ndarray, longitudes: np.ndarray
+) -> np.ndarray:
+    """Great-circle distances from one point to arrays of points, in km."""
+    lat1, lon1 = np.radians(latitude), np.radians(longitude)
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def bounding_box(
+    latitude: float, longitude: float, radius_km: float
+) -> tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lon, max_lon) enclosing a radius around a point."""
+    delta_latitude = radius_km / KM_PER_DEGREE_LATITUDE
+    # longitude degrees shrink towards the poles; cap so the box stays finite
+    cos_latitude = max(math.cos(math.radians(latitude)), 0.01)
+    delta_longitude = min(radius_km / (KM_PER_DEGREE_LATITUDE * cos_latitude), 180)
+    return (
+        max(latitude - delta_latitude, -90),
+        min(latitude + delta_latitude, 90),
+        max(longitude - delta_longitude, -180),
+        min(longitude + delta_longitude, 180),
+    )
+
+
+def set_service_area(
+    session: Session, provider_id: UUID, area: ServiceAreaUpdate
+) -> ProviderServiceArea:
+    """Create or replace a provider's service area."""
+    values = area.model_dump()
+    values["zips"] = sorted({code.strip() for code in area.zips or []}) or None
+
+    box = (None, None, None, None)
+    if area.radius_km is not None:
+        box = bounding_box(area.center_latitude, area.center_longitude, area.radius_km)
+    values.update(zip(BOX_COLUMNS, box))
+
+    statement = insert(ProviderServiceArea).values(provider_id=provider_id, **values)
+    session.exec(
+        statement.on_conflict_do_update(
+            index_elements=[ProviderServiceArea.provider_id],
+            set_={**values, "updated_at": func.now()},
+        )
+    )
+    session.commit()
+    return session.exec(
+        select(ProviderServiceArea).where(
+            ProviderServiceArea.provider_id == provider_id
+        )
+    ).one()
+
+
+def find_nearby_providers(
+    session: Session,
+    address: Address,
+    category: Optional[str] = None,
+    limit: int = 20,
+) -> list[NearbyProvider]:
+    """
+    Providers whose service area covers an address, nearest first.
+
+    The GiST box index and the zips GIN index narrow the search to providers
+    whose area could include the address; exact haversine distances are then
+    computed for just those candidates in one vectorized pass.
+
+    Args:
+        address: Must have been geocoded (latitude/longitude set)
+        category: DB enum NAME, as returned by validate_category
+    """
+    zip_code = (address.zip or "").strip()
+    point = func.point(address.longitude, address.latitude)
+    conditions = [AREA_BOX.op("@>")(point)]
+    if zip_code:
+        conditions.append(ProviderServiceArea.zips.contains([zip_code]))
+
+    query = (
+        select(
+            Provider.id,
+            Provider.first_name,
+            Provider.last_name,
+            Provider.company_name,
+            ProviderServiceArea.center_latitude,
+            ProviderServiceArea.center_longitude,
+            ProviderServiceArea.radius_km,
+            ProviderServiceArea.zips,
+            ProviderStats.review_count,
+            ProviderStats.rating_sum,
+        )
+        .join(Provider, Provider.id == ProviderServiceArea.provider_id)
+        .outerjoin(ProviderStats, ProviderStats.provider_id == Provider.id)
+        .where(or_(*conditions))
+    )
+    if category:
+        query = query.where(
+            ProviderServiceArea.provider_id.in_(
+                select(Service.provider_id).where(Service.category == category)
+            )
+        )
+    candidates = session.exec(query).all()
+    if not candidates:
+        return []
+
+    # NaN for zip-only areas, which have no center
+    centers = np.array(
+        [
+            (
+                row.center_latitude if row.radius_km is not None else np.nan,
+                row.center_longitude if row.radius_km is not None else np.nan,
+                row.radius_km if row.radius_km is not None else np.nan,
+            )
+            for row in candidates
+        ],
+        dtype=float,
+    )
+    distances = haversine_km(
+        address.latitude, address.longitude, centers[:, 0], centers[:, 1]
+    )
+    in_zip = np.array([zip_code in (row.zips or ()) for row in candidates])
+    # the box is only an approximation of the circle; the radius decides
+    covered = (distances <= centers[:, 2]) | in_zip
+
+    # nearest first, zip-only matches (NaN distance) last
+    order = np.argsort(np.where(np.isnan(distances), np.inf, distances), kind="stable")
+    nearby: list[NearbyProvider] = []
+    for index in order:
+        if not covered[index]:
+            continue
+        row = candidates[index]
+        distance = distances[index]
+        nearby.append(
+            NearbyProvider(
+                id=row.id,
+                first_name=row.first_name,
+                last_name=row.last_name,
+                company_name=row.company_name,
+                distance_km=None if np.isnan(distance) else round(float(distance), 2),
+                review_count=row.review_count or 0,
+                average_rating=(
+                    row.rating_sum / row.review_count if row.review_count else None
+                ),
+            )
+        )
+        if len(nearby) == limit:
+            break
+    return nearby
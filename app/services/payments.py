@@ -0,0 +1,101 @@
+import logging
+from functools import lru_cache
+from typing import Optional
+
+import stripe
+from fastapi import HTTPException
+
+from app import config
+from app.services.shared_cache import SharedCache
+
+logger = logging.getLogger(__name__)
+
+# Stripe calls can take seconds; keep them off the event loop and reuse
+# connections through one shared async HTTP client.
+STRIPE_HTTP_TIMEOUT = 20
+
+# Statuses that never change again, so a cached value is safe to trust
+# without asking Stripe.
+FINAL_STATUSES = {"succeeded", "canceled"}
+
+# PaymentIntent id -> status, learned from creates, retrieves and webhooks
+intent_status_cache = SharedCache("stripe_intent_status", ttl=60 * 60, maxsize=10_000)
+
+
+@lru_cache(maxsize=1)
+def get_stripe_client() -> stripe.StripeClient:
+    if not config.STRIPE_SECRET_KEY:
+        raise RuntimeError("Missing required env variable: STRIPE_SECRET_KEY")
+
+    return stripe.StripeClient(
+        config.STRIPE_SECRET_KEY,
+        http_client=stripe.HTTPXClient(timeout=STRIPE_HTTP_TIMEOUT),
+    )
+
+
+async def remember_intent_status(intent_id: str, status: Optional[str]) -> None:
+    if intent_id and status:
+        await intent_status_cache.aset(intent_id, status)
+
+
+async def create_payment_intent(amount: int, metadata: dict) -> stripe.PaymentIntent:
+    payment_intent = await get_stripe_client().payment_intents.create_async(
+        params={"amount": amount, "currency": "usd", "metadata": metadata}
+    )
+    await remember_intent_status(payment_intent.id, payment_intent.status)
+    return payment_intent
+
+
+async def get_payment_intent_status(intent_id: str) -> str:
+    """
+    Return a PaymentIntent's status, skipping Stripe when it's already known.
+
+    Only final statuses are served from the cache; anything still in flight is
+    re-fetched since it may have moved on since we last saw it.
+    """
+    cached = await intent_status_cache.aget(intent_id)
+    if cached in FINAL_STATUSES:
+        return cached
+
+    payment_intent = await get_stripe_client().payment_intents.retrieve_async(intent_id)
+    await remember_intent_status(payment_intent.id, payment_intent.status)
+    return payment_intent.status
+
+
+async def handle_webhook_event(event: stripe.Event) -> None:
+    """Record PaymentIntent status changes pushed by Stripe."""
+    if not event.type.startswith("payment_intent."):
+        return
+
+    payment_intent = event.data.object
+    await remember_intent_status(payment_intent.get("id"), payment_intent.get("status"))
+    logger.info(
+        "Stripe webhook %s: %s -> %s",
+        event.type,
+        payment_intent.get("id"),
+        payment_intent.get("status"),
+    )
+
+
+async def require_succeeded_payment(intent_id: Optional[str]) -> None:
+    """Raise unless the PaymentIntent exists and has succeeded."""
+    # verify request came through
+    if not intent_id:
+        raise HTTPException(status_code=400, detail="Missing payment intent ID")
+
+    # validate existence on network (served from cache once Stripe has
+    # told us the payment succeeded)
+    try:
+        payment_status = await get_payment_intent_status(intent_id)
+    except stripe.error.InvalidRequestError:
+        raise HTTPException(status_code=400, detail="Invalid payment intent id")
+    except stripe.error.StripeError:
+        raise HTTPException(status_code=502, detail="Stripe service error")
+
+    # confirm payment status success
+    # https://docs.stripe.com/api/payment_intents/object#payment_intent_object-status
+    if payment_status != "succeeded":
+        raise HTTPException(
+            status_code=400,
+            detail=f"Payment not confirmed. Status: {payment_status}",
+        )
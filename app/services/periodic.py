@@ -0,0 +1,53 @@
+import asyncio
+import logging
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """
+    Run a blocking job in a worker thread every `interval` seconds.
+
+    The first run happens at startup. A failing run is logged and retried on
+    the next tick rather than stopping the job. run_soon() starts the next run
+    early, e.g. when a NOTIFY says the data changed.
+    """
+
+    def __init__(self, name: str, interval: float, job: Callable[[], object]):
+        self.name = name
+        self.interval = interval
+        self.job = job
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    def run_soon(self) -> None:
+        """Skip the rest of the wait; repeated calls before the run make one run."""
+        if self._wake:
+            self._wake.set()
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            # cleared before running, so a change made mid-run gets another run
+            self._wake.clear()
+            try:
+                await asyncio.to_thread(self.job)
+            except Exception:
+                logger.exception("Periodic job %r failed", self.name)
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
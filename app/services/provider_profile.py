@@ -0,0 +1,69 @@
+from typing import Iterable
+from uuid import UUID
+
+from pydantic import TypeAdapter
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
+
+from app.models.provider import Provider, ProviderResponseDetail
+from app.models.provider_stats import ProviderStats
+from app.models.reviews import Review
+from app.services.reviews import get_provider_reviews_page
+from app.services.shared_cache import SharedCache
+
+# Reviews embedded in the profile; the rest are paged from /{id}/reviews
+RECENT_REVIEWS = 3
+
+# provider_id -> profile response body (JSON bytes). Writes invalidate
+# entries in every worker; the TTL is a backstop for a missed invalidation.
+profile_cache = SharedCache("provider_profile", ttl=10 * 60, maxsize=5_000)
+_profile_json = TypeAdapter(ProviderResponseDetail)
+
+
+def build_provider_profile(
+    session: Session, provider_id: UUID
+) -> ProviderResponseDetail:
+    # also 404s for an unknown provider
+    reviews = get_provider_reviews_page(session, provider_id, RECENT_REVIEWS).reviews
+
+    provider, stats = session.exec(
+        select(Provider, ProviderStats)
+        .outerjoin(ProviderStats, ProviderStats.provider_id == Provider.id)
+        .options(selectinload(Provider.services))
+        .where(Provider.id == provider_id)
+    ).one()
+
+    return ProviderResponseDetail(
+        id=provider.id,
+        first_name=provider.first_name,
+        last_name=provider.last_name,
+        company_name=provider.company_name,
+        phone_number=provider.phone_number,
+        services=provider.services,
+        reviews=reviews,
+        review_count=stats.review_count if stats else 0,
+        average_rating=stats.average_rating if stats else None,
+    )
+
+
+def get_provider_profile(session: Session, provider_id: UUID) -> bytes:
+    """The provider's public profile as JSON, from the snapshot cache."""
+    profile = profile_cache.get(provider_id)
+    if profile is None:
+        profile = _profile_json.dump_json(build_provider_profile(session, provider_id))
+        profile_cache.set(provider_id, profile)
+    return profile
+
+
+def invalidate_provider_profile(provider_id: UUID) -> None:
+    """Drop a provider's snapshot; call after writes to them, their services
+    or their reviews."""
+    profile_cache.delete(provider_id)
+
+
+def invalidate_reviewed_profiles(session: Session, customer_id: UUID) -> None:
+    """Drop the snapshots showing this customer's name on a recent review."""
+    provider_ids: Iterable[UUID] = session.exec(
+        select(Review.provider_id).where(Review.customer_id == customer_id).distinct()
+    ).all()
+    profile_cache.delete(*provider_ids)
@@ -0,0 +1,126 @@
+import logging
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, func, select, tuple_
+
+from app.db.engine import engine
+from app.models.provider import Provider
+from app.models.provider_stats import STAR_RATINGS, ProviderStats
+from app.models.reviews import Review
+from app.services.periodic import PeriodicJob
+
+logger = logging.getLogger(__name__)
+
+# How often provider_stats is recomputed from the reviews table, catching any
+# review written outside routers/review.py. Also runs once at startup.
+STATS_RECONCILE_INTERVAL = 60 * 60
+
+AGGREGATE_COLUMNS = ["review_count", "rating_sum"] + [
+    f"rating_{stars}" for stars in STAR_RATINGS
+]
+
+
+def apply_review_change(
+    session: Session,
+    provider_id: UUID,
+    old_rating: Optional[int],
+    new_rating: Optional[int],
+) -> None:
+    """
+    Adjust a provider's stats for one review being added, re-rated or removed.
+
+    Pass old_rating=None for a new review and new_rating=None for a deleted
+    one. Doesn't commit: call it in the same transaction as the review write
+    so the two can't drift apart.
+    """
+    if old_rating == new_rating:
+        return
+
+    delta = {
+        "review_count": (new_rating is not None) - (old_rating is not None),
+        "rating_sum": (new_rating or 0) - (old_rating or 0),
+    }
+    for stars in STAR_RATINGS:
+        delta[f"rating_{stars}"] = (new_rating == stars) - (old_rating == stars)
+
+    # one atomic upsert; concurrent reviews of a provider queue on its row
+    statement = insert(ProviderStats).values(provider_id=provider_id, **delta)
+    session.exec(
+        statement.on_conflict_do_update(
+            index_elements=[ProviderStats.provider_id],
+            set_={
+                **{
+                    column: getattr(ProviderStats, column) + statement.excluded[column]
+                    for column in delta
+                },
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+def get_provider_stats(
+    session: Session, provider_ids: Iterable[UUID]
+) -> dict[UUID, ProviderStats]:
+    """Stats rows by provider id; providers without reviews may be missing."""
+    provider_ids = list(provider_ids)
+    if not provider_ids:
+        return {}
+    rows = session.exec(
+        select(ProviderStats).where(ProviderStats.provider_id.in_(provider_ids))
+    ).all()
+    return {row.provider_id: row for row in rows}
+
+
+def reconcile_provider_stats(session: Session) -> int:
+    """
+    Recompute every provider's stats from the reviews table.
+
+    Only rows that were actually off are written. Returns how many that was;
+    anything above zero after the first run means a review write bypassed
+    apply_review_change.
+    """
+    aggregates = (
+        select(
+            Provider.id,
+            func.count(Review.id),
+            func.coalesce(func.sum(Review.rating), 0),
+            *(
+                func.count(Review.id).filter(Review.rating == stars)
+                for stars in STAR_RATINGS
+            ),
+        )
+        .outerjoin(Review, Review.provider_id == Provider.id)
+        .group_by(Provider.id)
+    )
+    statement = insert(ProviderStats).from_select(
+        ["provider_id", *AGGREGATE_COLUMNS], aggregates
+    )
+    current = [getattr(ProviderStats, column) for column in AGGREGATE_COLUMNS]
+    expected = [statement.excluded[column] for column in AGGREGATE_COLUMNS]
+    corrected = session.exec(
+        statement.on_conflict_do_update(
+            index_elements=[ProviderStats.provider_id],
+            set_={
+                **{column: statement.excluded[column] for column in AGGREGATE_COLUMNS},
+                "updated_at": func.now(),
+            },
+            where=tuple_(*current).is_distinct_from(tuple_(*expected)),
+        ).returning(ProviderStats.provider_id)
+    ).all()
+    session.commit()
+    return len(corrected)
+
+
+def _reconcile_job() -> None:
+    with Session(engine) as session:
+        corrected = reconcile_provider_stats(session)
+    if corrected:
+        logger.info("Reconciled review stats for %s providers", corrected)
+
+
+stats_reconciler = PeriodicJob(
+    "provider stats reconciliation", STATS_RECONCILE_INTERVAL, _reconcile_job
+)
@@ -0,0 +1,197 @@
+import logging
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from sqlalchemy import Float, Uuid, column, update, values
+from sqlmodel import Session, func, select
+
+from app.db.engine import engine
+from app.models.booking import Booking
+from app.models.enums import StatusEnum
+from app.models.provider_stats import ProviderStats
+from app.models.service import Service
+from app.services.listings import invalidate_category_listings
+from app.services.periodic import PeriodicJob
+
+logger = logging.getLogger(__name__)
+
+# How often every service's ranking_score is recomputed. Also runs at startup.
+RANKING_INTERVAL = 15 * 60
+
+# bookings made this recently count towards demand
+RECENT_BOOKINGS_WINDOW = timedelta(days=30)
+# a provider's cancellation rate looks at bookings made this recently
+CANCELLATION_WINDOW = timedelta(days=90)
+
+# Ratings are shrunk towards PRIOR_RATING as if each provider had
+# PRIOR_REVIEWS extra reviews, so one 5-star review doesn't top the catalog.
+PRIOR_RATING = 4.0
+PRIOR_REVIEWS = 5
+# Cancellation rates get the same treatment, starting from zero.
+PRIOR_BOOKINGS = 10
+
+# Each signal is scaled to 0..1 before weighting; the score is out of 100.
+WEIGHTS = {
+    "rating": 0.35,
+    "reviews": 0.15,
+    "demand": 0.25,
+    "reliability": 0.15,
+    "price": 0.10,
+}
+
+# Scores closer than this to the stored one aren't rewritten
+SCORE_TOLERANCE = 0.01
+# rows per UPDATE ... FROM (VALUES ...) statement
+UPDATE_BATCH_SIZE = 5000
+
+
+def _log_scale(counts: np.ndarray) -> np.ndarray:
+    # diminishing returns: the 100th review matters less than the 5th
+    top = counts.max(initial=0)
+    if top <= 0:
+        return np.zeros(len(counts))
+    return np.log1p(counts) / np.log1p(top)
+
+
+def price_percentiles(pricing: np.ndarray, categories: np.ndarray) -> np.ndarray:
+    """
+    Each price's position within its category, 0 (cheapest) to 1 (priciest).
+
+    `categories` are integer codes. Equal prices share a position; a service
+    alone in its category is placed in the middle.
+    """
+    count = len(pricing)
+    order = np.lexsort((pricing, categories))
+    sorted_categories, sorted_pricing = categories[order], pricing[order]
+    positions = np.arange(count)
+
+    new_category = np.ones(count, dtype=bool)
+    new_category[1:] = sorted_categories[1:] != sorted_categories[:-1]
+    new_price = new_category.copy()
+    new_price[1:] |= sorted_pricing[1:] != sorted_pricing[:-1]
+
+    category_start = np.maximum.accumulate(np.where(new_category, positions, 0))
+    price_start = np.maximum.accumulate(np.where(new_price, positions, 0))
+    category_size = np.bincount(categories)[sorted_categories]
+
+    percentiles = np.full(count, 0.5)
+    spread = category_size > 1
+    percentiles[order[spread]] = (price_start - category_start)[spread] / (
+        category_size[spread] - 1
+    )
+    return percentiles
+
+
+def compute_ranking_scores(
+    review_count: np.ndarray,
+    rating_sum: np.ndarray,
+    recent_bookings: np.ndarray,
+    provider_bookings: np.ndarray,
+    provider_cancellations: np.ndarray,
+    pricing: np.ndarray,
+    categories: np.ndarray,
+) -> np.ndarray:
+    """
+    Ranking score (0-100) for every service at once.
+
+    Combines the provider's smoothed average rating and review count, the
+    service's recent bookings, the provider's smoothed cancellation rate and
+    how the price compares within the category. All arguments are aligned
+    per-service arrays; provider figures are repeated for each of their
+    services.
+    """
+    rating = (rating_sum + PRIOR_RATING * PRIOR_REVIEWS) / (
+        review_count + PRIOR_REVIEWS
+    )
+    cancellation_rate = provider_cancellations / (provider_bookings + PRIOR_BOOKINGS)
+
+    signals = {
+        "rating": (rating - 1) / 4,
+        "reviews": _log_scale(review_count),
+        "demand": _log_scale(recent_bookings),
+        "reliability": 1 - cancellation_rate,
+        "price": 1 - price_percentiles(pricing, categories),
+    }
+    score = sum(weight * signals[name] for name, weight in WEIGHTS.items())
+    return np.round(100 * score, 2)
+
+
+def rank_services(session: Session) -> int:
+    """
+    Recompute every service's ranking_score and store the ones that changed.
+
+    Loads the inputs in one query, scores the whole catalog with NumPy and
+    writes changes back in batched UPDATE ... FROM (VALUES ...) statements.
+    Marks the listings of every category whose order may have changed stale.
+    Returns how many services were updated.
+    """
+    now = datetime.now(timezone.utc)
+    recent = (
+        select(Booking.service_id, func.count(Booking.id).label("bookings"))
+        .where(Booking.created_at >= now - RECENT_BOOKINGS_WINDOW)
+        .group_by(Booking.service_id)
+        .subquery()
+    )
+    reliability = (
+        select(
+            Booking.provider_id,
+            func.count(Booking.id).label("bookings"),
+            func.count(Booking.id)
+            .filter(Booking.status == StatusEnum.cancelled)
+            .label("cancellations"),
+        )
+        .where(Booking.created_at >= now - CANCELLATION_WINDOW)
+        .group_by(Booking.provider_id)
+        .subquery()
+    )
+    rows = session.exec(
+        select(
+            Service.id,
+            Service.category,
+            Service.pricing,
+            Service.ranking_score,
+            func.coalesce(ProviderStats.review_count, 0),
+            func.coalesce(ProviderStats.rating_sum, 0),
+            func.coalesce(recent.c.bookings, 0),
+            func.coalesce(reliability.c.bookings, 0),
+            func.coalesce(reliability.c.cancellations, 0),
+        )
+        .outerjoin(ProviderStats, ProviderStats.provider_id == Service.provider_id)
+        .outerjoin(recent, recent.c.service_id == Service.id)
+        .outerjoin(reliability, reliability.c.provider_id == Service.provider_id)
+    ).all()
+    if not rows:
+        return 0
+
+    ids, categories, *figures = zip(*rows)
+    pricing, current, *counts = (np.array(column, dtype=float) for column in figures)
+    _, category_codes = np.unique(
+        np.array([category or "" for category in categories]), return_inverse=True
+    )
+    scores = compute_ranking_scores(*counts, pricing, category_codes)
+
+    changed = np.flatnonzero(np.abs(scores - current) >= SCORE_TOLERANCE)
+    for batch_start in range(0, len(changed), UPDATE_BATCH_SIZE):
+        batch = changed[batch_start : batch_start + UPDATE_BATCH_SIZE]
+        new_scores = values(
+            column("id", Uuid), column("score", Float), name="new_scores"
+        ).data([(ids[i], float(scores[i])) for i in batch])
+        session.exec(
+            update(Service)
+            .where(Service.id == new_scores.c.id)
+            .values(ranking_score=new_scores.c.score)
+        )
+    session.commit()
+
+    invalidate_category_listings({categories[i] for i in changed})
+    return len(changed)
+
+
+def _ranking_job() -> None:
+    with Session(engine) as session:
+        updated = rank_services(session)
+    if updated:
+        logger.info("Updated ranking scores for %s services", updated)
+
+
+service_ranker = PeriodicJob("service ranking", RANKING_INTERVAL, _ranking_job)
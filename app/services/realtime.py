@@ -0,0 +1,157 @@
+import asyncio
+import logging
+from typing import Callable, Hashable, Iterable, Optional
+
+import psycopg2
+import psycopg2.extensions
+from sqlalchemy import make_url
+
+logger = logging.getLogger(__name__)
+
+# Events a slow socket may fall behind by before we start dropping them; the
+# client can catch up from /status_updates/feed.
+SUBSCRIBER_QUEUE_SIZE = 100
+LISTENER_RETRY_SECONDS = 5
+
+
+class Subscriber:
+    """One open connection's queue of outgoing events."""
+
+    def __init__(self, keys: Iterable[Hashable]):
+        self.keys = frozenset(keys)
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+
+    def offer(self, event: dict) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning("Realtime subscriber queue full, dropping event")
+
+
+class RealtimeHub:
+    """
+    In-process fan-out of events to connected clients.
+
+    Subscribers register under the customer and/or provider ids they are
+    allowed to see; an event is delivered to everyone registered under any of
+    its owner ids.
+    """
+
+    def __init__(self):
+        self._subscribers: dict[Hashable, set[Subscriber]] = {}
+
+    def subscribe(self, keys: Iterable[Hashable]) -> Subscriber:
+        subscriber = Subscriber(keys)
+        for key in subscriber.keys:
+            self._subscribers.setdefault(key, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        for key in subscriber.keys:
+            subscribers = self._subscribers.get(key)
+            if subscribers is None:
+                continue
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[key]
+
+    def publish(self, keys: Iterable[Hashable], event: dict) -> None:
+        recipients: set[Subscriber] = set()
+        for key in keys:
+            recipients.update(self._subscribers.get(key, ()))
+        for subscriber in recipients:
+            subscriber.offer(event)
+
+
+hub = RealtimeHub()
+
+
+class NotificationListener:
+    """
+    Bridges a Postgres NOTIFY channel into this process.
+
+    Holds one dedicated psycopg2 connection in LISTEN mode and reads
+    notifications from the event loop when its socket becomes readable.
+    Reconnects after connection errors.
+    """
+
+    def __init__(
+        self,
+        database_url: Optional[str],
+        channel: str,
+        on_notify: Callable[[str], None],
+    ):
+        self.database_url = database_url
+        self.channel = channel
+        self.on_notify = on_notify
+        self._task: Optional[asyncio.Task] = None
+
+    def _dsn(self) -> str:
+        # psycopg2 wants a plain libpq URL, not SQLAlchemy's driver syntax
+        url = make_url(self.database_url).set(drivername="postgresql")
+        return url.render_as_string(hide_password=False)
+
+    def start(self) -> None:
+        if not self.database_url:
+            logger.warning("No database URL configured, realtime push disabled")
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(
+                    "Realtime listener failed, retrying in %ss", LISTENER_RETRY_SECONDS
+                )
+            await asyncio.sleep(LISTENER_RETRY_SECONDS)
+
+    async def _listen(self) -> None:
+        loop = asyncio.get_running_loop()
+        # TCP keepalives so a silently dropped connection is noticed
+        conn = await asyncio.to_thread(
+            psycopg2.connect,
+            self._dsn(),
+            keepalives=1,
+            keepalives_idle=30,
+            keepalives_interval=10,
+            keepalives_count=3,
+        )
+        lost: asyncio.Future = loop.create_future()
+
+        def on_readable() -> None:
+            try:
+                conn.poll()
+            except Exception as e:
+                if not lost.done():
+                    lost.set_exception(e)
+                return
+            while conn.notifies:
+                payload = conn.notifies.pop(0).payload
+                try:
+                    self.on_notify(payload)
+                except Exception:
+                    logger.exception("Error handling %s notification", self.channel)
+
+        try:
+            conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            loop.add_reader(conn.fileno(), on_readable)
+            logger.info("Realtime listener subscribed to %s", self.channel)
+            await lost
+        finally:
+            loop.remove_reader(conn.fileno())
+            conn.close()
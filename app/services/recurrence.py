@@ -0,0 +1,214 @@
+import calendar
+from datetime import datetime, timedelta
+from typing import Any, Iterator, NamedTuple, Optional
+from uuid import UUID, uuid5
+
+from sqlalchemy import Select
+from sqlmodel import Session, and_, func, or_, select
+
+from app.models.booking_series import BookingSeries, BookingSeriesException
+from app.models.enums import RecurrenceEnum
+from app.models.service import Service
+from app.utils.timezones import BUSINESS_TZ, as_utc
+
+WEEKS_BETWEEN = {RecurrenceEnum.weekly: 1, RecurrenceEnum.biweekly: 2}
+
+
+class Occurrence(NamedTuple):
+    # stable per (series, occurrence_start), so clients can refer to it
+    id: UUID
+    series_id: UUID
+    # where the rule puts it, and where it actually is (differs when moved)
+    occurrence_start: datetime
+    start_time: datetime
+    end_time: datetime
+
+
+def occurrence_id(series_id: UUID, occurrence_start: datetime) -> UUID:
+    return uuid5(series_id, as_utc(occurrence_start).isoformat())
+
+
+def _local_wall_time(value: datetime) -> datetime:
+    return as_utc(value).astimezone(BUSINESS_TZ).replace(tzinfo=None)
+
+
+def _nth_start(first_local: datetime, frequency: RecurrenceEnum, n: int) -> datetime:
+    # step in Pacific wall-clock time so a 9am series stays at 9am across DST
+    if frequency == RecurrenceEnum.monthly:
+        month_index = first_local.month - 1 + n
+        year = first_local.year + month_index // 12
+        month = month_index % 12 + 1
+        # the 31st repeats on the last day of shorter months
+        day = min(first_local.day, calendar.monthrange(year, month)[1])
+        local = first_local.replace(year=year, month=month, day=day)
+    else:
+        local = first_local + timedelta(weeks=WEEKS_BETWEEN[frequency] * n)
+    return as_utc(local.replace(tzinfo=BUSINESS_TZ))
+
+
+def _index_before(
+    first_local: datetime, frequency: RecurrenceEnum, moment: datetime
+) -> int:
+    """An occurrence index at or before `moment`, so expansion can jump ahead."""
+    moment = _local_wall_time(moment)
+    if frequency == RecurrenceEnum.monthly:
+        n = (moment.year - first_local.year) * 12 + moment.month - first_local.month
+    else:
+        n = (moment - first_local).days // (7 * WEEKS_BETWEEN[frequency])
+    return max(0, n - 1)
+
+
+def occurrence_starts(
+    first_start: datetime,
+    frequency: RecurrenceEnum,
+    until: Optional[datetime],
+    window_start: datetime,
+    window_end: datetime,
+) -> Iterator[datetime]:
+    """
+    Yield the rule's occurrence starts in [window_start, window_end), ascending.
+
+    Starts directly at the window instead of walking from the first occurrence,
+    so old series cost the same to expand as new ones.
+    """
+    first_local = _local_wall_time(first_start)
+    window_start, window_end = as_utc(window_start), as_utc(window_end)
+    until = as_utc(until) if until else None
+
+    n = _index_before(first_local, frequency, window_start)
+    while True:
+        start = _nth_start(first_local, frequency, n)
+        if start >= window_end or (until and start > until):
+            return
+        if start >= window_start:
+            yield start
+        n += 1
+
+
+def is_occurrence(series: BookingSeries, start: datetime) -> bool:
+    start = as_utc(start)
+    return any(
+        occurrence_starts(
+            series.first_start,
+            series.frequency,
+            series.until,
+            start,
+            start + timedelta(seconds=1),
+        )
+    )
+
+
+def expand_series(
+    session: Session,
+    query: Select,
+    window_start: datetime,
+    window_end: datetime,
+    exclude: Optional[tuple[UUID, datetime]] = None,
+) -> list[tuple[Any, Occurrence]]:
+    """
+    Expand recurring bookings into occurrences overlapping a window.
+
+    `query` selects from BookingSeries joined to Service and must include
+    BookingSeries.id, first_start, frequency, until and Service.duration; add
+    any other columns or filters (provider, customer) the caller needs. Series
+    that can't reach the window are filtered out here, and skipped/moved
+    occurrences are applied from one exceptions query. `exclude` leaves out
+    one (series_id, occurrence_start), e.g. the occurrence being moved.
+
+    Returns (series row, occurrence) pairs ordered by start_time.
+    """
+    window_start, window_end = as_utc(window_start), as_utc(window_end)
+    if exclude:
+        exclude = (exclude[0], as_utc(exclude[1]))
+    duration = func.make_interval(0, 0, 0, 0, 0, Service.duration)
+
+    # series whose rule reaches the window, or with an occurrence moved into it
+    moved_in = (
+        select(BookingSeriesException.series_id)
+        .join(BookingSeries, BookingSeries.id == BookingSeriesException.series_id)
+        .join(Service, Service.id == BookingSeries.service_id)
+        .where(
+            BookingSeriesException.new_start < window_end,
+            BookingSeriesException.new_start + duration > window_start,
+        )
+    )
+    rows = session.exec(
+        query.where(
+            or_(
+                and_(
+                    BookingSeries.first_start < window_end,
+                    or_(
+                        BookingSeries.until.is_(None),
+                        BookingSeries.until + duration > window_start,
+                    ),
+                ),
+                BookingSeries.id.in_(moved_in),
+            )
+        )
+    ).all()
+    if not rows:
+        return []
+
+    exceptions = session.exec(
+        select(BookingSeriesException)
+        .join(BookingSeries, BookingSeries.id == BookingSeriesException.series_id)
+        .join(Service, Service.id == BookingSeries.service_id)
+        .where(
+            BookingSeriesException.series_id.in_([row.id for row in rows]),
+            or_(
+                and_(
+                    BookingSeriesException.occurrence_start < window_end,
+                    BookingSeriesException.occurrence_start + duration > window_start,
+                ),
+                and_(
+                    BookingSeriesException.new_start < window_end,
+                    BookingSeriesException.new_start + duration > window_start,
+                ),
+            ),
+        )
+    ).all()
+    by_series: dict[UUID, dict[datetime, BookingSeriesException]] = {}
+    for exception in exceptions:
+        by_series.setdefault(exception.series_id, {})[
+            as_utc(exception.occurrence_start)
+        ] = exception
+
+    occurrences: list[tuple[Any, Occurrence]] = []
+
+    def add(row, original: datetime, start: datetime, length: timedelta) -> None:
+        if exclude == (row.id, original):
+            return
+        if start < window_end and start + length > window_start:
+            occurrence = Occurrence(
+                occurrence_id(row.id, original), row.id, original, start, start + length
+            )
+            occurrences.append((row, occurrence))
+
+    for row in rows:
+        length = timedelta(minutes=row.duration)
+        series_exceptions = by_series.get(row.id, {})
+
+        for start in occurrence_starts(
+            row.first_start, row.frequency, row.until, window_start - length, window_end
+        ):
+            if start not in series_exceptions:
+                add(row, start, start, length)
+
+        for original, exception in series_exceptions.items():
+            if exception.new_start:
+                add(row, original, as_utc(exception.new_start), length)
+
+    occurrences.sort(key=lambda pair: pair[1].start_time)
+    return occurrences
+
+
+def series_query(*columns) -> Select:
+    """Base query for expand_series; pass extra columns the caller needs."""
+    return select(
+        BookingSeries.id,
+        BookingSeries.first_start,
+        BookingSeries.frequency,
+        BookingSeries.until,
+        Service.duration,
+        *columns,
+    ).join(Service, Service.id == BookingSeries.service_id)
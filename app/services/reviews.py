@@ -0,0 +1,100 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlmodel import Session, select, true, tuple_
+
+from app.models.customer import Customer
+from app.models.provider import Provider
+from app.models.provider_stats import STAR_RATINGS, ProviderStats
+from app.models.reviews import ProviderReviewPage, Review, ReviewRead
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def get_provider_reviews_page(
+    session: Session,
+    provider_id: UUID,
+    limit: int,
+    cursor: Optional[str] = None,
+    rating: Optional[int] = None,
+) -> ProviderReviewPage:
+    """
+    One page of a provider's reviews, newest first, in a single query.
+
+    The page is read off ix_reviews_provider_id_created_at and keyset-paginated
+    on (created_at, id). The query starts from the provider row and outer-joins
+    the page, so an unknown provider is a 404 and a provider with no (matching)
+    reviews still gets their star histogram, which comes from provider_stats
+    and is only returned on the first page.
+    """
+    conditions = [Review.provider_id == provider_id]
+    if rating is not None:
+        conditions.append(Review.rating == rating)
+    if cursor:
+        created_at, review_id = decode_cursor(cursor, 2)
+        try:
+            created_at = datetime.fromisoformat(created_at)
+            review_id = UUID(review_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        conditions.append(
+            tuple_(Review.created_at, Review.id) < (created_at, review_id)
+        )
+
+    page = (
+        select(
+            Review.id,
+            Review.rating,
+            Review.description,
+            Review.created_at,
+            Customer.first_name,
+            Customer.last_name,
+        )
+        .join(Customer, Review.customer_id == Customer.id)
+        .where(*conditions)
+        .order_by(Review.created_at.desc(), Review.id.desc())
+        .limit(limit + 1)
+        .subquery()
+    )
+
+    query = select(page).select_from(Provider)
+    if not cursor:
+        query = query.add_columns(
+            *(getattr(ProviderStats, f"rating_{stars}") for stars in STAR_RATINGS)
+        ).outerjoin(ProviderStats, ProviderStats.provider_id == Provider.id)
+
+    rows = session.exec(
+        query.outerjoin(page, true())
+        .where(Provider.id == provider_id)
+        .order_by(page.c.created_at.desc(), page.c.id.desc())
+    ).all()
+    if not rows:
+        raise HTTPException(status_code=404, detail="Provider not found")
+
+    histogram = None
+    if not cursor:
+        histogram = {
+            stars: getattr(rows[0], f"rating_{stars}") or 0 for stars in STAR_RATINGS
+        }
+
+    # a provider with no matching reviews comes back as one all-NULL page row
+    rows = [row for row in rows if row.id is not None]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at.isoformat(), rows[-1].id)
+
+    return ProviderReviewPage(
+        reviews=[
+            ReviewRead(
+                customer_name=f"{row.first_name} {row.last_name}",
+                rating=row.rating,
+                description=row.description,
+                created_at=row.created_at,
+            )
+            for row in rows
+        ],
+        next_cursor=next_cursor,
+        histogram=histogram,
+    )
@@ -0,0 +1,88 @@
+from typing import Optional
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import REAL, cast, literal
+from sqlmodel import Session, func, select, tuple_
+
+from app.models.service import Service, ServiceSearchPage, ServiceSearchResult
+from app.utils.pagination import decode_cursor, encode_cursor
+
+SEARCH_VECTOR = Service.__table__.c.search_vector
+
+
+def search_services(
+    session: Session,
+    q: Optional[str],
+    category: Optional[str],
+    min_price: Optional[float],
+    max_price: Optional[float],
+    max_duration: Optional[int],
+    limit: int,
+    cursor: Optional[str] = None,
+) -> ServiceSearchPage:
+    """
+    Full-text search over services, best matches first.
+
+    `q` takes web-search syntax ("deep clean -carpet", "\\"move out\\"") and is
+    matched against the GIN-indexed search_vector; without it only the filters
+    apply. Pages are keyset-paginated on (rank, id), so deep pages cost the
+    same as the first.
+
+    Args:
+        category: DB enum NAME, as returned by validate_category
+    """
+    conditions = []
+    if min_price is not None:
+        conditions.append(Service.pricing >= min_price)
+    if max_price is not None:
+        conditions.append(Service.pricing <= max_price)
+    if max_duration is not None:
+        conditions.append(Service.duration <= max_duration)
+    if category:
+        conditions.append(Service.category == category)
+
+    ranked = bool(q and q.strip())
+    if ranked:
+        query = func.websearch_to_tsquery("english", q)
+        conditions.append(SEARCH_VECTOR.op("@@")(query))
+        # ts_rank_cd returns real; the cursor comparison stays in real too so
+        # a rank read back from a cursor compares equal to itself
+        rank = func.ts_rank_cd(SEARCH_VECTOR, query, type_=REAL)
+        order_by = (rank.desc(), Service.id.desc())
+    else:
+        rank = literal(None, REAL)
+        order_by = (Service.id.desc(),)
+
+    if cursor:
+        cursor_rank, cursor_id = decode_cursor(cursor, 2)
+        try:
+            cursor_id = UUID(cursor_id)
+            cursor_rank = float(cursor_rank) if ranked else None
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if ranked:
+            conditions.append(
+                tuple_(rank, Service.id) < tuple_(cast(cursor_rank, REAL), cursor_id)
+            )
+        else:
+            conditions.append(Service.id < cursor_id)
+
+    rows = session.exec(
+        select(Service, rank.label("rank"))
+        .where(*conditions)
+        .order_by(*order_by)
+        .limit(limit + 1)
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_service, last_rank = rows[-1]
+        next_cursor = encode_cursor(last_rank, last_service.id)
+
+    results = [
+        ServiceSearchResult.model_validate(service, update={"rank": rank})
+        for service, rank in rows
+    ]
+    return ServiceSearchPage(results=results, next_cursor=next_cursor)
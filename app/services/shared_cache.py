@@ -0,0 +1,243 @@
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Iterable, Optional
+from uuid import uuid4
+
+import anyio
+from sqlmodel import func, select
+
+from app import config
+from app.db.engine import REALTIME_DATABASE_URL, engine
+from app.services.periodic import PeriodicJob
+from app.services.realtime import NotificationListener
+from app.utils.cache import (
+    MISSING,
+    CacheMetrics,
+    StaleWhileRevalidateCache,
+    make_backend,
+)
+
+logger = logging.getLogger(__name__)
+
+# Postgres NOTIFY channel carrying cache invalidations between workers
+CACHE_INVALIDATION_CHANNEL = "cache_invalidation"
+# NOTIFY payloads must stay under 8000 bytes
+MAX_KEYS_PER_NOTIFY = 50
+
+# How often per-namespace cache metrics are logged
+CACHE_METRICS_INTERVAL = 5 * 60
+
+# tells this worker's own NOTIFYs apart from everyone else's
+WORKER_ID = uuid4().hex
+
+backend = make_backend(config.CACHE_URL)
+
+# namespace -> metrics, and how to drop keys from this worker's local copy
+_metrics: dict[str, CacheMetrics] = {}
+_local_invalidators: dict[str, Callable[[list[str]], None]] = {}
+_shared_caches: list["SharedCache"] = []
+
+_publisher = ThreadPoolExecutor(1, thread_name_prefix="cache-invalidation")
+
+
+def cache_key(key: Hashable) -> str:
+    """String form of a key, the same in every worker (and in Redis)."""
+    if isinstance(key, tuple):
+        return ":".join(cache_key(part) for part in key)
+    return str(key)
+
+
+def register_namespace(
+    namespace: str,
+    invalidate_local: Optional[Callable[[list[str]], None]] = None,
+    metrics: Optional[CacheMetrics] = None,
+) -> CacheMetrics:
+    """
+    Add a namespace to the metrics report, and optionally to the invalidation
+    bus: `invalidate_local(keys)` is called when another worker invalidates
+    keys in it.
+    """
+    if namespace in _metrics:
+        raise ValueError(f"Cache namespace {namespace!r} is already registered")
+    _metrics[namespace] = metrics or CacheMetrics()
+    if invalidate_local:
+        _local_invalidators[namespace] = invalidate_local
+    return _metrics[namespace]
+
+
+def register_local_cache(namespace: str, cache: StaleWhileRevalidateCache) -> None:
+    """Report a per-worker cache's metrics and apply other workers' invalidations
+    to it. The caller still broadcasts its own with broadcast_invalidation()."""
+
+    def invalidate_local(keys: list[str]) -> None:
+        for key in keys:
+            cache.invalidate(key)
+
+    register_namespace(namespace, invalidate_local, cache.metrics)
+
+
+def _notify(payload: str) -> None:
+    try:
+        with engine.connect() as connection:
+            connection.execute(
+                select(func.pg_notify(CACHE_INVALIDATION_CHANNEL, payload))
+            )
+            connection.commit()
+    except Exception:
+        # other workers catch up when their copies expire
+        logger.exception("Failed to broadcast cache invalidation")
+
+
+def broadcast_invalidation(namespace: str, keys: Iterable[str]) -> None:
+    """
+    Tell every other worker to drop `keys` from their copy of `namespace`.
+
+    Sent from a background thread so callers don't wait on the database.
+    """
+    keys = list(keys)
+    for start in range(0, len(keys), MAX_KEYS_PER_NOTIFY):
+        payload = json.dumps(
+            {
+                "worker": WORKER_ID,
+                "namespace": namespace,
+                "keys": keys[start : start + MAX_KEYS_PER_NOTIFY],
+            }
+        )
+        _publisher.submit(_notify, payload)
+
+
+def dispatch_invalidation(payload: str) -> None:
+    """Apply another worker's invalidation to this worker's caches."""
+    try:
+        message = json.loads(payload)
+    except ValueError:
+        logger.warning("Ignoring malformed cache invalidation: %r", payload)
+        return
+
+    if message.get("worker") == WORKER_ID:
+        return
+    invalidate_local = _local_invalidators.get(message.get("namespace"))
+    if invalidate_local:
+        invalidate_local(message["keys"])
+
+
+invalidation_listener = NotificationListener(
+    REALTIME_DATABASE_URL, CACHE_INVALIDATION_CHANNEL, dispatch_invalidation
+)
+
+
+class SharedCache:
+    """
+    A namespaced cache on the configured backend (see config.CACHE_URL).
+
+    Same interface as TTLCache. With the memory backend every worker has its
+    own copy and deletes are broadcast to the others; with Redis the entries
+    themselves are shared. Backend failures are logged and served as misses,
+    so a cache outage never fails a request.
+
+    Async code uses aget/aset/adelete instead, which make Redis round trips
+    from a worker thread rather than on the event loop.
+    """
+
+    def __init__(self, namespace: str, ttl: float, maxsize: int = 1024):
+        self.namespace = namespace
+        self.ttl = ttl
+        backend.register(namespace, ttl, maxsize)
+        self.metrics = register_namespace(
+            namespace, None if backend.shared else self._drop_local
+        )
+        _shared_caches.append(self)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            value = backend.get(self.namespace, cache_key(key))
+        except backend.errors:
+            logger.warning("Cache read failed in %s", self.namespace, exc_info=True)
+            self.metrics.errors += 1
+            value = MISSING
+
+        if value is MISSING:
+            self.metrics.misses += 1
+            return default
+        self.metrics.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        try:
+            backend.set(
+                self.namespace, cache_key(key), value, self.ttl if ttl is None else ttl
+            )
+        except backend.errors:
+            logger.warning("Cache write failed in %s", self.namespace, exc_info=True)
+            self.metrics.errors += 1
+            return
+        self.metrics.sets += 1
+
+    def delete(self, *keys: Hashable) -> None:
+        """Drop keys everywhere: locally, and in every other worker's copy."""
+        names = [cache_key(key) for key in keys]
+        if not names:
+            return
+        try:
+            backend.delete(self.namespace, names)
+        except backend.errors:
+            logger.warning("Cache delete failed in %s", self.namespace, exc_info=True)
+            self.metrics.errors += 1
+        self.metrics.invalidations += len(names)
+        if not backend.shared:
+            broadcast_invalidation(self.namespace, names)
+
+    async def aget(self, key: Hashable, default: Any = None) -> Any:
+        return await self._off_loop(self.get, key, default)
+
+    async def aset(
+        self, key: Hashable, value: Any, ttl: Optional[float] = None
+    ) -> None:
+        await self._off_loop(self.set, key, value, ttl)
+
+    async def adelete(self, *keys: Hashable) -> None:
+        await self._off_loop(self.delete, *keys)
+
+    async def _off_loop(self, method: Callable[..., Any], *args: Any) -> Any:
+        # the memory backend never blocks, so skip the thread hop
+        if not backend.shared:
+            return method(*args)
+        return await anyio.to_thread.run_sync(method, *args)
+
+    def _drop_local(self, keys: list[str]) -> None:
+        backend.delete(self.namespace, keys)
+        self.metrics.invalidations += len(keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, MISSING) is not MISSING
+
+
+def cache_metrics() -> dict[str, dict]:
+    """Counters per namespace since this worker started."""
+    for cache in _shared_caches:
+        cache.metrics.evictions = backend.evictions(cache.namespace)
+    return {namespace: metrics.as_dict() for namespace, metrics in _metrics.items()}
+
+
+def log_cache_metrics() -> None:
+    for namespace, metrics in cache_metrics().items():
+        if not (metrics["hits"] or metrics["misses"]):
+            continue
+        logger.info(
+            "cache %s: hits=%s misses=%s hit_rate=%.2f sets=%s evictions=%s "
+            "invalidations=%s errors=%s",
+            namespace,
+            metrics["hits"],
+            metrics["misses"],
+            metrics["hit_rate"],
+            metrics["sets"],
+            metrics["evictions"],
+            metrics["invalidations"],
+            metrics["errors"],
+        )
+
+
+cache_metrics_reporter = PeriodicJob(
+    "cache metrics report", CACHE_METRICS_INTERVAL, log_cache_metrics
+)
@@ -0,0 +1,148 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlmodel import Session, delete, func, select
+
+from app.config import SLOT_HOLD_TTL_MINUTES
+from app.models.booking import Booking
+from app.models.service import Service
+from app.models.slot_hold import SlotHold
+from app.services.availability import earliest_bookable_time, get_busy_schedules
+from app.utils.timezones import as_utc
+
+
+def lock_provider_schedule(session: Session, provider_id: UUID) -> None:
+    """
+    Serialize schedule writes for one provider until the transaction ends.
+
+    Takes a transaction-scoped Postgres advisory lock keyed on the provider, so
+    concurrent checkouts for the same provider check-and-insert one at a time
+    and the lock is released automatically on commit or rollback.
+    """
+    session.exec(
+        select(func.pg_advisory_xact_lock(func.hashtextextended(str(provider_id), 0)))
+    ).one()
+
+
+def ensure_slot_free(
+    session: Session,
+    provider_id: UUID,
+    start: datetime,
+    end: datetime,
+    own_hold_id: Optional[UUID] = None,
+    own_occurrence: Optional[tuple[UUID, datetime]] = None,
+    own_booking_id: Optional[UUID] = None,
+) -> None:
+    schedule = get_busy_schedules(
+        session,
+        [provider_id],
+        start,
+        end,
+        exclude_hold_id=own_hold_id,
+        exclude_occurrence=own_occurrence,
+        exclude_booking_id=own_booking_id,
+    )[provider_id]
+    if schedule.overlaps(start, end):
+        raise HTTPException(status_code=409, detail="Time slot is no longer available")
+
+
+def create_hold(session: Session, service: Service, start_time: datetime) -> SlotHold:
+    """Reserve a service's slot for SLOT_HOLD_TTL_MINUTES, or raise 409."""
+    start = as_utc(start_time)
+    end = start + timedelta(minutes=service.duration)
+    now = datetime.now(timezone.utc)
+
+    if start < earliest_bookable_time(now):
+        raise HTTPException(status_code=400, detail="Time slot is too soon to book")
+
+    lock_provider_schedule(session, service.provider_id)
+
+    # expired holds are dead weight; clear this provider's while we hold the lock
+    session.exec(
+        delete(SlotHold).where(
+            SlotHold.provider_id == service.provider_id, SlotHold.expires_at <= now
+        )
+    )
+    ensure_slot_free(session, service.provider_id, start, end)
+
+    hold = SlotHold(
+        provider_id=service.provider_id,
+        service_id=service.id,
+        start_time=start,
+        end_time=end,
+        expires_at=now + timedelta(minutes=SLOT_HOLD_TTL_MINUTES),
+    )
+    session.add(hold)
+    session.commit()
+    session.refresh(hold)
+    return hold
+
+
+def attach_payment_intent(session: Session, hold: SlotHold, payment_intent_id: str):
+    hold.payment_intent_id = payment_intent_id
+    session.add(hold)
+    session.commit()
+    session.refresh(hold)
+    return hold
+
+
+def release_hold(session: Session, hold_id: UUID) -> None:
+    session.exec(delete(SlotHold).where(SlotHold.id == hold_id))
+    session.commit()
+
+
+def claim_slot(
+    session: Session,
+    provider_id: UUID,
+    start_time: datetime,
+    duration: int,
+    payment_intent_id: str,
+) -> None:
+    """
+    Lock the provider's schedule and consume the checkout hold for a booking.
+
+    The slot must not overlap any other booking or unexpired hold; the hold
+    created for this payment (if any) is ignored for the check and deleted.
+    The caller must insert the booking and commit in the same transaction so
+    the advisory lock covers both the check and the insert.
+    """
+    start = as_utc(start_time)
+    end = start + timedelta(minutes=duration)
+
+    lock_provider_schedule(session, provider_id)
+
+    hold = session.exec(
+        select(SlotHold).where(SlotHold.payment_intent_id == payment_intent_id)
+    ).first()
+    ensure_slot_free(session, provider_id, start, end, hold.id if hold else None)
+
+    if hold:
+        session.delete(hold)
+
+
+def reschedule_booking(
+    session: Session, booking: Booking, start_time: datetime
+) -> Booking:
+    """
+    Move a booking to `start_time`, or raise 409 if the provider is busy then.
+
+    Takes the same schedule lock as checkout, so two reschedules, or a
+    reschedule and a checkout, can't both land on the slot. The booking's
+    current slot doesn't count against the new one.
+    """
+    service = session.get(Service, booking.service_id)
+    start = as_utc(start_time)
+    end = start + timedelta(minutes=service.duration)
+
+    lock_provider_schedule(session, booking.provider_id)
+    ensure_slot_free(
+        session, booking.provider_id, start, end, own_booking_id=booking.id
+    )
+
+    booking.start_time = start_time
+    session.add(booking)
+    session.commit()
+    session.refresh(booking)
+    return booking
@@ -0,0 +1,124 @@
+import logging
+from typing import Optional
+from uuid import UUID, uuid5
+
+from fastapi import HTTPException
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, func, select
+
+from app.db.engine import engine
+from app.models.service import Service, ServiceEnum
+from app.models.subcategory import Subcategory
+from app.services.periodic import PeriodicJob
+from app.utils import sub_categories
+
+logger = logging.getLogger(__name__)
+
+# Namespace for subcategory ids; changing it changes every id clients hold
+SUBCATEGORY_NAMESPACE = UUID("6f1d3c52-9a4e-4f0b-8c57-2f1e0b7d4a19")
+
+# The curated taxonomy, keyed by ServiceEnum NAME
+TAXONOMY: dict[str, list[str]] = {
+    category.name: getattr(sub_categories, category.name) for category in ServiceEnum
+}
+
+# The taxonomy is re-synced at startup and daily after that, so additions to
+# utils/sub_categories.py reach the table with the next deploy.
+TAXONOMY_SYNC_INTERVAL = 24 * 60 * 60
+
+
+def subcategory_id(category: str, name: str) -> UUID:
+    return uuid5(SUBCATEGORY_NAMESPACE, f"{category}:{name}")
+
+
+def sync_subcategories(session: Session) -> int:
+    """Insert any taxonomy entries missing from the table. Returns how many."""
+    rows = [
+        {"id": subcategory_id(category, name), "category": category, "name": name}
+        for category, names in TAXONOMY.items()
+        for name in names
+    ]
+    inserted = session.exec(
+        insert(Subcategory)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=[Subcategory.id])
+        .returning(Subcategory.id)
+    ).all()
+    session.commit()
+    return len(inserted)
+
+
+def list_subcategories(
+    session: Session, category: Optional[str] = None
+) -> list[Subcategory]:
+    statement = select(Subcategory).order_by(Subcategory.category, Subcategory.name)
+    if category:
+        statement = statement.where(Subcategory.category == category)
+    return session.exec(statement).all()
+
+
+def validate_subcategories(
+    session: Session, category: Optional[str], names: Optional[list[str]]
+) -> Optional[list[str]]:
+    """
+    Check a service's subcategories against the taxonomy for its category.
+
+    Matching ignores case and surrounding whitespace; the canonical spellings
+    are returned, deduplicated, in the order given. Raises 400 listing any
+    that aren't in the taxonomy.
+    """
+    if not names:
+        return names
+
+    keys = [name.strip().lower() for name in names]
+    canonical = {
+        name.lower(): name
+        for name in session.exec(
+            select(Subcategory.name).where(
+                Subcategory.category == category,
+                func.lower(Subcategory.name).in_(set(keys)),
+            )
+        ).all()
+    }
+
+    unknown = [name for name, key in zip(names, keys) if key not in canonical]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"unknown subcategories for category {category}: {unknown}",
+        )
+
+    return list(dict.fromkeys(canonical[key] for key in keys))
+
+
+def subcategory_filter(subcategory: str):
+    """
+    Where clause for services tagged with a subcategory, matched by name.
+
+    The taxonomy lookup happens inside the statement, so the array overlap
+    can use the GIN index on services_subcategories.
+    """
+    names = select(func.array_agg(Subcategory.name)).where(
+        func.lower(Subcategory.name) == subcategory.strip().lower()
+    )
+    return Service.services_subcategories.overlap(names.scalar_subquery())
+
+
+def get_services_by_subcategory(session: Session, subcategory: str) -> list[Service]:
+    return session.exec(
+        select(Service)
+        .where(subcategory_filter(subcategory))
+        .order_by(Service.ranking_score.desc(), Service.id)
+    ).all()
+
+
+def _sync_job() -> None:
+    with Session(engine) as session:
+        inserted = sync_subcategories(session)
+    if inserted:
+        logger.info("Added %s subcategories to the taxonomy", inserted)
+
+
+taxonomy_sync = PeriodicJob(
+    "subcategory taxonomy sync", TAXONOMY_SYNC_INTERVAL, _sync_job
+)
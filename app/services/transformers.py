@@ -1,61 +1,57 @@
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Optional
 
 from sqlmodel import Session
 
-from app.models import Provider, Review, Service
+from app.models import Provider, ProviderStats, Service
 from app.models.chat import ServiceRecommendation
-from app.services.db_access import get_all_reviews_by_provider
+from app.services.availability import (
+    BusySchedule,
+    earliest_bookable_time,
+    get_busy_schedules,
+    next_free_slot,
+)
+from app.services.provider_stats import get_provider_stats
 
+# How far ahead to look for a recommendation's next open slot
+AVAILABILITY_HORIZON = timedelta(days=14)
 
-def calculate_average_rating(reviews: List[Review]) -> float:
-    if not reviews:
+
+def calculate_average_rating(stats: Optional[ProviderStats]) -> float:
+    if not stats or not stats.review_count:
         return 0.0
-    total = sum(review.rating for review in reviews)
-    return round(total / len(reviews), 2)
+    return round(stats.average_rating, 2)
 
 
 def get_next_available_time(
-    session: Session, service: Service, start_from: Optional[datetime] = None
+    session: Session,
+    service: Service,
+    start_from: Optional[datetime] = None,
+    schedule: Optional[BusySchedule] = None,
 ) -> Optional[datetime]:
     """
     Calculate the next available time slot for a service.
-    HACKATHON VERSION: Simple fixed times based on urgency.
 
     Args:
-        session: Database session (not used in hackathon version)
+        session: Database session used to load the provider's bookings
         service: The service to check availability for
-        start_from: Starting time to check from (not used in hackathon version)
+        start_from: Starting time to check from (defaults to now + booking notice)
+        schedule: Preloaded busy schedule for the service's provider; pass this
+            when checking many services to avoid one query per service
 
     Returns:
-        Next available datetime - 2 hours for emergencies, 24 hours for regular services
+        Start of the provider's first open slot long enough for the service,
+        or None if nothing is free within the search horizon
     """
-    now = datetime.utcnow()
+    window_start = start_from or earliest_bookable_time()
+    window_end = window_start + AVAILABILITY_HORIZON
 
-    # Check if this is an emergency service based on category/keywords
-    emergency_keywords = [
-        "emergency",
-        "urgent",
-        "plumbing",
-        "electrical",
-        "hvac",
-        "repair",
-    ]
-    service_lower = (
-        service.service_title + " " + (service.service_description or "")
-    ).lower()
+    if schedule is None:
+        schedule = get_busy_schedules(
+            session, [service.provider_id], window_start, window_end
+        )[service.provider_id]
 
-    is_emergency = any(keyword in service_lower for keyword in emergency_keywords)
-
-    if is_emergency:
-        # Emergency services: 2 hours from now
-        available_time = now + timedelta(hours=2)
-    else:
-        # Regular services: 24 hours from now
-        available_time = now + timedelta(hours=24)
-
-    # Round to the nearest hour for cleaner times
-    return available_time.replace(minute=0, second=0, microsecond=0)
+    return next_free_slot(schedule, service.duration, window_start, window_end)
 
 
 def format_available_time(available_time: Optional[datetime]) -> str:
@@ -93,17 +89,23 @@ def get_provider_display_name(provider: Provider) -> str:
 
 
 def to_service_recommendation(
-    service: Service, session: Session
+    service: Service,
+    session: Session,
+    schedule: Optional[BusySchedule] = None,
+    stats: Optional[ProviderStats] = None,
 ) -> ServiceRecommendation:
     # Provider info
     provider_name = get_provider_display_name(service.provider)
-    provider_reviews = get_all_reviews_by_provider(session, service.provider.id)
+    if stats is None:
+        stats = get_provider_stats(session, [service.provider_id]).get(
+            service.provider_id
+        )
 
     # Get average rating for provider
-    average_rating = calculate_average_rating(provider_reviews)
+    average_rating = calculate_average_rating(stats)
 
     # Get next available time
-    next_available = get_next_available_time(session, service)
+    next_available = get_next_available_time(session, service, schedule=schedule)
 
     return ServiceRecommendation(
         id=str(service.id),
@@ -122,8 +124,22 @@ def to_service_recommendation(
 def map_services_to_recommendations(
     services: list[Service], session: Session
 ) -> list[ServiceRecommendation]:
+    services = [service for service in services if service.provider is not None]
+
+    # Load every recommended provider's bookings and rating stats in one query each
+    provider_ids = {service.provider_id for service in services}
+    window_start = earliest_bookable_time()
+    schedules = get_busy_schedules(
+        session, provider_ids, window_start, window_start + AVAILABILITY_HORIZON
+    )
+    stats = get_provider_stats(session, provider_ids)
+
     return [
-        to_service_recommendation(service, session)
+        to_service_recommendation(
+            service,
+            session,
+            schedules[service.provider_id],
+            stats.get(service.provider_id),
+        )
         for service in services
-        if service.provider is not None
     ]
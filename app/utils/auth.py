@@ -1,3 +1,7 @@
+import base64
+import hashlib
+import json
+import time
 from typing import Any, Dict, Optional
 from uuid import UUID
 
@@ -7,6 +11,7 @@ from fastapi.security.http import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import BaseModel
 
 from app import config
+from app.services.shared_cache import SharedCache
 
 auth_bearer_token = HTTPBearer()
 
@@ -21,8 +26,31 @@ https://supabase.com/docs/guides/database/postgres/timeouts#session-level
 """
 SUPABASE_HTTP_TIMEOUT = 10
 
+# Validated tokens are trusted for this long (or until they expire, if
+# sooner) without asking Supabase again, so a revoked token keeps working
+# for at most this many seconds. Keyed by a hash, never the token itself.
+AUTH_CACHE_TTL = 60
+auth_user_cache = SharedCache("auth_users", ttl=AUTH_CACHE_TTL, maxsize=10_000)
+
+
+def _token_ttl(token: str) -> float:
+    # the exp claim is only read to bound the cache entry; Supabase verifies
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(
+            base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        )
+        return min(AUTH_CACHE_TTL, claims["exp"] - time.time())
+    except (IndexError, KeyError, TypeError, ValueError):
+        return AUTH_CACHE_TTL
+
 
 async def _supabase_get_user(token: str) -> Dict[str, Any]:
+    cache_key = hashlib.sha256(token.encode()).hexdigest()
+    cached = await auth_user_cache.aget(cache_key)
+    if cached is not None:
+        return cached
+
     # Validate Supabase access token by calling Supabase Auth.
     url = f"{config.SUPABASE_URL}/auth/v1/user"
     headers = {
@@ -34,18 +62,19 @@ async def _supabase_get_user(token: str) -> Dict[str, Any]:
         response = await client.get(url, headers=headers)
 
     if response.status_code == 200:
-        return response.json()
+        user = response.json()
+        ttl = _token_ttl(token)
+        if ttl > 0:
+            await auth_user_cache.aset(cache_key, user, ttl=ttl)
+        return user
 
     raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED, detail=UnauthorizedMessage().detail
     )
 
 
-async def get_current_user_id(
-    auth_creds: Optional[HTTPAuthorizationCredentials] = Depends(auth_bearer_token),
-) -> UUID:
-    # Extract the bearer token (already validated by HTTPBearer) and return validated Supabase user in json
-    auth_user_data = await _supabase_get_user(auth_creds.credentials)
+async def get_user_id_from_token(token: str) -> UUID:
+    auth_user_data = await _supabase_get_user(token)
     try:
         return UUID(auth_user_data["id"])
     except Exception:
@@ -54,6 +83,13 @@ async def get_current_user_id(
         )
 
 
+async def get_current_user_id(
+    auth_creds: Optional[HTTPAuthorizationCredentials] = Depends(auth_bearer_token),
+) -> UUID:
+    # Extract the bearer token (already validated by HTTPBearer) and return validated Supabase user in json
+    return await get_user_id_from_token(auth_creds.credentials)
+
+
 async def get_supabase_user(
     auth_creds: Optional[HTTPAuthorizationCredentials] = Depends(auth_bearer_token),
 ):
@@ -0,0 +1,282 @@
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+
+@dataclass
+class CacheMetrics:
+    """Counters for one cache namespace, reported by services/shared_cache.py."""
+
+    hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    # dropped to make room (memory backend only; Redis evicts server-side)
+    evictions: int = 0
+    invalidations: int = 0
+    # backend failures, served as misses
+    errors: int = 0
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+
+class TTLCache:
+    """
+    Small in-process cache with per-entry expiry and LRU eviction.
+
+    Entries older than `ttl` seconds are treated as missing. When `maxsize` is
+    reached the least recently used entry is dropped.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key, MISSING)
+        if entry is MISSING:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return default
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, MISSING) is not MISSING
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class StaleWhileRevalidateCache:
+    """
+    Cache whose entries keep being served while they're rebuilt.
+
+    An entry goes stale `ttl` seconds after it was built, or as soon as it's
+    invalidated. Reading a stale entry returns it immediately and schedules a
+    single background rebuild with `loader(key)`; only the first read of a
+    key that has never been built waits for the loader. A rebuild that
+    started before an invalidation is stored but stays stale, so the next
+    read rebuilds again.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[Hashable], Any],
+        ttl: float,
+        max_workers: int = 2,
+        metrics: Optional[CacheMetrics] = None,
+    ):
+        self.loader = loader
+        self.ttl = ttl
+        self.metrics = metrics or CacheMetrics()
+        self._lock = threading.Lock()
+        # key -> (value, built_at, version it was built from)
+        self._entries: dict[Hashable, tuple[Any, float, int]] = {}
+        self._versions: dict[Hashable, int] = {}
+        self._refreshing: set[Hashable] = set()
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="swr")
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            version = self._versions.get(key, 0)
+        if entry is None:
+            self.metrics.misses += 1
+            return self._build(key, version)
+
+        # stale reads count as hits: they're answered without waiting
+        self.metrics.hits += 1
+        value, built_at, built_version = entry
+        if built_version != version or built_at + self.ttl <= time.monotonic():
+            self._schedule(key)
+        return value
+
+    def refresh(self, key: Hashable) -> Any:
+        """Rebuild an entry now, in the calling thread."""
+        with self._lock:
+            version = self._versions.get(key, 0)
+        return self._build(key, version)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._versions[key] = self._versions.get(key, 0) + 1
+        self.metrics.invalidations += 1
+
+    def invalidate_all(self) -> None:
+        with self._lock:
+            for key in self._entries:
+                self._versions[key] = self._versions.get(key, 0) + 1
+
+    def _build(self, key: Hashable, version: int) -> Any:
+        value = self.loader(key)
+        with self._lock:
+            current = self._entries.get(key)
+            # don't let a slow rebuild overwrite a newer one
+            if current is None or current[2] <= version:
+                self._entries[key] = (value, time.monotonic(), version)
+        self.metrics.sets += 1
+        return value
+
+    def _schedule(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        self._executor.submit(self._refresh_in_background, key)
+
+    def _refresh_in_background(self, key: Hashable) -> None:
+        try:
+            self.refresh(key)
+        except Exception:
+            logger.exception("Background rebuild of cache entry %r failed", key)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+
+class MemoryBackend:
+    """
+    Per-process storage: one TTLCache per namespace.
+
+    Each worker has its own copy, so deletes have to be broadcast to the
+    others (services/shared_cache.py does this).
+    """
+
+    shared = False
+    # exceptions callers should treat as a miss; memory never fails
+    errors: tuple = ()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._caches: dict[str, TTLCache] = {}
+
+    def register(self, namespace: str, ttl: float, maxsize: int) -> None:
+        with self._lock:
+            self._caches.setdefault(namespace, TTLCache(ttl, maxsize))
+
+    def get(self, namespace: str, key: str) -> Any:
+        with self._lock:
+            return self._caches[namespace].get(key, MISSING)
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._caches[namespace].set(key, value, ttl)
+
+    def delete(self, namespace: str, keys: Iterable[str]) -> None:
+        with self._lock:
+            cache = self._caches[namespace]
+            for key in keys:
+                cache.delete(key)
+
+    def clear(self, namespace: str) -> None:
+        with self._lock:
+            self._caches[namespace].clear()
+
+    def evictions(self, namespace: str) -> int:
+        return self._caches[namespace].evictions
+
+
+class RedisBackend:
+    """
+    Storage shared by every worker, in Redis.
+
+    Values are pickled, so only point this at a Redis the app owns. Entries
+    expire through Redis TTLs and `maxsize` is left to the server's
+    maxmemory policy. Pass `client` to use an existing (or stand-in) client
+    instead of connecting to `url`. The redis package is only imported when
+    this backend is used.
+    """
+
+    shared = True
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        client: Any = None,
+        prefix: str = "wipe_right:",
+    ):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError(
+                "CACHE_URL points at Redis but the redis package isn't installed "
+                "(install the 'redis' extra)"
+            ) from e
+
+        self.errors = (redis.RedisError,)
+        self.client = client or redis.Redis.from_url(
+            url, socket_timeout=0.5, socket_connect_timeout=0.5
+        )
+        self.prefix = prefix
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}{namespace}:{key}"
+
+    def register(self, namespace: str, ttl: float, maxsize: int) -> None:
+        pass
+
+    def get(self, namespace: str, key: str) -> Any:
+        data = self.client.get(self._key(namespace, key))
+        return MISSING if data is None else pickle.loads(data)
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        self.client.set(
+            self._key(namespace, key),
+            pickle.dumps(value),
+            px=max(int(ttl * 1000), 1),
+        )
+
+    def delete(self, namespace: str, keys: Iterable[str]) -> None:
+        names = [self._key(namespace, key) for key in keys]
+        if names:
+            self.client.delete(*names)
+
+    def clear(self, namespace: str) -> None:
+        names = list(self.client.scan_iter(match=self._key(namespace, "*")))
+        if names:
+            self.client.delete(*names)
+
+    def evictions(self, namespace: str) -> int:
+        return 0
+
+
+def make_backend(url: Optional[str]) -> MemoryBackend | RedisBackend:
+    """RedisBackend for a redis:// or rediss:// URL, MemoryBackend otherwise."""
+    if url and url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend(url)
+    return MemoryBackend()
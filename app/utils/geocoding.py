@@ -1,14 +1,24 @@
 import logging
 
 import httpx
-from async_lru import alru_cache
 from fastapi import HTTPException
 
+from app.services.shared_cache import SharedCache
+
 logger = logging.getLogger(__name__)
 
+# address string -> (lat, lon); addresses don't move, and Nominatim asks
+# clients to cache. Not-found results are kept for a shorter time.
+GEOCODE_TTL = 30 * 24 * 60 * 60
+GEOCODE_NOT_FOUND_TTL = 24 * 60 * 60
+geocode_cache = SharedCache("geocoding", ttl=GEOCODE_TTL, maxsize=10_000)
+
 
-@alru_cache(maxsize=1000)  # Cache results in memory
 async def geocode_address(address_string: str) -> tuple[float | None, float | None]:
+    cached = await geocode_cache.aget(address_string)
+    if cached is not None:
+        return cached
+
     url = "https://nominatim.openstreetmap.org/search"
     params = {"q": address_string, "format": "json", "limit": 1}
     headers = {
@@ -27,6 +37,8 @@ async def geocode_address(address_string: str) -> tuple[float | None, float | No
     if data:
         lat = float(data[0]["lat"])
         lon = float(data[0]["lon"])
+        await geocode_cache.aset(address_string, (lat, lon))
         return lat, lon
 
+    await geocode_cache.aset(address_string, (None, None), ttl=GEOCODE_NOT_FOUND_TTL)
     return None, None
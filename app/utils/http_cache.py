@@ -0,0 +1,104 @@
+import hashlib
+from typing import Callable, Optional
+
+from fastapi import Request
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# request.state attribute a route's conditional_get dependency sets
+_POLICY_ATTR = "cache_control"
+
+
+def conditional_get(
+    max_age: int = 60, shared_max_age: Optional[int] = None
+) -> Callable[[Request], None]:
+    """
+    Dependency that opts a public GET route into ETags and caching.
+
+    Successful responses get a strong ETag (a hash of the body) and a
+    `Cache-Control: public` header, so a CDN can keep them for
+    `shared_max_age` seconds and apps for `max_age`. A request whose
+    If-None-Match matches gets an empty 304. The work is done by
+    ConditionalGetMiddleware, which must be installed on the app.
+
+        @router.get("/", dependencies=[Depends(conditional_get(max_age=300))])
+    """
+    cache_control = f"public, max-age={max_age}"
+    if shared_max_age is not None:
+        cache_control += f", s-maxage={shared_max_age}"
+
+    def dependency(request: Request) -> None:
+        setattr(request.state, _POLICY_ATTR, cache_control)
+
+    return dependency
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+class ConditionalGetMiddleware:
+    """
+    Adds ETag/Cache-Control to routes that opted in with conditional_get, and
+    answers matching If-None-Match requests with 304 Not Modified.
+
+    Other requests pass straight through without being buffered.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        chunks: list[bytes] = []
+        passthrough = False
+
+        async def send_with_etag(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                cache_control = scope.get("state", {}).get(_POLICY_ATTR)
+                if cache_control is None or message["status"] != 200:
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            etag = make_etag(body)
+            headers = MutableHeaders(raw=list(start["headers"]))
+            headers["ETag"] = etag
+            headers["Cache-Control"] = scope["state"][_POLICY_ATTR]
+
+            if_none_match = Headers(scope=scope).get("if-none-match")
+            if if_none_match and etag_matches(if_none_match, etag):
+                del headers["Content-Length"]
+                del headers["Content-Type"]
+                await send({**start, "status": 304, "headers": headers.raw})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            await send({**start, "headers": headers.raw})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_with_etag)
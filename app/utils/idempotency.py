@@ -0,0 +1,129 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import Header, HTTPException
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, delete
+
+from app.models.idempotency_key import IdempotencyKey
+
+# How long a key (and its stored response) can be replayed
+IDEMPOTENCY_TTL = timedelta(hours=24)
+
+
+def get_idempotency_key(
+    idempotency_key: Optional[str] = Header(
+        default=None, alias="Idempotency-Key", max_length=255
+    ),
+) -> Optional[str]:
+    return idempotency_key
+
+
+def hash_request(payload: BaseModel) -> str:
+    return hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+
+
+def _claim_key(
+    session: Session, scope: str, key: str, request_hash: str
+) -> Optional[Any]:
+    """
+    Claim an idempotency key for this request.
+
+    Returns None if the caller should run the request, or the stored response
+    body if this is a replay of a completed request.
+    """
+    now = datetime.now(timezone.utc)
+
+    # expired keys are free to reuse
+    session.exec(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now))
+    claimed = session.exec(
+        insert(IdempotencyKey)
+        .values(
+            scope=scope,
+            key=key,
+            request_hash=request_hash,
+            expires_at=now + IDEMPOTENCY_TTL,
+        )
+        .on_conflict_do_nothing()
+    )
+    session.commit()
+
+    if claimed.rowcount:
+        return None
+
+    existing = session.get(IdempotencyKey, (scope, key))
+    if not existing or existing.status_code is None:
+        raise HTTPException(
+            status_code=409,
+            detail="A request with this Idempotency-Key is already in progress",
+        )
+    if existing.request_hash != request_hash:
+        raise HTTPException(
+            status_code=422,
+            detail="Idempotency-Key was already used with a different request",
+        )
+
+    return existing.response_body
+
+
+def _store_response(session: Session, scope: str, key: str, body: Any) -> None:
+    record = session.get(IdempotencyKey, (scope, key))
+    record.status_code = 200
+    record.response_body = body
+    session.add(record)
+    session.commit()
+
+
+def _release_key(session: Session, scope: str, key: str) -> None:
+    session.rollback()
+    session.exec(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.scope == scope, IdempotencyKey.key == key
+        )
+    )
+    session.commit()
+
+
+async def run_idempotent(
+    session: Session,
+    scope: str,
+    key: Optional[str],
+    payload: BaseModel,
+    handler: Callable[[], Awaitable[Any]],
+) -> Any:
+    """
+    Run a write handler at most once per Idempotency-Key.
+
+    The first request claims the key and stores its serialized response;
+    replays with the same key and body get the stored response back without
+    re-running side effects. A failed request releases the key so the client
+    can retry. Requests without a key run normally.
+
+    Args:
+        session: Database session
+        scope: Endpoint and caller the key belongs to
+        key: Value of the Idempotency-Key header, if sent
+        payload: Request body, hashed to detect key reuse with different data
+        handler: Coroutine function that performs the write
+
+    Returns:
+        The handler's response, or the stored response for a replay
+    """
+    if not key:
+        return await handler()
+
+    stored = _claim_key(session, scope, key, hash_request(payload))
+    if stored is not None:
+        return stored
+
+    try:
+        body = jsonable_encoder(await handler())
+    except Exception:
+        _release_key(session, scope, key)
+        raise
+
+    _store_response(session, scope, key, body)
+    return body
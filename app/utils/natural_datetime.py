@@ -0,0 +1,216 @@
+"""
+Natural-language date/time parsing for Bumi's booking commands.
+
+Everything is interpreted in Pacific time (with DST) and the grammar is one
+precompiled alternation, so a command is parsed in a single scan:
+dates ("aug 30", "30th of august", "tomorrow", "in 3 days", "this friday",
+"next monday", "next week"), times ("at 3", "3:30", "3:30pm", "noon") and
+parts of the day ("evening") are picked up in any order.
+"""
+
+import re
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from app.utils.timezones import BUSINESS_TZ
+
+MONTHS = {
+    "jan": 1,
+    "feb": 2,
+    "mar": 3,
+    "apr": 4,
+    "may": 5,
+    "jun": 6,
+    "jul": 7,
+    "aug": 8,
+    "sep": 9,
+    "oct": 10,
+    "nov": 11,
+    "dec": 12,
+}
+WEEKDAYS = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+NUMBER_WORDS = {
+    "a": 1,
+    "an": 1,
+    "one": 1,
+    "two": 2,
+    "three": 3,
+    "four": 4,
+    "five": 5,
+    "six": 6,
+    "seven": 7,
+    "eight": 8,
+    "nine": 9,
+    "ten": 10,
+    "eleven": 11,
+    "twelve": 12,
+}
+# part of day -> default hour, and whether a bare "at 7" in it means pm
+PARTS_OF_DAY = {
+    "morning": (9, False),
+    "afternoon": (14, True),
+    "evening": (18, True),
+    "night": (20, True),
+    "tonight": (20, True),
+}
+
+# Used when a date is given without a time
+DEFAULT_HOUR = 9
+# Bare hours before this ("at 3") are read as pm; nobody books a 3am cleaning
+EARLIEST_AM_HOUR = 8
+
+_MONTH = (
+    r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?"
+    r"|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+)
+_WEEKDAY = (
+    r"(?:mon(?:day)?|tue(?:s(?:day)?)?|wed(?:nesday)?|thu(?:r(?:s(?:day)?)?)?"
+    r"|fri(?:day)?|sat(?:urday)?|sun(?:day)?)"
+)
+_ORDINAL = r"(?:st|nd|rd|th)?"
+_COUNT = r"\d+|an?|one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve"
+
+# Each alternative is wrapped in one outer named group, so match.lastgroup
+# says which one matched without building a groupdict per match. Input is
+# lowercased once up front instead of matching with IGNORECASE.
+_GRAMMAR = re.compile(
+    rf"""
+    \b(?:
+        (?P<month_date>(?P<month>{_MONTH})\.?\s+(?P<month_day>\d{{1,2}}){_ORDINAL})
+      | (?P<date_month>(?P<day>\d{{1,2}}){_ORDINAL}\s+(?:of\s+)?(?P<of_month>{_MONTH}))
+      | (?P<day_after>day\s+after\s+tomorrow)
+      | (?P<tomorrow>tomorrow|tmrw)
+      | (?P<today>today)
+      | (?P<offset>in\s+(?P<count>{_COUNT})\s+(?P<unit>minute|hour|day|week)s?)
+      | (?P<next_week>next\s+week)
+      | (?P<weekday_ref>(?:(?P<relative>this|next|coming)\s+)?(?P<weekday>{_WEEKDAY}))
+      | (?P<noon>noon|midday)
+      | (?P<midnight>midnight)
+      | (?P<part>morning|afternoon|evening|night|tonight)
+      | (?P<clock>(?:at\s+)?(?P<hour>\d{{1,2}})(?::(?P<minute>\d{{2}}))?\s*(?P<meridiem>[ap])\.?m\.?)
+      | (?P<at_clock>(?:at\s+(?P<at_hour>\d{{1,2}})|(?P<bare_hour>\d{{1,2}})(?=:\d))(?::(?P<at_minute>\d{{2}}))?)
+    )(?!\w)
+    """,
+    re.VERBOSE,
+)
+
+
+def _count(value: str) -> int:
+    return int(value) if value.isdigit() else NUMBER_WORDS[value]
+
+
+def _next_weekday(today: date, weekday: int, relative: Optional[str]) -> date:
+    days_ahead = (weekday - today.weekday()) % 7
+    # "next friday" never means today; "this friday"/"friday" can
+    if days_ahead == 0 and relative in ("next", "coming"):
+        days_ahead = 7
+    return today + timedelta(days=days_ahead)
+
+
+def parse_natural_datetime(
+    text: str, now: Optional[datetime] = None
+) -> Optional[datetime]:
+    """
+    Parse a natural-language date/time into an aware Pacific datetime.
+
+    Dates without a time default to DEFAULT_HOUR (or the part of day, e.g.
+    "this friday evening" is 6pm); a time without a date is today if it's
+    still ahead, otherwise tomorrow. Weekdays and month-day dates that have
+    passed roll over to next week / next year. Returns None if nothing date-
+    or time-like is found or the date doesn't exist.
+
+    Args:
+        text: User command, e.g. "move my cleaning to next friday at 3"
+        now: Reference time (defaults to the current time)
+    """
+    now = (now or datetime.now(BUSINESS_TZ)).astimezone(BUSINESS_TZ)
+    today = now.date()
+
+    day: Optional[date] = None
+    month_day: Optional[tuple[int, int]] = None
+    exact: Optional[datetime] = None
+    hour = minute = None
+    meridiem: Optional[str] = None
+    part: Optional[str] = None
+    weekday_named = False
+
+    for match in _GRAMMAR.finditer(text.lower()):
+        kind, group = match.lastgroup, match.group
+
+        if kind == "month_date":
+            month_day = (MONTHS[group("month")[:3]], int(group("month_day")))
+        elif kind == "date_month":
+            month_day = (MONTHS[group("of_month")[:3]], int(group("day")))
+        elif kind == "day_after":
+            day = today + timedelta(days=2)
+        elif kind == "tomorrow":
+            day = today + timedelta(days=1)
+        elif kind == "today":
+            day = today
+        elif kind == "offset":
+            count, unit = _count(group("count")), group("unit")
+            if unit in ("minute", "hour"):
+                exact = now + timedelta(**{f"{unit}s": count})
+            else:
+                day = today + timedelta(days=count * (7 if unit == "week" else 1))
+        elif kind == "next_week":
+            day = today + timedelta(weeks=1)
+        elif kind == "weekday_ref":
+            weekday = WEEKDAYS[group("weekday")[:3]]
+            day = _next_weekday(today, weekday, group("relative"))
+            weekday_named = True
+        elif kind == "noon":
+            hour, minute, meridiem = 12, 0, "p"
+        elif kind == "midnight":
+            hour, minute, meridiem = 12, 0, "a"
+        elif kind == "part":
+            part = group("part")
+            if part == "tonight":
+                day = day or today
+        elif kind == "clock":
+            hour, minute = int(group("hour")), int(group("minute") or 0)
+            meridiem = group("meridiem")
+        elif kind == "at_clock":
+            hour = int(group("at_hour") or group("bare_hour"))
+            minute = int(group("at_minute") or 0)
+            meridiem = None
+
+    if exact:
+        return exact.replace(second=0, microsecond=0)
+    if day is None and month_day is None and hour is None and part is None:
+        return None
+
+    # resolve the hour
+    if hour is None:
+        hour, minute = (PARTS_OF_DAY[part][0], 0) if part else (DEFAULT_HOUR, 0)
+    elif meridiem == "p" and hour < 12:
+        hour += 12
+    elif meridiem == "a" and hour == 12:
+        hour = 0
+    elif meridiem is None and hour < 12:
+        evening = part and PARTS_OF_DAY[part][1]
+        if evening or hour < EARLIEST_AM_HOUR:
+            hour += 12
+    if hour > 23 or minute > 59:
+        return None
+
+    # resolve the date
+    try:
+        if month_day:
+            month, mday = month_day
+            day = date(today.year, month, mday)
+            if day < today:
+                day = date(today.year + 1, month, mday)
+        elif day is None:
+            day = today
+            if (hour, minute) <= (now.hour, now.minute):
+                day += timedelta(days=1)
+    except ValueError:
+        return None
+
+    result = datetime(day.year, day.month, day.day, hour, minute, tzinfo=BUSINESS_TZ)
+    # "friday at 9" said on a friday at 10 means next week's
+    if weekday_named and result <= now:
+        result = result.replace(tzinfo=None) + timedelta(weeks=1)
+        result = result.replace(tzinfo=BUSINESS_TZ)
+    return result
@@ -107,45 +107,43 @@ HANDYMAN_AND_REPAIRS = [
     "Weather Stripping Installation",
     "Screen Repair (Doors/Windows)",
 ]
-EXTERIOR_CLEANING = (
-    [
-        "House Pressure Washing (Siding, Brick)",
-        "Driveway & Sidewalk Pressure Washing",
-        "Deck & Patio Cleaning",
-        "Fence Pressure Washing",
-        "Soft Washing (Delicate Surfaces)",
-        "Gutter Cleaning (Debris Removal)",
-        "Gutter Brightening (Exterior)",
-        "Downspout Flushing",
-        "Minor Gutter Repair",
-        "Roof Moss Removal (Gentle)",
-        "Exterior Window Cleaning (Residential)",
-        "Screen Cleaning",
-        "Window Sill Wiping",
-        "Solar Panel Cleaning",
-        "Skylight Cleaning",
-        "Concrete Sealing (Post-Wash)",
-        "Paver Cleaning & Sealing",
-        "Rust Stain Removal (Exterior)",
-        "Oil Stain Removal (Driveway)",
-        "Roof Soft Washing (Algae/Moss)",
-        "Siding Soft Washing (Vinyl, Stucco)",
-        "Soffit & Fascia Cleaning",
-        "Exterior Building Washing (Commercial)",
-        "Drive-thru Cleaning (Commercial)",
-        "Dumpster Pad Cleaning",
-        "Parking Lot Stripping (Light Cleaning)",
-        "Graffiti Removal (Non-Porous Surfaces)",
-        "Deck Cleaning & Restoration",
-        "Patio Furniture Cleaning",
-        "Awning Cleaning",
-        "Outdoor Kitchen Cleaning (Exterior)",
-        "Post-Construction Exterior Clean-up",
-        "New Home Exterior Wash",
-        "Vacation Rental Exterior Detailing",
-        "Seasonal Exterior Maintenance Packages",
-    ],
-)
+EXTERIOR_CLEANING = [
+    "House Pressure Washing (Siding, Brick)",
+    "Driveway & Sidewalk Pressure Washing",
+    "Deck & Patio Cleaning",
+    "Fence Pressure Washing",
+    "Soft Washing (Delicate Surfaces)",
+    "Gutter Cleaning (Debris Removal)",
+    "Gutter Brightening (Exterior)",
+    "Downspout Flushing",
+    "Minor Gutter Repair",
+    "Roof Moss Removal (Gentle)",
+    "Exterior Window Cleaning (Residential)",
+    "Screen Cleaning",
+    "Window Sill Wiping",
+    "Solar Panel Cleaning",
+    "Skylight Cleaning",
+    "Concrete Sealing (Post-Wash)",
+    "Paver Cleaning & Sealing",
+    "Rust Stain Removal (Exterior)",
+    "Oil Stain Removal (Driveway)",
+    "Roof Soft Washing (Algae/Moss)",
+    "Siding Soft Washing (Vinyl, Stucco)",
+    "Soffit & Fascia Cleaning",
+    "Exterior Building Washing (Commercial)",
+    "Drive-thru Cleaning (Commercial)",
+    "Dumpster Pad Cleaning",
+    "Parking Lot Stripping (Light Cleaning)",
+    "Graffiti Removal (Non-Porous Surfaces)",
+    "Deck Cleaning & Restoration",
+    "Patio Furniture Cleaning",
+    "Awning Cleaning",
+    "Outdoor Kitchen Cleaning (Exterior)",
+    "Post-Construction Exterior Clean-up",
+    "New Home Exterior Wash",
+    "Vacation Rental Exterior Detailing",
+    "Seasonal Exterior Maintenance Packages",
+]
 SPECIALIZED_CLEANING = [
     "Crime Scene Clean-up",
     "Unattended Death Clean-up",
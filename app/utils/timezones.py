@@ -0,0 +1,18 @@
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+# Providers and customers are in the Bay Area; business hours, recurring
+# bookings and natural-language dates are all in Pacific time.
+BUSINESS_TZ = ZoneInfo("America/Los_Angeles")
+
+
+def as_utc(value: datetime) -> datetime:
+    """Normalize a datetime to aware UTC (naive values are treated as UTC)."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def as_naive_utc(value: datetime) -> datetime:
+    """Normalize a datetime to naive UTC, the way bookings.start_time stores it."""
+    return as_utc(value).replace(tzinfo=None)
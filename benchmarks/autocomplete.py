@@ -0,0 +1,78 @@
+"""
+Benchmark autocomplete lookups and incremental updates.
+
+Run with `make bench` (or `uv run python -m benchmarks.autocomplete`). The
+index holds a synthetic catalog of services and providers plus the real
+subcategory taxonomy; prefixes are what people type a letter at a time.
+"""
+
+import random
+import statistics
+import timeit
+from uuid import uuid4
+
+from app.services.autocomplete import AutocompleteIndex, _Entry
+from app.services.subcategories import TAXONOMY
+
+ROUNDS = 5
+NUMBER = 2000
+SERVICES = 20_000
+PROVIDERS = 3_000
+
+random.seed(7)
+WORDS = (
+    "deep clean kitchen bathroom windows lawn garden hedge trim gutter pressure "
+    "wash carpet move out eco friendly same day weekly biweekly monthly"
+).split()
+PREFIXES = ["d", "de", "dee", "deep", "deep c", "gu", "gutter", "pre", "win", "zz"]
+
+
+def catalog() -> list[_Entry]:
+    entries = [
+        _Entry(
+            " ".join(random.choice(WORDS) for _ in range(3)).capitalize(),
+            "service",
+            uuid4(),
+            random.randint(0, 500),
+        )
+        for _ in range(SERVICES)
+    ]
+    entries += [
+        _Entry(f"Sparkle Co {i}", "provider", uuid4(), random.randint(0, 2000))
+        for i in range(PROVIDERS)
+    ]
+    entries += [
+        _Entry(name, "subcategory", uuid4(), random.randint(0, 5000))
+        for names in TAXONOMY.values()
+        for name in names
+    ]
+    return entries
+
+
+def _median_us(fn, number: int = NUMBER) -> float:
+    timings = timeit.repeat(fn, repeat=ROUNDS, number=number)
+    return statistics.median(timings) / number * 1_000_000
+
+
+def main() -> None:
+    entries = catalog()
+    build = _median_us(lambda: AutocompleteIndex(entries), number=1)
+    index = AutocompleteIndex(entries)
+    print(f"{len(index):,d} entries, built in {build / 1000:.0f} ms")
+
+    print("\nlookup (limit 8)          µs")
+    for prefix in PREFIXES:
+        us = _median_us(lambda: index.search(prefix, 8))
+        print(f"  {prefix!r:<20} {us:7.1f}")
+
+    print("\nincremental update")
+    # the most popular service, so it leaves and joins the top of every broad
+    # prefix it matches; enough rounds to include the occasional re-rank
+    entry = max(entries[:SERVICES], key=lambda entry: entry.popularity)
+    renamed = entry._replace(label="Weekly eco friendly lawn trim")
+    rename = _median_us(lambda: (index.add(renamed), index.add(entry)), number=200)
+    print(f"  rename the top service  {rename / 2:7.1f} µs (amortized)")
+
+
+if __name__ == "__main__":
+    main()
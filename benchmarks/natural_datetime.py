@@ -0,0 +1,68 @@
+"""
+Micro-benchmark for Bumi's natural-language datetime parser.
+
+Run with `make bench` (or `uv run python -m benchmarks.natural_datetime`).
+Prints the per-call cost over a corpus of real reschedule commands.
+"""
+
+import statistics
+import timeit
+from datetime import datetime
+
+from app.utils.natural_datetime import parse_natural_datetime
+from app.utils.timezones import BUSINESS_TZ
+
+# Commands as customers typed them to Bumi
+CORPUS = [
+    "reschedule my house cleaning to august 30 at 3",
+    "move my appointment to aug 30th at 3pm",
+    "can you move it to the 2nd of september at 10am",
+    "change my plumbing booking to tomorrow at 3pm",
+    "reschedule to tomorrow at 9",
+    "move the lawn mowing to next friday",
+    "next monday at 10:30am please",
+    "push it to next week",
+    "can we do this friday evening instead",
+    "friday at 4",
+    "in 3 days",
+    "in two weeks at 1pm",
+    "move it to day after tomorrow at noon",
+    "tonight at 7",
+    "thursday morning works better",
+    "reschedule my window washing to sept 12 1:15 p.m.",
+    "cancel my gutter cleaning",
+    "uncancel my booking from yesterday",
+    "reschedule the deep clean to dec 31st at 11am",
+    "move my booking to wed at 2",
+    "can the plumber come in 2 hours",
+    "what time is my next appointment",
+    "reschedule to jan 3",
+    "move it to saturday afternoon",
+    "friday 3:00",
+    "can we do tomorrow 3:00 instead",
+]
+
+NOW = datetime(2026, 3, 6, 10, 30, tzinfo=BUSINESS_TZ)
+ROUNDS = 5
+NUMBER = 2_000
+
+
+def main() -> None:
+    parsed = sum(parse_natural_datetime(text, NOW) is not None for text in CORPUS)
+
+    def run_corpus() -> None:
+        for text in CORPUS:
+            parse_natural_datetime(text, NOW)
+
+    timings = timeit.repeat(run_corpus, repeat=ROUNDS, number=NUMBER)
+    per_call = [t / (NUMBER * len(CORPUS)) * 1e6 for t in timings]
+
+    print(f"corpus: {len(CORPUS)} commands, {parsed} parsed to a datetime")
+    print(
+        f"parse_natural_datetime: best {min(per_call):.2f} us/call, "
+        f"median {statistics.median(per_call):.2f} us/call"
+    )
+
+
+if __name__ == "__main__":
+    main()
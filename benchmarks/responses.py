@@ -0,0 +1,128 @@
+"""
+Benchmark JSON rendering and compression on our largest list responses.
+
+Run with `make bench` (or `uv run python -m benchmarks.responses`). Payloads
+are synthetic but shaped like production: /providers/all/{category} with
+nested services, and /bookings/provider/me for a busy provider.
+"""
+
+import gzip
+import random
+import statistics
+import timeit
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import brotli
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+from app.models.booking import Booking
+from app.models.provider import ProviderResponseDetail
+from app.models.service import ServiceResponseProvider
+
+ROUNDS = 5
+NUMBER = 20
+
+random.seed(7)
+WORDS = (
+    "deep clean kitchen bathroom windows lawn garden hedge trim gutter pressure "
+    "wash carpet move out eco friendly same day weekly biweekly monthly"
+).split()
+
+
+def _sentence(n: int) -> str:
+    return " ".join(random.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+
+def providers_by_category(providers: int = 200, services: int = 6) -> list:
+    return [
+        ProviderResponseDetail(
+            id=uuid4(),
+            first_name="Jamie",
+            last_name=f"Provider{i}",
+            company_name=f"Sparkle Co {i}",
+            phone_number="+14155550100",
+            services=[
+                ServiceResponseProvider(
+                    id=uuid4(),
+                    service_title=_sentence(3),
+                    service_description=_sentence(25),
+                    pricing=round(random.uniform(40, 400), 2),
+                    duration=random.choice([60, 90, 120, 180]),
+                    category="HOUSE_CLEANING",
+                )
+                for _ in range(services)
+            ],
+            reviews=[],
+            review_count=random.randint(0, 300),
+            average_rating=round(random.uniform(3, 5), 2),
+        )
+        for i in range(providers)
+    ]
+
+
+def provider_bookings(count: int = 1000) -> list:
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    customer_ids = [uuid4() for _ in range(80)]
+    return [
+        Booking(
+            id=uuid4(),
+            customer_id=random.choice(customer_ids),
+            provider_id=uuid4(),
+            service_id=uuid4(),
+            address_id=uuid4(),
+            start_time=start + timedelta(hours=3 * i),
+            special_instructions=_sentence(10),
+            service_notes=_sentence(6),
+            created_at=start,
+            updated_at=start,
+        )
+        for i in range(count)
+    ]
+
+
+def _median_ms(fn) -> float:
+    timings = timeit.repeat(fn, repeat=ROUNDS, number=NUMBER)
+    return statistics.median(timings) / NUMBER * 1000
+
+
+def bench_payload(name: str, models: list, model_type) -> None:
+    # what FastAPI hands the response class after validating response_model
+    content = TypeAdapter(list[model_type]).dump_python(models, mode="json")
+    body = ORJSONResponse(content).body
+
+    print(f"\n{name}: {len(models)} items, {len(body) / 1024:.0f} KiB of JSON")
+    print("  render")
+    std = _median_ms(lambda: JSONResponse(content).body)
+    fast = _median_ms(lambda: ORJSONResponse(content).body)
+    print(f"    JSONResponse    {std:7.2f} ms")
+    print(f"    ORJSONResponse  {fast:7.2f} ms  ({std / fast:.1f}x faster)")
+
+    print("  compression            bytes   ratio      ms")
+    print(f"    none         {len(body):>10,d}       -       -")
+    rows = [(f"gzip -{level}", level, gzip.compress) for level in (1, 5, 6, 9)]
+    rows += [(f"brotli q{q}", q, brotli.compress) for q in (1, 4, 5, 6)]
+    for label, level, compress in rows:
+        if compress is gzip.compress:
+            size = len(gzip.compress(body, level))
+            ms = _median_ms(lambda: gzip.compress(body, level))
+        else:
+            size = len(brotli.compress(body, quality=level))
+            ms = _median_ms(lambda: brotli.compress(body, quality=level))
+        ratio = len(body) / size
+        print(f"    {label:<12} {size:>10,d}  {ratio:5.1f}x  {ms:6.2f}")
+    # max quality is for static assets; far too slow per request
+    size = len(brotli.compress(body, quality=11))
+    print(f"    brotli q11   {size:>10,d}  {len(body) / size:5.1f}x  (offline only)")
+
+
+def main() -> None:
+    bench_payload(
+        "/providers/all/{category}", providers_by_category(), ProviderResponseDetail
+    )
+    bench_payload("/bookings/provider/me", provider_bookings(), Booking)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+-- Availability, calendar, earliest-slot and dashboard lookups on bookings
+CREATE INDEX IF NOT EXISTS ix_bookings_provider_id_start_time
+    ON bookings (provider_id, start_time);
+CREATE INDEX IF NOT EXISTS ix_bookings_start_time
+    ON bookings (start_time);
+CREATE INDEX IF NOT EXISTS ix_bookings_customer_id_status_start_time
+    ON bookings (customer_id, status, start_time);
@@ -0,0 +1,17 @@
+-- Slots reserved while a customer pays (app/models/slot_hold.py)
+CREATE TABLE IF NOT EXISTS slot_holds (
+    id uuid PRIMARY KEY,
+    provider_id uuid NOT NULL REFERENCES providers (id),
+    service_id uuid NOT NULL REFERENCES services (id),
+    payment_intent_id varchar,
+    start_time timestamptz NOT NULL,
+    end_time timestamptz NOT NULL,
+    expires_at timestamptz NOT NULL,
+    created_at timestamptz DEFAULT (now() AT TIME ZONE 'utc')
+);
+CREATE INDEX IF NOT EXISTS ix_slot_holds_provider_id_start_time
+    ON slot_holds (provider_id, start_time);
+CREATE INDEX IF NOT EXISTS ix_slot_holds_payment_intent_id
+    ON slot_holds (payment_intent_id);
+CREATE INDEX IF NOT EXISTS ix_slot_holds_expires_at
+    ON slot_holds (expires_at);
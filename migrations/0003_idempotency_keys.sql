@@ -0,0 +1,13 @@
+-- Stored responses for Idempotency-Key replays (app/models/idempotency_key.py)
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    scope varchar(255) NOT NULL,
+    key varchar(255) NOT NULL,
+    request_hash varchar(64) NOT NULL,
+    status_code integer,
+    response_body jsonb,
+    created_at timestamptz DEFAULT (now() AT TIME ZONE 'utc'),
+    expires_at timestamptz NOT NULL,
+    PRIMARY KEY (scope, key)
+);
+CREATE INDEX IF NOT EXISTS ix_idempotency_keys_expires_at
+    ON idempotency_keys (expires_at);
@@ -0,0 +1,40 @@
+-- Booking status feed (app/models/status_update.py): a cursor column and the
+-- owners of each event, so feeds don't join bookings.
+ALTER TABLE status_updates
+    ADD COLUMN IF NOT EXISTS seq bigint GENERATED BY DEFAULT AS IDENTITY,
+    ADD COLUMN IF NOT EXISTS customer_id uuid REFERENCES customers (id),
+    ADD COLUMN IF NOT EXISTS provider_id uuid REFERENCES providers (id);
+
+-- updates for bookings that no longer exist can't be attributed to anyone
+DELETE FROM status_updates
+WHERE NOT EXISTS (
+    SELECT 1 FROM bookings WHERE bookings.id = status_updates.booking_id
+);
+
+UPDATE status_updates
+SET customer_id = bookings.customer_id, provider_id = bookings.provider_id
+FROM bookings
+WHERE bookings.id = status_updates.booking_id
+  AND status_updates.customer_id IS NULL;
+
+ALTER TABLE status_updates
+    ALTER COLUMN customer_id SET NOT NULL,
+    ALTER COLUMN provider_id SET NOT NULL;
+
+DO $$
+BEGIN
+    ALTER TABLE status_updates
+        ADD CONSTRAINT status_updates_booking_id_fkey
+        FOREIGN KEY (booking_id) REFERENCES bookings (id) ON DELETE CASCADE;
+EXCEPTION WHEN duplicate_object THEN NULL;
+END
+$$;
+
+CREATE UNIQUE INDEX IF NOT EXISTS status_updates_seq_key
+    ON status_updates (seq);
+CREATE INDEX IF NOT EXISTS ix_status_updates_booking_id
+    ON status_updates (booking_id);
+CREATE INDEX IF NOT EXISTS ix_status_updates_customer_id_seq
+    ON status_updates (customer_id, seq);
+CREATE INDEX IF NOT EXISTS ix_status_updates_provider_id_seq
+    ON status_updates (provider_id, seq);
@@ -0,0 +1,35 @@
+-- Recurring bookings (app/models/booking_series.py)
+DO $$
+BEGIN
+    CREATE TYPE recurrenceenum AS ENUM ('weekly', 'biweekly', 'monthly');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END
+$$;
+
+CREATE TABLE IF NOT EXISTS booking_series (
+    id uuid PRIMARY KEY,
+    customer_id uuid NOT NULL REFERENCES customers (id),
+    provider_id uuid NOT NULL REFERENCES providers (id),
+    service_id uuid NOT NULL REFERENCES services (id),
+    address_id uuid NOT NULL REFERENCES addresses (id),
+    special_instructions varchar,
+    frequency recurrenceenum NOT NULL,
+    first_start timestamptz NOT NULL,
+    until timestamptz,
+    created_at timestamptz DEFAULT (now() AT TIME ZONE 'utc')
+);
+CREATE INDEX IF NOT EXISTS ix_booking_series_customer_id_first_start
+    ON booking_series (customer_id, first_start);
+CREATE INDEX IF NOT EXISTS ix_booking_series_provider_id_first_start
+    ON booking_series (provider_id, first_start);
+
+CREATE TABLE IF NOT EXISTS booking_series_exceptions (
+    id uuid PRIMARY KEY,
+    series_id uuid NOT NULL REFERENCES booking_series (id) ON DELETE CASCADE,
+    occurrence_start timestamptz NOT NULL,
+    new_start timestamptz,
+    CONSTRAINT uq_booking_series_exceptions_series_id_occurrence_start
+        UNIQUE (series_id, occurrence_start)
+);
+CREATE INDEX IF NOT EXISTS ix_booking_series_exceptions_new_start
+    ON booking_series_exceptions (new_start);
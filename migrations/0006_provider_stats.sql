@@ -0,0 +1,13 @@
+-- Per-provider rating aggregates (app/models/provider_stats.py). Left empty
+-- here: the app's stats reconciler backfills it on startup.
+CREATE TABLE IF NOT EXISTS provider_stats (
+    provider_id uuid PRIMARY KEY REFERENCES providers (id) ON DELETE CASCADE,
+    review_count integer NOT NULL DEFAULT 0,
+    rating_sum integer NOT NULL DEFAULT 0,
+    rating_1 integer NOT NULL DEFAULT 0,
+    rating_2 integer NOT NULL DEFAULT 0,
+    rating_3 integer NOT NULL DEFAULT 0,
+    rating_4 integer NOT NULL DEFAULT 0,
+    rating_5 integer NOT NULL DEFAULT 0,
+    updated_at timestamptz DEFAULT (now() AT TIME ZONE 'utc')
+);
@@ -0,0 +1,21 @@
+-- Where providers work (app/models/service_area.py). The GiST expression must
+-- stay identical to AREA_BOX for queries to use it.
+CREATE TABLE IF NOT EXISTS provider_service_areas (
+    id uuid PRIMARY KEY,
+    provider_id uuid NOT NULL UNIQUE REFERENCES providers (id) ON DELETE CASCADE,
+    center_latitude double precision,
+    center_longitude double precision,
+    radius_km double precision,
+    zips varchar[],
+    min_latitude double precision,
+    max_latitude double precision,
+    min_longitude double precision,
+    max_longitude double precision,
+    updated_at timestamptz DEFAULT (now() AT TIME ZONE 'utc')
+);
+CREATE INDEX IF NOT EXISTS ix_provider_service_areas_zips
+    ON provider_service_areas USING gin (zips);
+CREATE INDEX IF NOT EXISTS ix_provider_service_areas_box
+    ON provider_service_areas USING gist (
+        box(point(min_longitude, min_latitude), point(max_longitude, max_latitude))
+    );
@@ -0,0 +1,3 @@
+-- A provider's reviews newest first, keyset-paginated on (created_at, id)
+CREATE INDEX IF NOT EXISTS ix_reviews_provider_id_created_at
+    ON reviews (provider_id, created_at DESC, id DESC);
@@ -0,0 +1,10 @@
+-- Subcategory taxonomy (app/models/subcategory.py). Rows are inserted by the
+-- app's taxonomy sync on startup.
+CREATE TABLE IF NOT EXISTS subcategories (
+    id uuid PRIMARY KEY,
+    category varchar NOT NULL,
+    name varchar NOT NULL,
+    CONSTRAINT uq_subcategories_category_name UNIQUE (category, name)
+);
+CREATE INDEX IF NOT EXISTS ix_services_services_subcategories
+    ON services USING gin (services_subcategories);
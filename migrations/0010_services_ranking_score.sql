@@ -0,0 +1,6 @@
+-- Written by the ranking job (app/services/ranking.py); category listings are
+-- served best-ranked first.
+ALTER TABLE services
+    ADD COLUMN IF NOT EXISTS ranking_score double precision NOT NULL DEFAULT 0;
+CREATE INDEX IF NOT EXISTS ix_services_category_ranking_score
+    ON services (category, ranking_score DESC);
@@ -0,0 +1,28 @@
+-- Full-text search document for /services/search: title weighted above
+-- subcategories above description. Generated columns need an IMMUTABLE
+-- expression and array_to_string() is only STABLE, hence the wrapper function.
+CREATE OR REPLACE FUNCTION services_search_document(
+    title text, description text, subcategories text[]
+) RETURNS tsvector
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(
+            to_tsvector('english', coalesce(array_to_string(subcategories, ' '), '')),
+            'B'
+        )
+        || setweight(to_tsvector('english', coalesce(description, '')), 'C')
+$$;
+
+-- Rewrites the table once to fill in existing rows
+ALTER TABLE services
+    ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        services_search_document(
+            service_title, service_description, services_subcategories
+        )
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_services_search_vector
+    ON services USING gin (search_vector);
+-- search filters by category and price range
+CREATE INDEX IF NOT EXISTS ix_services_category_pricing
+    ON services (category, pricing);
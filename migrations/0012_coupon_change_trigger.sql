@@ -0,0 +1,14 @@
+-- Coupons are edited outside the app, so the table announces its own changes:
+-- each worker refreshes its coupon snapshot (app/services/coupons.py) when
+-- this fires on the coupon_changes channel.
+CREATE OR REPLACE FUNCTION notify_coupon_change() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM pg_notify('coupon_changes', TG_OP);
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE TRIGGER coupons_notify_change
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON coupons
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_coupon_change();
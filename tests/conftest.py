@@ -0,0 +1,101 @@
+"""
+Shared fixtures.
+
+Tests that need Postgres use TEST_DATABASE_URL: a scratch database with the
+app's schema (`make migrate`). They're skipped when it isn't set. Each one
+creates the rows it needs and deletes them afterwards.
+"""
+
+import os
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+# app.config requires these at import; nothing here talks to Supabase
+os.environ.setdefault("SUPABASE_URL", "http://supabase.invalid")
+os.environ.setdefault("SUPABASE_PUBLISHABLE_KEY", "test")
+# never fall back to the DATABASE_URL in .env
+os.environ.setdefault(
+    "DATABASE_URL", os.getenv("TEST_DATABASE_URL") or "postgresql://localhost/test"
+)
+
+from sqlmodel import Session, create_engine, delete  # noqa: E402
+
+from app.models import Address, Booking, Customer, Provider, Service  # noqa: E402
+from app.models.enums import StatusEnum  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def engine():
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_engine(url)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def bookings(engine):
+    """
+    Two confirmed bookings a day apart for one customer and provider, with
+    the address and service they need.
+    """
+    with Session(engine) as session:
+        provider = Provider(
+            first_name="Test", last_name="Provider", supabase_user_id=uuid4()
+        )
+        customer = Customer(
+            first_name="Test", last_name="Customer", supabase_user_id=uuid4()
+        )
+        session.add_all([provider, customer])
+        session.flush()
+        address = Address(
+            street_address_1="1 Test St",
+            city="Testville",
+            state="CA",
+            zip="94000",
+            customer_id=customer.id,
+        )
+        service = Service(
+            service_title="Test clean",
+            pricing=100,
+            duration=60,
+            category="GENERAL_CLEANING",
+            provider_id=provider.id,
+        )
+        session.add_all([address, service])
+        session.flush()
+        rows = [
+            Booking(
+                start_time=datetime.now() + timedelta(days=day),
+                status=StatusEnum.confirmed,
+                customer_id=customer.id,
+                provider_id=provider.id,
+                service_id=service.id,
+                address_id=address.id,
+            )
+            for day in (7, 8)
+        ]
+        session.add_all(rows)
+        session.commit()
+        ids = SimpleNamespace(
+            booking_ids=[row.id for row in rows],
+            customer_id=customer.id,
+            provider_id=provider.id,
+            service_id=service.id,
+            address_id=address.id,
+        )
+
+    yield ids
+
+    with Session(engine) as session:
+        # status_updates go with the bookings (ON DELETE CASCADE)
+        session.exec(delete(Booking).where(Booking.customer_id == ids.customer_id))
+        session.exec(delete(Service).where(Service.id == ids.service_id))
+        session.exec(delete(Address).where(Address.id == ids.address_id))
+        session.exec(delete(Customer).where(Customer.id == ids.customer_id))
+        session.exec(delete(Provider).where(Provider.id == ids.provider_id))
+        session.commit()
@@ -0,0 +1,33 @@
+from uuid import uuid4
+
+from sqlmodel import Session
+
+from app.services.autocomplete import Autocomplete, _Entry
+
+
+def labels(index: Autocomplete, prefix: str) -> list[str]:
+    return [suggestion.label for suggestion in index.search(prefix, 10)]
+
+
+def test_sync_applies_another_workers_writes(engine, bookings):
+    index = Autocomplete()
+    gone = uuid4()
+    index._apply(lambda i: i.add(_Entry("Test gutters", "service", gone, 0)))
+    index._apply(
+        lambda i: i.add(_Entry("Old name", "provider", bookings.provider_id, 0))
+    )
+
+    with Session(engine) as session:
+        index.sync(
+            session,
+            [
+                f"service:{bookings.service_id}",
+                f"service:{gone}",
+                f"provider:{bookings.provider_id}",
+            ],
+        )
+
+    # the service is indexed under its current title, the deleted one is
+    # dropped, and so is the provider now that it has no company name
+    assert labels(index, "test") == ["Test clean"]
+    assert labels(index, "old") == []
@@ -0,0 +1,56 @@
+import threading
+
+from sqlmodel import Session
+
+from app.models import Booking
+from app.models.enums import StatusEnum
+from app.services.booking_events import read_feed, record_status_change
+
+
+def _append_event(session: Session, booking_id, status: StatusEnum) -> None:
+    booking = session.get(Booking, booking_id)
+    booking.status = status
+    session.add(booking)
+    record_status_change(session, booking)
+    session.flush()
+
+
+def test_feed_cursor_never_skips_an_event_committed_late(engine, bookings):
+    # A appends first but commits last; B (another booking, so no shared row
+    # lock) appends and commits in between. Without serialized appends B gets
+    # the higher seq, becomes visible first, and a reader that moves its
+    # cursor past it never sees A.
+    first_id, second_id = bookings.booking_ids
+
+    def append_and_commit():
+        with Session(engine) as second:
+            _append_event(second, second_id, StatusEnum.in_progress)
+            second.commit()
+
+    other_writer = threading.Thread(target=append_and_commit)
+    first = Session(engine)
+    try:
+        _append_event(first, first_id, StatusEnum.en_route)
+        other_writer.start()
+        other_writer.join(timeout=0.5)
+        overtook = not other_writer.is_alive()
+
+        with Session(engine) as reader:
+            seen = read_feed(reader, bookings.customer_id, None, 0, 100)
+        cursor = max((event.seq for event in seen), default=0)
+
+        first.commit()
+    finally:
+        first.close()
+        other_writer.join(timeout=5)
+
+    # B waited for A's commit rather than overtaking it
+    assert not overtook
+
+    with Session(engine) as reader:
+        later = read_feed(reader, bookings.customer_id, None, cursor, 100)
+        everything = read_feed(reader, bookings.customer_id, None, 0, 100)
+
+    statuses = [event.status for event in seen + later]
+    assert statuses == [StatusEnum.en_route, StatusEnum.in_progress]
+    assert [event.status for event in everything] == statuses
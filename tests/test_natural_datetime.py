@@ -0,0 +1,35 @@
+from datetime import datetime
+
+import pytest
+
+from app.utils.natural_datetime import parse_natural_datetime
+from app.utils.timezones import BUSINESS_TZ
+
+# a Friday morning
+NOW = datetime(2026, 3, 6, 10, 30, tzinfo=BUSINESS_TZ)
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("friday 3:00", datetime(2026, 3, 6, 15, 0)),
+        ("tomorrow 3:00", datetime(2026, 3, 7, 15, 0)),
+        ("can we do tomorrow 3:00 instead", datetime(2026, 3, 7, 15, 0)),
+        ("tomorrow 9:30", datetime(2026, 3, 7, 9, 30)),
+        ("tomorrow 3:00am", datetime(2026, 3, 7, 3, 0)),
+        ("saturday evening 7:15", datetime(2026, 3, 7, 19, 15)),
+        ("friday at 4", datetime(2026, 3, 6, 16, 0)),
+        (
+            "reschedule my window washing to sept 12 1:15 p.m.",
+            datetime(2026, 9, 12, 13, 15),
+        ),
+        ("reschedule to jan 3", datetime(2027, 1, 3, 9, 0)),
+    ],
+)
+def test_parses_times(text, expected):
+    assert parse_natural_datetime(text, NOW) == expected.replace(tzinfo=BUSINESS_TZ)
+
+
+@pytest.mark.parametrize("text", ["cancel my gutter cleaning", "room 12", "3:75"])
+def test_nothing_to_parse(text):
+    assert parse_natural_datetime(text, NOW) is None
@@ -0,0 +1,79 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+import redis
+
+from app.services import shared_cache
+from app.services.shared_cache import SharedCache
+from app.utils.cache import RedisBackend
+
+
+class FakeRedis:
+    """The few Redis commands RedisBackend uses, kept in a dict (TTLs ignored)."""
+
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+
+    def get(self, name):
+        return self.data.get(name)
+
+    def set(self, name, value, px=None):
+        self.data[name] = value
+
+    def delete(self, *names):
+        for name in names:
+            self.data.pop(name, None)
+
+
+class DownRedis:
+    def _fail(self, *args, **kwargs):
+        raise redis.ConnectionError("connection refused")
+
+    get = set = delete = _fail
+
+
+@pytest.fixture
+def make_cache(monkeypatch):
+    def make_cache(client) -> SharedCache:
+        monkeypatch.setattr(shared_cache, "backend", RedisBackend(client=client))
+        return SharedCache(f"test_{uuid4().hex}", ttl=60)
+
+    return make_cache
+
+
+def test_get_set_delete(make_cache):
+    client = FakeRedis()
+    cache = make_cache(client)
+
+    assert cache.get("a") is None
+    cache.set("a", {"x": 1})
+    assert cache.get("a") == {"x": 1}
+    assert f"wipe_right:{cache.namespace}:a" in client.data
+
+    cache.delete("a")
+    assert cache.get("a", "gone") == "gone"
+    assert (cache.metrics.hits, cache.metrics.misses, cache.metrics.sets) == (1, 2, 1)
+
+
+def test_async_get_set_delete(make_cache):
+    cache = make_cache(FakeRedis())
+
+    async def scenario():
+        await cache.aset(("user", 1), "ada")
+        assert await cache.aget(("user", 1)) == "ada"
+        await cache.adelete(("user", 1))
+        return await cache.aget(("user", 1))
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_backend_errors_are_misses(make_cache):
+    cache = make_cache(DownRedis())
+
+    cache.set("a", 1)
+    assert cache.get("a", "default") == "default"
+    cache.delete("a")
+    assert asyncio.run(cache.aget("a")) is None
+    assert cache.metrics.errors == 4
+    assert cache.metrics.sets == 0